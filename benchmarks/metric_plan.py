@@ -0,0 +1,112 @@
+"""
+Sequential `.metric` loop vs. MetricPlan over several slow upstreams.
+
+Five local stand-ins answer GitHub file lookups with a different fixed latency
+each; the metrics are spread evenly across them. The plan should finish in
+about the time the slowest upstream needs for its share at `--in-flight`
+concurrent requests.
+
+Run from the repository root:
+
+    python -m benchmarks.metric_plan --metrics 1000 --in-flight 8
+
+The sequential loop is timed on `--sequential-sample` metrics and extrapolated.
+
+Sample run (latencies of 20 to 100 ms):
+
+    1000 metrics across 5 connectors
+      sequential:  67185.3 ms (extrapolated)
+            plan:   3648.4 ms
+      slowest upstream share:   2500.0 ms (latency only)
+      failures: 0
+
+The remaining gap is per-request CPU time of the client and the stand-ins.
+"""
+
+import argparse
+from functools import partial
+from multiprocessing import Pipe, Process
+import time
+
+from metricheq.core.connectors.git_providers.github import GitHubConfig, GitHubConnector
+from metricheq.core.deducers.git_providers.github import GitHubFileExistenceDeducer
+from metricheq.evaluation.plan import MetricPlan
+
+from .stand_ins import StandInServer
+
+LATENCIES = (0.02, 0.04, 0.06, 0.08, 0.10)
+
+
+def delayed_response(latency: float, path, query):
+    time.sleep(latency)
+    return {"path": path}
+
+
+def serve(latency: float, connection):
+    with StandInServer(partial(delayed_response, latency)) as server:
+        connection.send(server.url)
+        connection.recv()
+
+
+def start_stand_in(latency: float):
+    """
+    Runs a stand-in in its own process.
+
+    Otherwise the server threads compete with the client for the GIL and the
+    benchmark measures the stand-ins rather than the plan.
+    """
+    parent, child = Pipe()
+    process = Process(target=serve, args=(latency, child), daemon=True)
+    process.start()
+    return process, parent, parent.recv()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--metrics", type=int, default=1000)
+    parser.add_argument("--in-flight", type=int, default=8)
+    parser.add_argument("--sequential-sample", type=int, default=100)
+    args = parser.parse_args()
+
+    stand_ins = [start_stand_in(latency) for latency in LATENCIES]
+    connectors = []
+    for _, _, url in stand_ins:
+        config = GitHubConfig(
+            api_key="benchmark", base_url=url, pool_maxsize=args.in_flight
+        )
+        connectors.append(GitHubConnector.from_config(config))
+    try:
+        deducers = [
+            GitHubFileExistenceDeducer(
+                connectors[index % len(connectors)],
+                {"repo_name": "org/repo", "file_path": f"file-{index}"},
+            )
+            for index in range(args.metrics)
+        ]
+
+        sample = deducers[: args.sequential_sample]
+        start = time.perf_counter()
+        for deducer in sample:
+            deducer.metric
+        sequential = (time.perf_counter() - start) * len(deducers) / len(sample)
+
+        start = time.perf_counter()
+        outcomes = MetricPlan(deducers, max_in_flight=args.in_flight).run()
+        planned = time.perf_counter() - start
+
+        share = args.metrics / len(connectors) / args.in_flight * max(LATENCIES)
+        print(f"{args.metrics} metrics across {len(connectors)} connectors")
+        print(f"  sequential: {sequential * 1000:8.1f} ms (extrapolated)")
+        print(f"        plan: {planned * 1000:8.1f} ms")
+        print(f"  slowest upstream share: {share * 1000:8.1f} ms (latency only)")
+        print(f"  failures: {sum(not outcome.ok for outcome in outcomes)}")
+    finally:
+        for connector in connectors:
+            connector.close()
+        for process, connection, _ in stand_ins:
+            connection.send("stop")
+            process.join()
+
+
+if __name__ == "__main__":
+    main()
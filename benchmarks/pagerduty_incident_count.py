@@ -0,0 +1,89 @@
+"""
+Compares the paginated and count-only modes of PagerDutyIncidentFrequencyDeducer.
+
+Run from the repository root:
+
+    python -m benchmarks.pagerduty_incident_count --incidents 5000
+"""
+
+import argparse
+from datetime import datetime, timedelta, timezone
+import time
+
+from metricheq.core.connectors.pagerduty import PagerDutyConfig, PagerDutyConnector
+from metricheq.core.deducers.pagerduty import PagerDutyIncidentFrequencyDeducer
+
+from .stand_ins import StandInServer
+
+
+def build_incident(index: int) -> dict:
+    return {
+        "id": f"Q{index:08d}",
+        "type": "incident",
+        "status": "resolved",
+        "urgency": "high",
+        "title": f"Synthetic incident {index}",
+        "created_at": "2024-01-01T00:00:00Z",
+        "last_status_change_at": "2024-01-01T01:00:00Z",
+        "service": {"id": "PSERVICE", "type": "service_reference"},
+        "description": "x" * 200,
+    }
+
+
+def incidents_handler(incidents):
+    def handle(path, query):
+        offset = int(query.get("offset", ["0"])[0])
+        limit = int(query.get("limit", ["25"])[0])
+        with_total = query.get("total", ["false"])[0] == "true"
+        return {
+            "incidents": incidents[offset : offset + limit],
+            "offset": offset,
+            "limit": limit,
+            "more": offset + limit < len(incidents),
+            "total": len(incidents) if with_total else None,
+        }
+
+    return handle
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--incidents", type=int, default=5000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    incidents = [build_incident(i) for i in range(args.incidents)]
+    with StandInServer(incidents_handler(incidents)) as server:
+        config = PagerDutyConfig(
+            api_key="benchmark", base_url=server.url, rate_limit_per_minute=None
+        )
+        with PagerDutyConnector.from_config(config) as connector:
+            connector.ensure_connectivity = lambda: True
+            params = {
+                "service_id": "PSERVICE",
+                "since": datetime.now(timezone.utc) - timedelta(days=30),
+                "until": datetime.now(timezone.utc),
+            }
+            for mode, extra in (
+                ("paginated", {}),
+                ("paginated x4", {"max_workers": 4}),
+                ("count_only", {"count_only": True}),
+            ):
+                deducer = PagerDutyIncidentFrequencyDeducer(
+                    connector, {**params, **extra}
+                )
+                server.reset_counters()
+                start = time.perf_counter()
+                for _ in range(args.repeat):
+                    value = deducer.deduce()
+                elapsed = (time.perf_counter() - start) / args.repeat
+                print(
+                    f"{mode:>13}: {elapsed * 1000:8.1f} ms/run "
+                    f"{server.requests / args.repeat:6.0f} requests/run "
+                    f"{server.bytes_sent / args.repeat / 1024:9.1f} KiB/run "
+                    f"frequency={value:.2f}"
+                )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+"""Local HTTP stand-ins for the services queried by the benchmarks."""
+
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import json
+import threading
+from urllib.parse import parse_qs, urlparse
+
+
+class StandInServer:
+    """Runs `handler(path, query) -> dict` behind a threaded local HTTP server."""
+
+    def __init__(self, handler):
+        self.handler = handler
+        self.bytes_sent = 0
+        self.requests = 0
+        self.last_path = ""
+        self._lock = threading.Lock()
+        stand_in = self
+
+        class RequestHandler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            # Headers and body are written separately, Nagle would delay the body.
+            disable_nagle_algorithm = True
+
+            def do_GET(self):
+                url = urlparse(self.path)
+                payload = stand_in.handler(url.path, parse_qs(url.query))
+                body = json.dumps(payload).encode()
+                with stand_in._lock:
+                    stand_in.bytes_sent += len(body)
+                    stand_in.requests += 1
+                    stand_in.last_path = self.path
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), RequestHandler)
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}"
+
+    def __enter__(self):
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def reset_counters(self):
+        with self._lock:
+            self.bytes_sent = 0
+            self.requests = 0
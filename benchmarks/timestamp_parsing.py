@@ -0,0 +1,110 @@
+"""
+Timestamp parsing cost in PagerDutyAVGIncidentResolutionTimeDeducer.process_data.
+
+Synthetic incidents carry second-resolution `created_at` and
+`last_status_change_at` timestamps spread over a month, so most strings are
+distinct and the memo only helps with the repeated ones. Each parser is timed
+on the raw timestamps, and the deducer's `process_data` is timed end to end.
+
+Run from the repository root:
+
+    python -m benchmarks.timestamp_parsing --incidents 50000
+
+Sample run (100000 timestamps, best of 3):
+
+                  dateutil.parse:   9293.7 ms        10760 /s
+     parse_timestamp (cold memo):    118.6 ms       843225 /s
+     parse_timestamp (warm memo):    123.0 ms       813239 /s
+                    process_data:    168.9 ms
+
+With distinct strings far beyond the memo size the warm memo brings nothing;
+it pays off on repeated timestamps such as those of paginated re-fetches.
+"""
+
+import argparse
+from datetime import datetime, timedelta, timezone
+import random
+import time
+from unittest.mock import Mock
+
+from dateutil.parser import parse
+
+from metricheq.core.connectors.pagerduty import PagerDutyConnector
+from metricheq.core.deducers.pagerduty import PagerDutyAVGIncidentResolutionTimeDeducer
+from metricheq.core.deducers.utils import parse_timestamp, parse_timestamps
+
+START = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+
+def iso(moment: datetime) -> str:
+    return moment.strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+def build_incidents(count: int) -> list:
+    rng = random.Random(7)
+    incidents = []
+    for index in range(count):
+        created_at = START + timedelta(seconds=rng.randrange(30 * 86400))
+        resolved_at = created_at + timedelta(seconds=rng.randrange(60, 86400))
+        incidents.append(
+            {
+                "id": f"Q{index:08d}",
+                "status": "resolved",
+                "created_at": iso(created_at),
+                "last_status_change_at": iso(resolved_at),
+            }
+        )
+    return incidents
+
+
+def timed(function, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--incidents", type=int, default=50000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    incidents = build_incidents(args.incidents)
+    values = [
+        incident[key]
+        for incident in incidents
+        for key in ("created_at", "last_status_change_at")
+    ]
+
+    def cold_fast_path():
+        parse_timestamp.cache_clear()
+        parse_timestamps(values)
+
+    parsers = [
+        ("dateutil.parse", lambda: [parse(value) for value in values]),
+        ("parse_timestamp (cold memo)", cold_fast_path),
+        ("parse_timestamp (warm memo)", lambda: parse_timestamps(values)),
+    ]
+    print(f"{len(values)} timestamps")
+    for name, function in parsers:
+        elapsed = timed(function, args.repeat)
+        print(f"{name:>28}: {elapsed * 1000:8.1f} ms {len(values) / elapsed:12.0f} /s")
+
+    connector = Mock(spec=PagerDutyConnector, client=Mock())
+    deducer = PagerDutyAVGIncidentResolutionTimeDeducer(
+        connector, {"service_id": "PSERVICE", "incident_urgency": "high"}
+    )
+
+    def process():
+        parse_timestamp.cache_clear()
+        deducer.process_data(incidents)
+
+    elapsed = timed(process, args.repeat)
+    print(f"{'process_data':>28}: {elapsed * 1000:8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,19 +1,321 @@
 from abc import ABC, abstractmethod
+import asyncio
+from concurrent.futures import Executor
+import functools
+import threading
+import time
+from typing import Optional
+
+from pydantic import BaseModel, ConfigDict
+import requests
+from requests.adapters import HTTPAdapter
+
+from metricheq.core.connectors.cache import CachedResponse, ResponseCache, cache_key
+from metricheq.core.connectors.rate_limit import RateLimiter
+from metricheq.core.connectors.resilience import CircuitBreaker, RetryPolicy
+from metricheq.core.connectors.single_flight import SingleFlight, flight_key
+from metricheq.core.connectors.store import HistoricalStore
+
+DEFAULT_CONNECTIVITY_TTL = 60.0
+DEFAULT_BATCH_MAX_AGE = 60.0
+
+
+async def run_blocking(executor: Optional[Executor], function, *args, **kwargs):
+    """
+    Awaits a blocking call run in `executor`.
+
+    Without an executor the call runs in the event loop's default executor,
+    which runs at most `min(32, os.cpu_count() + 4)` calls at once.
+    """
+    if not isinstance(executor, Executor):
+        return await asyncio.to_thread(function, *args, **kwargs)
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(
+        executor, functools.partial(function, *args, **kwargs)
+    )
+
+
+class ClientConfig(BaseModel):
+    """
+    Transport settings shared by every client configuration.
+
+    Attributes:
+        pool_connections (int): Number of per-host connection pools to keep.
+        pool_maxsize (int): Maximum number of connections kept alive per host.
+        pool_block (bool): Block when a host pool is exhausted instead of
+            opening extra, non-reusable connections.
+        keep_alive (bool): Reuse connections across requests.
+        connectivity_ttl (float): Seconds a successful connectivity check is
+            trusted before probing the service again; 0 disables the cache.
+        response_cache (Optional[ResponseCache]): Cache used to revalidate GET
+            responses with `If-None-Match`/`If-Modified-Since`.
+        rate_limit_per_minute (Optional[float]): Static request quota; rate
+            limit headers returned by the service are honoured either way.
+        retry_policy (RetryPolicy): Retries of idempotent requests that failed
+            with a transport error or a retryable status.
+        circuit_failure_threshold (int): Consecutive failures opening the circuit.
+        circuit_reset_timeout (float): Seconds before an open circuit is probed.
+        historical_store (Optional[HistoricalStore]): Local store of immutable
+            records, such as resolved incidents, so only the open tail of a
+            time range is fetched from the service.
+        single_flight (bool): Share one in-flight call between identical
+            concurrent GET requests.
+        dedup_window (float): Seconds a successful GET response is reused by
+            identical requests sent after it, in-flight calls are then shared
+            too; 0 disables the reuse.
+        async_executor (Optional[Executor]): Executor running the blocking
+            calls behind the awaitable methods; size it to `pool_maxsize` to
+            await more requests at once than the event loop's default
+            executor allows.
+        batch_max_age (float): Seconds a payload fetched for a batch of
+            deducers, such as Sonar measures of one component, is still handed
+            to the other deducers of the batch; 0 disables the sharing.
+    """
+
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+
+    pool_connections: int = 10
+    pool_maxsize: int = 10
+    pool_block: bool = False
+    keep_alive: bool = True
+    connectivity_ttl: float = DEFAULT_CONNECTIVITY_TTL
+    response_cache: Optional[ResponseCache] = None
+    rate_limit_per_minute: Optional[float] = None
+    retry_policy: RetryPolicy = RetryPolicy()
+    circuit_failure_threshold: int = 5
+    circuit_reset_timeout: float = 30.0
+    historical_store: Optional[HistoricalStore] = None
+    single_flight: bool = True
+    dedup_window: float = 0.0
+    async_executor: Optional[Executor] = None
+    batch_max_age: float = DEFAULT_BATCH_MAX_AGE
 
 
 class Client(ABC):
     def __init__(self, config) -> None:
         self.config = config
+        self._session: Optional[requests.Session] = None
+        self._session_lock = threading.Lock()
+        self.transport_error_at: Optional[float] = None
+        self.rate_limiter = RateLimiter(
+            rate=self.client_config.rate_limit_per_minute, per=60.0
+        )
+        self.circuit_breaker = CircuitBreaker(
+            failure_threshold=self.client_config.circuit_failure_threshold,
+            reset_timeout=self.client_config.circuit_reset_timeout,
+        )
+        self.single_flight = SingleFlight(dedup_window=self.client_config.dedup_window)
+
+    @property
+    def session(self) -> requests.Session:
+        if self._session is None:
+            with self._session_lock:
+                if self._session is None:
+                    self._session = self._create_session()
+        return self._session
+
+    def _create_session(self) -> requests.Session:
+        adapter = HTTPAdapter(
+            pool_connections=self.client_config.pool_connections,
+            pool_maxsize=self.client_config.pool_maxsize,
+            pool_block=self.client_config.pool_block,
+        )
+        session = requests.Session()
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        return session
+
+    @property
+    def client_config(self) -> ClientConfig:
+        if isinstance(self.config, ClientConfig):
+            return self.config
+        return ClientConfig()
+
+    @property
+    def historical_store(self) -> Optional[HistoricalStore]:
+        return self.client_config.historical_store
+
+    @property
+    def async_executor(self) -> Optional[Executor]:
+        return self.client_config.async_executor
+
+    def send(self, request: requests.Request, **kwargs) -> requests.Response:
+        """
+        Sends a request through the client's shared connection pool.
+
+        Identical GET requests, regardless of the order of their query
+        parameters, share a single call and its parsed payload while it is in
+        flight, and for `dedup_window` seconds after it succeeded. GET requests
+        are also revalidated against the configured response cache: a
+        `304 Not Modified` answer is served from the cached body.
+        """
+        prepared_request = request.prepare()
+        if not self.client_config.keep_alive:
+            prepared_request.headers["Connection"] = "close"
+
+        config = self.client_config
+        if (
+            prepared_request.method == "GET"
+            and not kwargs.get("stream")
+            and (config.single_flight or config.dedup_window > 0)
+        ):
+            return self.single_flight.call(
+                flight_key(prepared_request),
+                lambda: self._send_prepared(prepared_request, **kwargs),
+            )
+        return self._send_prepared(prepared_request, **kwargs)
+
+    def _send_prepared(self, prepared_request: requests.PreparedRequest, **kwargs):
+        cache = self.client_config.response_cache
+        if cache is None or prepared_request.method != "GET":
+            return self._transmit(prepared_request, **kwargs)
+
+        key = cache_key(prepared_request)
+        cached = cache.get(key)
+        if cached is not None:
+            cached.apply_validators(prepared_request)
+
+        response = self._transmit(prepared_request, **kwargs)
+        if response.status_code == 304 and cached is not None:
+            return cached.to_response(prepared_request)
+        if response.status_code == 200:
+            entry = CachedResponse.from_response(response)
+            if entry is not None:
+                cache.set(key, entry)
+        return response
+
+    def _transmit(self, prepared_request: requests.PreparedRequest, **kwargs):
+        retry_policy = self.client_config.retry_policy
+        attempt = 0
+        while True:
+            self.circuit_breaker.before_request()
+            try:
+                response = self._send_paced(prepared_request, **kwargs)
+            except (requests.ConnectionError, requests.Timeout):
+                self.transport_error_at = time.monotonic()
+                self.circuit_breaker.record_failure()
+                if not retry_policy.allows_retry(prepared_request.method, attempt):
+                    raise
+            except requests.RequestException:
+                self.circuit_breaker.record_failure()
+                raise
+            else:
+                if response.status_code not in retry_policy.retry_statuses:
+                    self.circuit_breaker.record_success()
+                    return response
+                self.circuit_breaker.record_failure()
+                if not retry_policy.allows_retry(prepared_request.method, attempt):
+                    return response
+            time.sleep(retry_policy.backoff(attempt))
+            attempt += 1
+
+    def _send_paced(self, prepared_request: requests.PreparedRequest, **kwargs):
+        throttle_retries = 0
+        while True:
+            self.rate_limiter.acquire()
+            response = self.session.send(prepared_request, **kwargs)
+            paused = self.rate_limiter.update(response)
+            if (
+                not self.rate_limiter.is_throttled(response)
+                or throttle_retries >= self.rate_limiter.max_throttle_retries
+            ):
+                return response
+            if not paused:
+                # The service gave no pause, back off instead of resending at once
+                retry_policy = self.client_config.retry_policy
+                self.rate_limiter.pause(retry_policy.backoff(throttle_retries))
+            throttle_retries += 1
 
     @abstractmethod
     def make_request(self, endpoint: str, method: str = "GET", **kwargs):
         pass
 
+    async def make_request_async(self, endpoint: str, method: str = "GET", **kwargs):
+        """
+        Awaitable counterpart of `make_request`.
+
+        The blocking request runs in `async_executor`, or the event loop's
+        default executor, so many calls can be awaited concurrently while
+        sharing the client's pool.
+        """
+        return await run_blocking(
+            self.async_executor, self.make_request, endpoint, method, **kwargs
+        )
+
+    def close(self):
+        with self._session_lock:
+            if self._session is not None:
+                self._session.close()
+                self._session = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
 
 class Connector(ABC):
-    def __init__(self, client):
+    def __init__(self, client, connectivity_ttl: Optional[float] = None):
         self.client = client
+        if connectivity_ttl is None:
+            connectivity_ttl = (
+                client.client_config.connectivity_ttl
+                if isinstance(client, Client)
+                else DEFAULT_CONNECTIVITY_TTL
+            )
+        self.connectivity_ttl = connectivity_ttl
+        self._connectivity_checked_at: Optional[float] = None
+        self._connectivity_lock = threading.Lock()
 
     @abstractmethod
     def ensure_connectivity(self):
         pass
+
+    @property
+    def async_executor(self) -> Optional[Executor]:
+        return getattr(self.client, "async_executor", None)
+
+    async def ensure_connectivity_async(self):
+        return await run_blocking(self.async_executor, self.ensure_connectivity)
+
+    def check_connectivity(self):
+        """
+        Ensures connectivity, reusing a successful check for `connectivity_ttl` seconds.
+
+        The cached result is shared by every deducer using this connector and is
+        dropped as soon as the client records a transport error.
+        """
+        with self._connectivity_lock:
+            if self._connectivity_is_fresh():
+                return True
+            self._connectivity_checked_at = None
+            self.ensure_connectivity()
+            self._connectivity_checked_at = time.monotonic()
+            return True
+
+    async def check_connectivity_async(self):
+        return await run_blocking(self.async_executor, self.check_connectivity)
+
+    def invalidate_connectivity(self):
+        self._connectivity_checked_at = None
+
+    def _connectivity_is_fresh(self) -> bool:
+        checked_at = self._connectivity_checked_at
+        if checked_at is None:
+            return False
+        if time.monotonic() - checked_at >= self.connectivity_ttl:
+            return False
+        transport_error_at = getattr(self.client, "transport_error_at", None)
+        if isinstance(transport_error_at, float) and transport_error_at >= checked_at:
+            return False
+        return True
+
+    def close(self):
+        self.client.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
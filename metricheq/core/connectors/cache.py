@@ -0,0 +1,234 @@
+from abc import ABC, abstractmethod
+import base64
+from collections import OrderedDict
+import hashlib
+import json
+import os
+import tempfile
+import threading
+from typing import Dict, Optional
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+
+class CachedResponse:
+    """A response body stored together with its validators."""
+
+    def __init__(
+        self,
+        url: str,
+        status_code: int,
+        headers: Dict[str, str],
+        content: bytes,
+        etag: Optional[str] = None,
+        last_modified: Optional[str] = None,
+    ) -> None:
+        self.url = url
+        self.status_code = status_code
+        self.headers = headers
+        self.content = content
+        self.etag = etag
+        self.last_modified = last_modified
+
+    @classmethod
+    def from_response(cls, response: requests.Response) -> Optional["CachedResponse"]:
+        etag = response.headers.get("ETag")
+        last_modified = response.headers.get("Last-Modified")
+        if etag is None and last_modified is None:
+            return None
+        return cls(
+            url=response.url,
+            status_code=response.status_code,
+            headers=dict(response.headers),
+            content=response.content,
+            etag=etag,
+            last_modified=last_modified,
+        )
+
+    def apply_validators(self, prepared_request: requests.PreparedRequest):
+        if self.etag is not None:
+            prepared_request.headers["If-None-Match"] = self.etag
+        if self.last_modified is not None:
+            prepared_request.headers["If-Modified-Since"] = self.last_modified
+
+    def to_response(
+        self, prepared_request: Optional[requests.PreparedRequest] = None
+    ) -> requests.Response:
+        response = requests.Response()
+        response.url = self.url
+        response.status_code = self.status_code
+        response.headers = CaseInsensitiveDict(self.headers)
+        response._content = self.content
+        response.encoding = requests.utils.get_encoding_from_headers(response.headers)
+        response.request = prepared_request  # type: ignore[assignment]
+        return response
+
+    def to_dict(self) -> dict:
+        return {
+            "url": self.url,
+            "status_code": self.status_code,
+            "headers": self.headers,
+            "content": base64.b64encode(self.content).decode("ascii"),
+            "etag": self.etag,
+            "last_modified": self.last_modified,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "CachedResponse":
+        return cls(
+            url=data["url"],
+            status_code=data["status_code"],
+            headers=data["headers"],
+            content=base64.b64decode(data["content"]),
+            etag=data.get("etag"),
+            last_modified=data.get("last_modified"),
+        )
+
+
+def cache_key(prepared_request: requests.PreparedRequest) -> str:
+    """Keys entries by method, URL and credentials so tokens never share bodies."""
+    authorization = prepared_request.headers.get("Authorization", "")
+    raw = f"{prepared_request.method} {prepared_request.url} {authorization}"
+    return hashlib.sha256(raw.encode()).hexdigest()
+
+
+class ResponseCache(ABC):
+    @abstractmethod
+    def get(self, key: str) -> Optional[CachedResponse]:
+        pass
+
+    @abstractmethod
+    def set(self, key: str, entry: CachedResponse):
+        pass
+
+    @abstractmethod
+    def delete(self, key: str):
+        pass
+
+    @abstractmethod
+    def clear(self):
+        pass
+
+
+class InMemoryResponseCache(ResponseCache):
+    """
+    Thread-safe LRU cache bounded by entry count and, optionally, total body size.
+
+    Attributes:
+        max_entries (int): Maximum number of cached responses.
+        max_bytes (Optional[int]): Maximum total size of the cached bodies.
+    """
+
+    def __init__(self, max_entries: int = 1024, max_bytes: Optional[int] = None):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries: OrderedDict[str, CachedResponse] = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, key: str) -> Optional[CachedResponse]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+            return entry
+
+    def set(self, key: str, entry: CachedResponse):
+        if self.max_bytes is not None and len(entry.content) > self.max_bytes:
+            return
+        with self._lock:
+            self._pop(key)
+            self._entries[key] = entry
+            self._size += len(entry.content)
+            while len(self._entries) > self.max_entries or (
+                self.max_bytes is not None and self._size > self.max_bytes
+            ):
+                self._pop(next(iter(self._entries)))
+
+    def delete(self, key: str):
+        with self._lock:
+            self._pop(key)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+
+    def _pop(self, key: str):
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._size -= len(entry.content)
+
+
+class DiskResponseCache(ResponseCache):
+    """
+    LRU cache persisting one JSON file per response in `directory`.
+
+    Recency is tracked through file modification times, so the cache survives
+    restarts and can be shared by processes pointing at the same directory.
+    """
+
+    def __init__(self, directory: str, max_entries: int = 10000):
+        self.directory = directory
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}.json")
+
+    def get(self, key: str) -> Optional[CachedResponse]:
+        path = self._path(key)
+        try:
+            with open(path, encoding="utf-8") as file:
+                data = json.load(file)
+            os.utime(path)
+        except (OSError, ValueError):
+            return None
+        return CachedResponse.from_dict(data)
+
+    def set(self, key: str, entry: CachedResponse):
+        descriptor, temp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        with os.fdopen(descriptor, "w", encoding="utf-8") as file:
+            json.dump(entry.to_dict(), file)
+        os.replace(temp_path, self._path(key))
+        self._evict()
+
+    def delete(self, key: str):
+        try:
+            os.remove(self._path(key))
+        except FileNotFoundError:
+            pass
+
+    def clear(self):
+        for path in self._entry_paths():
+            self.delete(os.path.basename(path)[: -len(".json")])
+
+    def _entry_paths(self):
+        return [
+            os.path.join(self.directory, name)
+            for name in os.listdir(self.directory)
+            if name.endswith(".json")
+        ]
+
+    def _evict(self):
+        with self._lock:
+            paths = self._entry_paths()
+            if len(paths) <= self.max_entries:
+                return
+            by_recency = []
+            for path in paths:
+                try:
+                    by_recency.append((os.path.getmtime(path), path))
+                except FileNotFoundError:
+                    continue
+            by_recency.sort()
+            for _, path in by_recency[: len(by_recency) - self.max_entries]:
+                try:
+                    os.remove(path)
+                except FileNotFoundError:
+                    pass
@@ -1,12 +1,11 @@
-from pydantic import BaseModel
 import requests
 from requests import RequestException
 from metricheq.core.authenticators import BearerTokenAuthenticator
 
-from metricheq.core.connectors.base import Client, Connector
+from metricheq.core.connectors.base import Client, ClientConfig, Connector
 
 
-class CodecovConfig(BaseModel):
+class CodecovConfig(ClientConfig):
     base_url: str = "https://api.codecov.io/api/v2"
     api_token: str
 
@@ -21,15 +20,12 @@ class CodecovClient(Client):
         full_url = f"{self.base_url}{endpoint}"
         request = requests.Request(method, full_url, **kwargs)
         prepared_request = self.authenticator.apply(request)
-        with requests.Session() as session:
-            response = session.send(prepared_request.prepare())
-
-        return response
+        return self.send(prepared_request)
 
 
 class CodecovConnector(Connector):
-    def __init__(self, client):
-        super().__init__(client)
+    def __init__(self, client, **kwargs):
+        super().__init__(client, **kwargs)
 
     @staticmethod
     def from_config(config):
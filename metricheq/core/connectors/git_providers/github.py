@@ -1,11 +1,10 @@
-from pydantic import BaseModel
 import requests
 from metricheq.core.authenticators import BearerTokenAuthenticator
 
-from metricheq.core.connectors.base import Client, Connector
+from metricheq.core.connectors.base import Client, ClientConfig, Connector
 
 
-class GitHubConfig(BaseModel):
+class GitHubConfig(ClientConfig):
     api_key: str
     base_url: str = "https://api.github.com"
 
@@ -20,15 +19,12 @@ class GitHubClient(Client):
         full_url = f"{self.base_url}{endpoint}"
         request = requests.Request(method, full_url, **kwargs)
         prepared_request = self.authenticator.apply(request)
-        with requests.Session() as session:
-            response = session.send(prepared_request.prepare())
-
-        return response
+        return self.send(prepared_request)
 
 
 class GitHubConnector(Connector):
-    def __init__(self, client):
-        super().__init__(client)
+    def __init__(self, client, **kwargs):
+        super().__init__(client, **kwargs)
 
     @staticmethod
     def from_config(config):
@@ -1,16 +1,19 @@
-from pydantic import BaseModel
+from typing import Optional
+
 import requests
 from requests import RequestException
 from metricheq.core.authenticators import TokenAuthenticator
 from metricheq.core.connectors.base import (
     Client,
+    ClientConfig,
     Connector,
 )
 
 
-class PagerDutyConfig(BaseModel):
+class PagerDutyConfig(ClientConfig):
     base_url: str = "https://api.pagerduty.com"
     api_key: str
+    rate_limit_per_minute: Optional[float] = 960
 
 
 class PagerDutyClient(Client):
@@ -23,15 +26,12 @@ class PagerDutyClient(Client):
         full_url = f"{self.base_url}{endpoint}"
         request = requests.Request(method, full_url, **kwargs)
         prepared_request = self.authenticator.apply(request)
-        with requests.Session() as session:
-            response = session.send(prepared_request.prepare())
-
-        return response
+        return self.send(prepared_request)
 
 
 class PagerDutyConnector(Connector):
-    def __init__(self, client):
-        super().__init__(client)
+    def __init__(self, client, **kwargs):
+        super().__init__(client, **kwargs)
 
     @staticmethod
     def from_config(config):
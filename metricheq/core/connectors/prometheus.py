@@ -1,4 +1,3 @@
-from pydantic import BaseModel
 import requests
 from requests import RequestException
 from metricheq.core.authenticators import (
@@ -9,12 +8,13 @@ from metricheq.core.authenticators import (
 
 from metricheq.core.connectors.base import (
     Client,
+    ClientConfig,
     Connector,
 )
 from metricheq.exceptions.core.exceptions import UnsupportedConfigurationError
 
 
-class PrometheusConfig(BaseModel):
+class PrometheusConfig(ClientConfig):
     host_url: str
 
 
@@ -42,16 +42,12 @@ class PrometheusClient(Client):
         request = requests.Request(method, full_url, **kwargs)
 
         prepared_request = self.authenticator.apply(request)
-
-        with requests.Session() as session:
-            response = session.send(prepared_request.prepare())
-
-        return response
+        return self.send(prepared_request)
 
 
 class PrometheusConnector(Connector):
-    def __init__(self, client):
-        super().__init__(client)
+    def __init__(self, client, **kwargs):
+        super().__init__(client, **kwargs)
 
     @staticmethod
     def from_config(config):
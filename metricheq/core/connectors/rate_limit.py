@@ -0,0 +1,137 @@
+from email.utils import parsedate_to_datetime
+import threading
+import time
+from typing import Callable, Optional
+
+import requests
+
+# Absorbs floating point drift so a refilled bucket is never a hair short of a token.
+TOKEN_EPSILON = 1e-9
+
+
+class RateLimiter:
+    """
+    Token bucket pacing the requests of a single client.
+
+    A static quota (`rate` requests every `per` seconds) can be given up front.
+    Services advertising their budget through `X-RateLimit-Remaining` and
+    `X-RateLimit-Reset` tighten the pace so the remaining budget is spread
+    evenly until the reset, and `Retry-After` or an exhausted budget pauses
+    every caller until the service accepts requests again.
+
+    Attributes:
+        rate (Optional[float]): Static number of requests allowed per `per` seconds.
+        per (float): Length of the static quota window in seconds.
+        burst (int): Number of requests that may be sent back to back.
+        max_throttle_retries (int): How many times a throttled request is queued
+            and resent before the throttled response is returned.
+    """
+
+    def __init__(
+        self,
+        rate: Optional[float] = None,
+        per: float = 60.0,
+        burst: int = 1,
+        max_throttle_retries: int = 3,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+    ) -> None:
+        self.rate = rate
+        self.per = per
+        self.burst = burst
+        self.max_throttle_retries = max_throttle_retries
+        self._clock = clock
+        self._sleep = sleep
+        self._static_fill_rate = rate / per if rate else None
+        self._fill_rate = self._static_fill_rate
+        self._tokens = float(burst)
+        self._updated_at = clock()
+        self._blocked_until = 0.0
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """Blocks until a request may be sent, then consumes one token."""
+        while True:
+            with self._lock:
+                wait = self._reserve()
+            if wait <= 0:
+                return
+            self._sleep(wait)
+
+    def _reserve(self) -> float:
+        now = self._clock()
+        if now < self._blocked_until:
+            return self._blocked_until - now
+        if self._fill_rate is None:
+            return 0.0
+        elapsed = now - self._updated_at
+        self._tokens = min(self.burst, self._tokens + elapsed * self._fill_rate)
+        self._updated_at = now
+        if self._tokens >= 1 - TOKEN_EPSILON:
+            self._tokens = max(self._tokens - 1, 0.0)
+            return 0.0
+        return (1 - self._tokens) / self._fill_rate
+
+    def update(self, response: requests.Response) -> bool:
+        """
+        Adjusts the pace from the rate limit headers of `response`.
+
+        Returns whether the headers paused the callers.
+        """
+        headers = response.headers
+        remaining = _parse_float(headers.get("X-RateLimit-Remaining"))
+        reset = _parse_float(headers.get("X-RateLimit-Reset"))
+        retry_after = _parse_retry_after(headers.get("Retry-After"))
+
+        with self._lock:
+            now = self._clock()
+            if remaining is not None and reset is not None:
+                seconds_left = max(reset - time.time(), 1.0)
+                header_fill_rate = remaining / seconds_left
+                if self._static_fill_rate is not None:
+                    header_fill_rate = min(header_fill_rate, self._static_fill_rate)
+                self._fill_rate = header_fill_rate
+                self._tokens = min(self._tokens, 1.0)
+                if remaining <= 0:
+                    self._blocked_until = max(self._blocked_until, now + seconds_left)
+            if retry_after is not None:
+                self._blocked_until = max(self._blocked_until, now + retry_after)
+            return retry_after is not None or (
+                remaining is not None and reset is not None and remaining <= 0
+            )
+
+    def pause(self, seconds: float):
+        """Blocks every caller for `seconds`."""
+        with self._lock:
+            self._blocked_until = max(self._blocked_until, self._clock() + seconds)
+
+    @staticmethod
+    def is_throttled(response: requests.Response) -> bool:
+        if response.status_code == 429:
+            return True
+        if response.status_code != 403:
+            return False
+        headers = response.headers
+        return "Retry-After" in headers or headers.get("X-RateLimit-Remaining") == "0"
+
+
+def _parse_float(value: Optional[str]) -> Optional[float]:
+    if value is None:
+        return None
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _parse_retry_after(value: Optional[str]) -> Optional[float]:
+    if value is None:
+        return None
+    seconds = _parse_float(value)
+    if seconds is not None:
+        return max(seconds, 0.0)
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(retry_at.timestamp() - time.time(), 0.0)
@@ -0,0 +1,104 @@
+import random
+import threading
+import time
+from typing import Callable, FrozenSet, Optional
+
+from pydantic import BaseModel
+
+from metricheq.exceptions.core.exceptions import CircuitOpenError
+
+IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "OPTIONS"})
+
+
+class RetryPolicy(BaseModel):
+    """
+    Retry settings for idempotent requests.
+
+    Attributes:
+        max_retries (int): Number of retries after the first attempt.
+        backoff_factor (float): Base delay in seconds, doubled on every retry.
+        max_backoff (float): Upper bound of a single delay.
+        retry_statuses (FrozenSet[int]): Response statuses worth retrying.
+    """
+
+    max_retries: int = 2
+    backoff_factor: float = 0.5
+    max_backoff: float = 30.0
+    retry_statuses: FrozenSet[int] = frozenset({500, 502, 503, 504})
+
+    def allows_retry(self, method: Optional[str], attempt: int) -> bool:
+        return method in IDEMPOTENT_METHODS and attempt < self.max_retries
+
+    def backoff(self, attempt: int) -> float:
+        """Full jitter: a random delay up to the exponential backoff ceiling."""
+        ceiling = min(self.max_backoff, self.backoff_factor * (2**attempt))
+        return random.uniform(0, ceiling)
+
+
+class CircuitBreaker:
+    """
+    Fails fast once a service keeps failing.
+
+    After `failure_threshold` consecutive failures the circuit opens and every
+    request raises `CircuitOpenError`. Once `reset_timeout` seconds have passed
+    a single probe request is let through (half-open): its success closes the
+    circuit, its failure opens it again.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(
+        self,
+        failure_threshold: int = 5,
+        reset_timeout: float = 30.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._clock = clock
+        self._state = self.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probe_in_flight = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            if self._state == self.OPEN and self._reset_elapsed():
+                return self.HALF_OPEN
+            return self._state
+
+    def before_request(self):
+        with self._lock:
+            if self._state == self.CLOSED:
+                return
+            if self._state == self.OPEN and self._reset_elapsed():
+                self._state = self.HALF_OPEN
+                self._probe_in_flight = False
+            if self._state == self.HALF_OPEN and not self._probe_in_flight:
+                self._probe_in_flight = True
+                return
+            raise CircuitOpenError("Circuit is open, the service is failing")
+
+    def record_success(self):
+        with self._lock:
+            self._state = self.CLOSED
+            self._failures = 0
+            self._probe_in_flight = False
+
+    def record_failure(self):
+        with self._lock:
+            self._failures += 1
+            if (
+                self._state == self.HALF_OPEN
+                or self._failures >= self.failure_threshold
+            ):
+                self._state = self.OPEN
+                self._opened_at = self._clock()
+                self._probe_in_flight = False
+
+    def _reset_elapsed(self) -> bool:
+        return self._clock() - self._opened_at >= self.reset_timeout
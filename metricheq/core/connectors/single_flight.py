@@ -0,0 +1,119 @@
+from concurrent.futures import Future
+import threading
+import time
+from typing import Callable, Dict, Optional, Tuple
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+import requests
+
+# Request headers that change the response a service returns.
+VARYING_HEADERS = ("Authorization", "Accept")
+
+_UNPARSED = object()
+
+
+def flight_key(prepared_request: requests.PreparedRequest) -> str:
+    """Identifies a request regardless of the order of its query parameters."""
+    scheme, netloc, path, query, _ = urlsplit(prepared_request.url or "")
+    query = urlencode(sorted(parse_qsl(query, keep_blank_values=True)))
+    url = urlunsplit((scheme, netloc.lower(), path, query, ""))
+    headers = "\n".join(
+        f"{name}:{prepared_request.headers.get(name, '')}" for name in VARYING_HEADERS
+    )
+    return f"{prepared_request.method} {url}\n{headers}"
+
+
+class SharedResponse(requests.Response):
+    """A response handed to every caller of a shared request, parsed only once."""
+
+    _parsed: object
+    _parse_lock: threading.Lock
+
+    @classmethod
+    def wrap(cls, response: requests.Response) -> "SharedResponse":
+        shared = cls.__new__(cls)
+        shared.__dict__.update(response.__dict__)
+        shared._parsed = _UNPARSED
+        shared._parse_lock = threading.Lock()
+        return shared
+
+    def json(self, **kwargs):
+        if kwargs:
+            return super().json(**kwargs)
+        with self._parse_lock:
+            if self._parsed is _UNPARSED:
+                self._parsed = super().json()
+        return self._parsed
+
+
+class SingleFlight:
+    """
+    Collapses identical requests into a single call.
+
+    Callers asking for a key while a call for it is in flight wait for that
+    call and receive its response. With a `dedup_window` the successful
+    response is also reused by callers arriving within that many seconds after
+    it completed.
+    """
+
+    def __init__(
+        self, dedup_window: float = 0.0, clock: Callable[[], float] = time.monotonic
+    ) -> None:
+        self.dedup_window = dedup_window
+        self._clock = clock
+        self._in_flight: Dict[str, Future] = {}
+        self._recent: Dict[str, Tuple[float, requests.Response]] = {}
+        self._lock = threading.Lock()
+
+    def call(self, key: str, send: Callable[[], requests.Response]):
+        with self._lock:
+            recent = self._recent_response(key)
+            if recent is not None:
+                return recent
+            in_flight = self._in_flight.get(key)
+            if in_flight is None:
+                flight: Future = Future()
+                self._in_flight[key] = flight
+        if in_flight is not None:
+            return in_flight.result()
+
+        try:
+            response = send()
+            if isinstance(response, requests.Response):
+                response = SharedResponse.wrap(response)
+        except BaseException as error:
+            with self._lock:
+                del self._in_flight[key]
+            flight.set_exception(error)
+            raise
+        with self._lock:
+            del self._in_flight[key]
+            if self.dedup_window > 0 and getattr(response, "status_code", None) == 200:
+                self._forget_expired()
+                self._recent[key] = (self._clock(), response)
+        flight.set_result(response)
+        return response
+
+    def forget(self):
+        with self._lock:
+            self._recent.clear()
+
+    def _recent_response(self, key: str) -> Optional[requests.Response]:
+        entry = self._recent.get(key)
+        if entry is None:
+            return None
+        completed_at, response = entry
+        if self._clock() - completed_at >= self.dedup_window:
+            del self._recent[key]
+            return None
+        return response
+
+    def _forget_expired(self):
+        now = self._clock()
+        expired = [
+            key
+            for key, (completed_at, _) in self._recent.items()
+            if now - completed_at >= self.dedup_window
+        ]
+        for key in expired:
+            del self._recent[key]
@@ -7,14 +7,14 @@ from metricheq.core.authenticators import (
 )
 from metricheq.core.connectors.base import (
     Client,
+    ClientConfig,
     Connector,
 )
-from pydantic import BaseModel
 
 from metricheq.exceptions.core.exceptions import UnsupportedConfigurationError
 
 
-class SonarBaseConfig(BaseModel):
+class SonarBaseConfig(ClientConfig):
     host_url: str
     proxy: Optional[str] = None
 
@@ -41,6 +41,7 @@ class SonarClient(Client):
         else:
             raise UnsupportedConfigurationError("Unsupported configuration type.")
 
+        super().__init__(config)
         self.base_url = config.host_url
         self.proxy = config.proxy
 
@@ -49,14 +50,12 @@ class SonarClient(Client):
         proxies = {"http": self.proxy, "https": self.proxy} if self.proxy else {}
         request = requests.Request(method, url, **kwargs)
         prepared_request = self.authenticator.apply(request)
-        with requests.Session() as session:
-            response = session.send(prepared_request.prepare(), proxies=proxies)
-        return response
+        return self.send(prepared_request, proxies=proxies)
 
 
 class SonarConnector(Connector):
-    def __init__(self, client):
-        super().__init__(client)
+    def __init__(self, client, **kwargs):
+        super().__init__(client, **kwargs)
 
     @staticmethod
     def from_config(config: SonarBaseConfig):
@@ -0,0 +1,285 @@
+from contextlib import contextmanager
+from datetime import datetime, timezone
+import json
+import os
+import sqlite3
+import time
+from typing import Iterable, Iterator, List, Optional, Tuple
+
+from metricheq.exceptions.core.exceptions import StoreSchemaError
+
+SCHEMA_VERSION = 1
+
+# Each entry upgrades the schema from the version matching its index.
+MIGRATIONS = [
+    """
+    CREATE TABLE records (
+        kind TEXT NOT NULL,
+        scope TEXT NOT NULL,
+        key TEXT NOT NULL,
+        ts REAL NOT NULL,
+        payload TEXT NOT NULL,
+        PRIMARY KEY (kind, scope, key)
+    );
+    CREATE INDEX records_by_time ON records (kind, scope, ts);
+    CREATE INDEX records_by_age ON records (ts);
+    CREATE TABLE coverage (
+        kind TEXT NOT NULL,
+        scope TEXT NOT NULL,
+        start REAL NOT NULL,
+        end REAL NOT NULL,
+        PRIMARY KEY (kind, scope)
+    );
+    """,
+]
+
+
+def _epoch(moment: datetime) -> float:
+    if moment.tzinfo is None:
+        moment = moment.replace(tzinfo=timezone.utc)
+    return moment.timestamp()
+
+
+def _moment(epoch: float) -> datetime:
+    return datetime.fromtimestamp(epoch, tz=timezone.utc)
+
+
+class HistoricalStore:
+    """
+    On-disk SQLite store of immutable API records, such as resolved incidents.
+
+    Records are grouped by `kind` (the type of record) and `scope` (the query
+    they answer, e.g. a service) and indexed by timestamp. Next to them the
+    store keeps, per kind and scope, the time range whose records are all
+    stored, so callers only fetch what lies outside of it from the network.
+
+    The database runs in WAL mode and every operation opens its own short-lived
+    connection, so several threads or worker processes can share one file.
+
+    Attributes:
+        path (str): Location of the SQLite database.
+        max_bytes (Optional[int]): Budget of stored payloads; the oldest records
+            are evicted once it is exceeded.
+        max_age (Optional[float]): Seconds after which records are evicted.
+        busy_timeout (float): Seconds to wait for a lock held by another writer.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        max_bytes: Optional[int] = None,
+        max_age: Optional[float] = None,
+        busy_timeout: float = 30.0,
+    ) -> None:
+        self.path = path
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+        self.busy_timeout = busy_timeout
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        self._migrate()
+
+    @contextmanager
+    def _connect(self, write: bool = False) -> Iterator[sqlite3.Connection]:
+        connection = sqlite3.connect(
+            self.path, timeout=self.busy_timeout, isolation_level=None
+        )
+        try:
+            if write:
+                connection.execute("BEGIN IMMEDIATE")
+            try:
+                yield connection
+            except BaseException:
+                if write:
+                    connection.execute("ROLLBACK")
+                raise
+            if write:
+                connection.execute("COMMIT")
+        finally:
+            connection.close()
+
+    def _migrate(self):
+        with self._connect() as connection:
+            connection.execute("PRAGMA journal_mode=WAL")
+        with self._connect(write=True) as connection:
+            version = connection.execute("PRAGMA user_version").fetchone()[0]
+            if version > SCHEMA_VERSION:
+                raise StoreSchemaError(
+                    f"{self.path} uses schema version {version}, "
+                    f"newer than the supported version {SCHEMA_VERSION}"
+                )
+            for migration in MIGRATIONS[version:]:
+                for statement in migration.split(";"):
+                    if statement.strip():
+                        connection.execute(statement)
+            connection.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+
+    @property
+    def schema_version(self) -> int:
+        with self._connect() as connection:
+            return connection.execute("PRAGMA user_version").fetchone()[0]
+
+    def put_many(
+        self,
+        kind: str,
+        scope: str,
+        records: Iterable[Tuple[str, datetime, dict]],
+        coverage: Optional[Tuple[datetime, datetime]] = None,
+    ):
+        """
+        Stores `(key, timestamp, record)` tuples, replacing known keys.
+
+        A `coverage` range is recorded in the same transaction, before eviction
+        runs, so it never claims records that were evicted meanwhile.
+        """
+        rows = [
+            (kind, scope, key, _epoch(timestamp), json.dumps(record))
+            for key, timestamp, record in records
+        ]
+        if not rows and coverage is None:
+            return
+        with self._connect(write=True) as connection:
+            connection.executemany(
+                "INSERT OR REPLACE INTO records (kind, scope, key, ts, payload) "
+                "VALUES (?, ?, ?, ?, ?)",
+                rows,
+            )
+            if coverage is not None:
+                self._extend_coverage(connection, kind, scope, *coverage)
+            self._evict(connection)
+
+    def query(
+        self,
+        kind: str,
+        scope: str,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None,
+    ) -> List[dict]:
+        """Returns the records stamped within `[since, until)`, oldest first."""
+        start = _epoch(since) if since else float("-inf")
+        end = _epoch(until) if until else float("inf")
+        with self._connect() as connection:
+            rows = connection.execute(
+                "SELECT payload FROM records "
+                "WHERE kind = ? AND scope = ? AND ts >= ? AND ts < ? ORDER BY ts",
+                (kind, scope, start, end),
+            ).fetchall()
+        return [json.loads(payload) for (payload,) in rows]
+
+    def coverage(self, kind: str, scope: str) -> Optional[Tuple[datetime, datetime]]:
+        """Returns the `[start, end)` range whose records are all stored."""
+        with self._connect() as connection:
+            row = connection.execute(
+                "SELECT start, end FROM coverage WHERE kind = ? AND scope = ?",
+                (kind, scope),
+            ).fetchone()
+        if row is None:
+            return None
+        return _moment(row[0]), _moment(row[1])
+
+    def extend_coverage(self, kind: str, scope: str, start: datetime, end: datetime):
+        """
+        Records that every record within `[start, end)` is stored.
+
+        A range overlapping or touching the known one is merged into it, a
+        disjoint range replaces it. The range is then clamped by eviction.
+        """
+        with self._connect(write=True) as connection:
+            self._extend_coverage(connection, kind, scope, start, end)
+            self._evict(connection)
+
+    @staticmethod
+    def _extend_coverage(
+        connection: sqlite3.Connection,
+        kind: str,
+        scope: str,
+        start: datetime,
+        end: datetime,
+    ):
+        start_epoch, end_epoch = _epoch(start), _epoch(end)
+        if end_epoch <= start_epoch:
+            return
+        row = connection.execute(
+            "SELECT start, end FROM coverage WHERE kind = ? AND scope = ?",
+            (kind, scope),
+        ).fetchone()
+        if row is not None and row[0] <= end_epoch and start_epoch <= row[1]:
+            start_epoch = min(start_epoch, row[0])
+            end_epoch = max(end_epoch, row[1])
+        connection.execute(
+            "INSERT OR REPLACE INTO coverage (kind, scope, start, end) "
+            "VALUES (?, ?, ?, ?)",
+            (kind, scope, start_epoch, end_epoch),
+        )
+
+    def forget_before(self, kind: str, scope: str, cutoff: datetime):
+        """Deletes the records of one scope stamped before `cutoff`."""
+        cutoff_epoch = _epoch(cutoff)
+        with self._connect(write=True) as connection:
+            connection.execute(
+                "DELETE FROM records WHERE kind = ? AND scope = ? AND ts < ?",
+                (kind, scope, cutoff_epoch),
+            )
+            connection.execute(
+                "DELETE FROM coverage WHERE kind = ? AND scope = ? AND end <= ?",
+                (kind, scope, cutoff_epoch),
+            )
+            connection.execute(
+                "UPDATE coverage SET start = ? "
+                "WHERE kind = ? AND scope = ? AND start < ?",
+                (cutoff_epoch, kind, scope, cutoff_epoch),
+            )
+
+    def size(self) -> int:
+        """Total size of the stored payloads in bytes."""
+        with self._connect() as connection:
+            return self._payload_bytes(connection)
+
+    def evict(self):
+        with self._connect(write=True) as connection:
+            self._evict(connection)
+
+    def clear(self):
+        with self._connect(write=True) as connection:
+            connection.execute("DELETE FROM records")
+            connection.execute("DELETE FROM coverage")
+
+    @staticmethod
+    def _payload_bytes(connection: sqlite3.Connection) -> int:
+        return connection.execute(
+            "SELECT COALESCE(SUM(LENGTH(payload)), 0) FROM records"
+        ).fetchone()[0]
+
+    def _evict(self, connection: sqlite3.Connection):
+        if self.max_age is not None:
+            self._evict_before(connection, time.time() - self.max_age)
+        if self.max_bytes is None:
+            return
+        while self._payload_bytes(connection) > self.max_bytes:
+            count = connection.execute("SELECT COUNT(*) FROM records").fetchone()[0]
+            # Drops roughly the oldest quarter; ties on the cutoff are all kept
+            # or all dropped so coverage stays truthful.
+            row = connection.execute(
+                "SELECT ts FROM records ORDER BY ts LIMIT 1 OFFSET ?",
+                (count // 4,),
+            ).fetchone()
+            cutoff = row[0]
+            if count // 4 == 0 or not self._has_older(connection, cutoff):
+                cutoff = float("inf")
+            self._evict_before(connection, cutoff)
+
+    @staticmethod
+    def _has_older(connection: sqlite3.Connection, cutoff: float) -> bool:
+        row = connection.execute(
+            "SELECT 1 FROM records WHERE ts < ? LIMIT 1", (cutoff,)
+        ).fetchone()
+        return row is not None
+
+    @staticmethod
+    def _evict_before(connection: sqlite3.Connection, cutoff: float):
+        """Deletes records stamped before `cutoff` and shrinks coverage to match."""
+        connection.execute("DELETE FROM records WHERE ts < ?", (cutoff,))
+        connection.execute("DELETE FROM coverage WHERE end <= ?", (cutoff,))
+        connection.execute(
+            "UPDATE coverage SET start = ? WHERE start < ?", (cutoff, cutoff)
+        )
@@ -1,10 +1,15 @@
 from abc import ABC, abstractmethod
+from typing import Optional
 
-from metricheq.core.connectors.base import Connector
+from metricheq.core.connectors.base import Connector, run_blocking
+from metricheq.core.deducers.cache import MetricCache
 from metricheq.evaluation.metric import Metric
 
 
 class Deducer(ABC):
+    # Set on a deducer, a subclass or `Deducer` itself to memoize `metric`.
+    metric_cache: Optional[MetricCache] = None
+
     def __init__(self, connector: Connector, params: dict):
         self.connector = connector
         self.client = connector.client
@@ -14,6 +19,9 @@ class Deducer(ABC):
     def retrieve_data(self):
         pass
 
+    async def retrieve_data_async(self):
+        return await run_blocking(self.connector.async_executor, self.retrieve_data)
+
     @abstractmethod
     def process_data(self, data):
         pass
@@ -23,11 +31,81 @@ class Deducer(ABC):
         pass
 
     def deduce(self):
-        self.connector.ensure_connectivity()
+        self.connector.check_connectivity()
         data = self.retrieve_data()
         processed_data = self.process_data(data)
         return self.finalize(processed_data)
 
     @property
     def metric(self):
-        return Metric(value=self.deduce())
+        """
+        The deduced metric, served from `metric_cache` while it is fresh.
+
+        Without a cache every access deduces the metric again.
+        """
+        cache = self.metric_cache
+        if cache is None:
+            return Metric(value=self.deduce())
+        metric = cache.get(cache.key_for(self))
+        if metric is None:
+            metric = self.refresh()
+        return metric
+
+    def refresh(self) -> Metric:
+        """Deduces the metric again and replaces the cached one."""
+        metric = Metric(value=self.deduce())
+        if self.metric_cache is not None:
+            self.metric_cache.set(self.metric_cache.key_for(self), metric)
+        return metric
+
+    def invalidate(self):
+        if self.metric_cache is not None:
+            self.metric_cache.invalidate(self.metric_cache.key_for(self))
+
+    async def deduce_async(self):
+        """Awaitable counterpart of `deduce`, safe to gather across many deducers."""
+        await self.connector.check_connectivity_async()
+        data = await self.retrieve_data_async()
+        # retrieve_data may return a lazy stream, consume it off the event loop
+        processed_data = await run_blocking(
+            self.connector.async_executor, self.process_data, data
+        )
+        return self.finalize(processed_data)
+
+    async def metric_async(self):
+        cache = self.metric_cache
+        if cache is not None:
+            metric = cache.get(cache.key_for(self))
+            if metric is not None:
+                return metric
+        metric = Metric(value=await self.deduce_async())
+        if cache is not None:
+            cache.set(cache.key_for(self), metric)
+        return metric
+
+
+class BatchDeducer(Deducer):
+    """
+    Deducer yielding one metric per item, such as a service or a project.
+
+    The deduced value maps every item to its value; read it through `metrics`.
+    """
+
+    def finalize(self, processed_data):
+        return processed_data
+
+    @property
+    def metric(self):
+        raise TypeError(
+            f"{type(self).__name__} yields one metric per item, use `metrics` instead"
+        )
+
+    async def metric_async(self):
+        return self.metric
+
+    @property
+    def metrics(self) -> dict:
+        return self.to_metrics(self.deduce())
+
+    def to_metrics(self, values: dict) -> dict:
+        return {key: Metric(value=value) for key, value in values.items()}
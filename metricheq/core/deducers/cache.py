@@ -0,0 +1,77 @@
+from collections import OrderedDict
+import json
+import threading
+import time
+from typing import Callable, Hashable, Optional, Tuple
+
+from pydantic import BaseModel
+
+from metricheq.evaluation.metric import Metric
+
+
+def params_fingerprint(deducer) -> str:
+    """Canonical JSON of a deducer's parameters, validated when possible."""
+    params_model = getattr(deducer, "params_model", None)
+    if isinstance(params_model, BaseModel):
+        return params_model.model_dump_json()
+    return json.dumps(deducer.params, sort_keys=True, default=str)
+
+
+class MetricCache:
+    """
+    Shares deduced metrics across deducer instances for `ttl` seconds.
+
+    Entries are keyed by deducer class, connector and validated parameters, so
+    duplicate metric definitions are only deduced once. The least recently
+    used entries are evicted past `max_entries`.
+
+    Attributes:
+        ttl (float): Seconds a metric is served from the cache.
+        max_entries (int): Number of metrics kept.
+    """
+
+    def __init__(
+        self,
+        ttl: float = 300.0,
+        max_entries: int = 1024,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._clock = clock
+        self._entries: "OrderedDict[Hashable, Tuple[float, Metric]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key_for(deducer) -> Hashable:
+        return (type(deducer), deducer.connector, params_fingerprint(deducer))
+
+    def get(self, key: Hashable) -> Optional[Metric]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            stored_at, metric = entry
+            if self._clock() - stored_at >= self.ttl:
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return metric
+
+    def set(self, key: Hashable, metric: Metric):
+        with self._lock:
+            self._entries[key] = (self._clock(), metric)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, key: Hashable):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
@@ -4,7 +4,7 @@ from metricheq.core.deducers.git_providers.base import (
     GitProviderLastCommitAgeDeducer,
     GitProviderLastWorkFlowDurationDeducer,
 )
-from metricheq.core.deducers.utils import convert_seconds
+from metricheq.core.deducers.utils import convert_seconds, parse_timestamp
 
 
 class GitHubFileExistenceDeducer(GitProviderFileExistenceDeducer):
@@ -33,11 +33,8 @@ class GitHubLastWorkFlowDurationDeducer(GitProviderLastWorkFlowDurationDeducer):
         runs = data
         if runs:
             latest_run = runs[0]
-            start_time_str = latest_run["run_started_at"].replace("Z", "+00:00")
-            end_time_str = latest_run["updated_at"].replace("Z", "+00:00")
-
-            start_time = datetime.fromisoformat(start_time_str)
-            end_time = datetime.fromisoformat(end_time_str)
+            start_time = parse_timestamp(latest_run["run_started_at"])
+            end_time = parse_timestamp(latest_run["updated_at"])
 
             return (end_time - start_time).total_seconds()
         return None
@@ -58,9 +55,7 @@ class GitHubLastCommitAgeDeducer(GitProviderLastCommitAgeDeducer):
 
     def process_data(self, data):
         commit_data = data
-        commit_time_str = commit_data["commit"]["committer"]["date"]
-        commit_time_str = commit_time_str.replace("Z", "+00:00")
-        commit_time = datetime.fromisoformat(commit_time_str)
+        commit_time = parse_timestamp(commit_data["commit"]["committer"]["date"])
         time_elapsed_in_seconds = (
             datetime.now(timezone.utc) - commit_time
         ).total_seconds()
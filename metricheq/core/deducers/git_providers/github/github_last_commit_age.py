@@ -1,6 +1,6 @@
 from datetime import datetime, timezone
 from metricheq.core.deducers.git_providers.base import GitProviderLastCommitAgeDeducer
-from metricheq.core.deducers.utils import convert_seconds
+from metricheq.core.deducers.utils import convert_seconds, parse_timestamp
 
 
 class GitHubLastCommitAgeDeducer(GitProviderLastCommitAgeDeducer):
@@ -15,9 +15,7 @@ class GitHubLastCommitAgeDeducer(GitProviderLastCommitAgeDeducer):
 
     def process_data(self, data):
         commit_data = data
-        commit_time_str = commit_data["commit"]["committer"]["date"]
-        commit_time_str = commit_time_str.replace("Z", "+00:00")
-        commit_time = datetime.fromisoformat(commit_time_str)
+        commit_time = parse_timestamp(commit_data["commit"]["committer"]["date"])
         time_elapsed_in_seconds = (
             datetime.now(timezone.utc) - commit_time
         ).total_seconds()
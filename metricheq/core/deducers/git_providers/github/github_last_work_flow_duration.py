@@ -1,8 +1,7 @@
-from datetime import datetime
 from metricheq.core.deducers.git_providers.base import (
     GitProviderLastWorkFlowDurationDeducer,
 )
-from metricheq.core.deducers.utils import convert_seconds
+from metricheq.core.deducers.utils import convert_seconds, parse_timestamp
 
 
 class GitHubLastWorkFlowDurationDeducer(GitProviderLastWorkFlowDurationDeducer):
@@ -19,11 +18,8 @@ class GitHubLastWorkFlowDurationDeducer(GitProviderLastWorkFlowDurationDeducer):
         runs = data
         if runs:
             latest_run = runs[0]
-            start_time_str = latest_run["run_started_at"].replace("Z", "+00:00")
-            end_time_str = latest_run["updated_at"].replace("Z", "+00:00")
-
-            start_time = datetime.fromisoformat(start_time_str)
-            end_time = datetime.fromisoformat(end_time_str)
+            start_time = parse_timestamp(latest_run["run_started_at"])
+            end_time = parse_timestamp(latest_run["updated_at"])
 
             return (end_time - start_time).total_seconds()
         return None
@@ -1,12 +1,31 @@
+from .pagerduty_analytics import (
+    PagerDutyAnalyticsIncidentFrequencyDeducer,
+    PagerDutyAnalyticsParams,
+    PagerDutyAnalyticsResolutionTimeDeducer,
+)
 from .pagerduty_avg_incident_resolution_time import (
     PagerDutyAVGIncidentResolutionTimeDeducer,
     PagerDutyAVGIncidentResolutionTimeParams,
 )
-
+from .pagerduty_batch_incidents import (
+    PagerDutyBatchAVGIncidentResolutionTimeDeducer,
+    PagerDutyBatchAVGIncidentResolutionTimeParams,
+    PagerDutyBatchIncidentFrequencyDeducer,
+    PagerDutyBatchIncidentFrequencyParams,
+    group_incident_params,
+)
 from .pagerduty_incident_frequency import PagerDutyIncidentFrequencyDeducer
 
 __all__ = [
+    "PagerDutyAnalyticsIncidentFrequencyDeducer",
+    "PagerDutyAnalyticsParams",
+    "PagerDutyAnalyticsResolutionTimeDeducer",
     "PagerDutyAVGIncidentResolutionTimeDeducer",
     "PagerDutyAVGIncidentResolutionTimeParams",
+    "PagerDutyBatchAVGIncidentResolutionTimeDeducer",
+    "PagerDutyBatchAVGIncidentResolutionTimeParams",
+    "PagerDutyBatchIncidentFrequencyDeducer",
+    "PagerDutyBatchIncidentFrequencyParams",
     "PagerDutyIncidentFrequencyDeducer",
+    "group_incident_params",
 ]
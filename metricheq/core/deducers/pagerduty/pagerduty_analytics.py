@@ -0,0 +1,160 @@
+from abc import abstractmethod
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional, Tuple
+
+from pydantic import BaseModel, validator
+from metricheq.core.connectors.base import Connector
+from metricheq.core.connectors.pagerduty import PagerDutyConnector
+
+from metricheq.core.deducers.base import BatchDeducer
+from metricheq.core.deducers.utils import calculate_frequency, convert_seconds
+from .utils import (
+    INCIDENT_URGENCY_ALLOWED_VALUES,
+    ResolutionTotals,
+    as_utc,
+    build_incidents_query,
+    count_incidents,
+    fetch_services_analytics,
+    iter_service_incidents,
+    resolution_seconds,
+)
+
+DEFAULT_ANALYTICS_WINDOW = timedelta(days=30)
+
+
+class PagerDutyAnalyticsParams(BaseModel):
+    """
+    Attributes:
+        service_ids (List[str]): The IDs of the PagerDuty services to query.
+        incident_urgency (Optional[str]): The urgency of the incidents to consider.
+        since (Optional[datetime]): Start of the window, 30 days before `until`
+            by default.
+        until (Optional[datetime]): End of the window, now by default.
+        format (str): Duration format of resolution times (seconds, minutes, hours).
+        time_unit (str): Frequency time unit (daily, weekly, monthly).
+        max_workers (int): Incident pages fetched concurrently on fallback.
+    """
+
+    service_ids: List[str]
+    incident_urgency: Optional[str] = None
+    since: Optional[datetime] = None
+    until: Optional[datetime] = None
+
+    format: str = "seconds"
+    time_unit: str = "daily"
+    max_workers: int = 1
+
+    @validator("service_ids")
+    def validate_service_ids(cls, v):
+        if not v:
+            raise ValueError("service_ids must not be empty")
+        return v
+
+    @validator("incident_urgency")
+    def validate_incident_urgency(cls, v):
+        if v is not None and v not in INCIDENT_URGENCY_ALLOWED_VALUES:
+            raise ValueError(
+                f"Invalid incident_urgency: {v}. Must be one of {INCIDENT_URGENCY_ALLOWED_VALUES}"
+            )
+        return v
+
+
+class PagerDutyAnalyticsDeducer(BatchDeducer):
+    """
+    Base of the deducers reading per-service aggregates from PagerDuty Analytics.
+
+    A single `/analytics/metrics/incidents/services` request aggregates the
+    incidents of every service server side, whatever the window. When the
+    account has no access to Analytics the aggregates are computed from raw
+    incidents instead, one service at a time.
+
+    The deduced value maps every service ID to its metric, see `metrics`.
+    """
+
+    def __init__(self, connector: Connector, params: dict):
+        if not isinstance(connector, PagerDutyConnector):
+            raise TypeError("The provided connector is not a valid PagerDuty connector")
+        self.params_model = PagerDutyAnalyticsParams(**params)
+        super().__init__(connector, params)
+        self.since, self.until = self.window()
+
+    def window(self) -> Tuple[datetime, datetime]:
+        """The `(since, until)` window of a run, defaults being relative to now."""
+        until = as_utc(self.params_model.until or datetime.now(timezone.utc))
+        since = as_utc(self.params_model.since or until - DEFAULT_ANALYTICS_WINDOW)
+        return since, until
+
+    def retrieve_data(self) -> Dict[str, dict]:
+        self.since, self.until = self.window()
+        rows = fetch_services_analytics(
+            self.client,
+            self.params_model.service_ids,
+            self.params_model.incident_urgency,
+            self.since,
+            self.until,
+        )
+        if rows is None:
+            rows = {
+                service_id: self.aggregate_incidents(service_id)
+                for service_id in self.params_model.service_ids
+            }
+        return rows
+
+    @abstractmethod
+    def aggregate_incidents(self, service_id: str) -> dict:
+        """Computes the analytics row of one service from raw incidents."""
+
+    def process_data(self, data: Dict[str, dict]) -> Dict[str, Optional[float]]:
+        return {
+            service_id: self.value_of(data.get(service_id, {}))
+            for service_id in self.params_model.service_ids
+        }
+
+    @abstractmethod
+    def value_of(self, row: dict) -> Optional[float]:
+        pass
+
+
+class PagerDutyAnalyticsResolutionTimeDeducer(PagerDutyAnalyticsDeducer):
+    """Mean time to resolve of every service, from `mean_seconds_to_resolve`."""
+
+    def aggregate_incidents(self, service_id: str) -> dict:
+        totals = ResolutionTotals()
+        for incident in iter_service_incidents(
+            self.client,
+            service_id,
+            self.params_model.incident_urgency,
+            self.since,
+            self.until,
+            max_workers=self.params_model.max_workers,
+        ):
+            seconds = resolution_seconds(incident)
+            if seconds is not None:
+                totals.add(seconds)
+        return {"service_id": service_id, "mean_seconds_to_resolve": totals.average}
+
+    def value_of(self, row: dict) -> Optional[float]:
+        seconds = row.get("mean_seconds_to_resolve")
+        if seconds is None:
+            return None
+        return convert_seconds(seconds, format=self.params_model.format)
+
+
+class PagerDutyAnalyticsIncidentFrequencyDeducer(PagerDutyAnalyticsDeducer):
+    """Incident frequency of every service, from `total_incident_count`."""
+
+    def aggregate_incidents(self, service_id: str) -> dict:
+        query = build_incidents_query(
+            [service_id], self.params_model.incident_urgency, self.since, self.until
+        )
+        return {
+            "service_id": service_id,
+            "total_incident_count": count_incidents(self.client, query),
+        }
+
+    def value_of(self, row: dict) -> float:
+        return calculate_frequency(
+            row.get("total_incident_count") or 0,
+            self.until - self.since,
+            self.params_model.time_unit,
+        )
@@ -1,14 +1,22 @@
 from datetime import datetime
-from dateutil.parser import parse
-
-from typing import Optional
+from typing import Iterator, Optional
 from pydantic import BaseModel, validator
 from metricheq.core.connectors.base import Connector
 from metricheq.core.connectors.pagerduty import PagerDutyConnector
+from metricheq.core.connectors.store import HistoricalStore
 
 from metricheq.core.deducers.base import Deducer
 from metricheq.core.deducers.utils import convert_seconds
-from .utils import INCIDENT_URGENCY_ALLOWED_VALUES
+from .utils import (
+    INCIDENT_RECORD_KIND,
+    INCIDENT_URGENCY_ALLOWED_VALUES,
+    ResolutionTotals,
+    as_utc,
+    incident_scope,
+    incidents_from,
+    iter_service_incidents,
+    resolution_seconds,
+)
 
 
 class PagerDutyAVGIncidentResolutionTimeParams(BaseModel):
@@ -21,6 +29,14 @@ class PagerDutyAVGIncidentResolutionTimeParams(BaseModel):
         format (DurationFormat): The format for representing time duration (seconds, minutes, etc.).
         since (Optional[datetime]): The start time for the incident query window.
         until (Optional[datetime]): The end time for the incident query window.
+        max_workers (int): Number of incident pages fetched concurrently.
+        incremental (bool): Only fetch incidents that may have changed since the
+            previous run and keep the resolved ones in `state_path`; requires
+            `since`.
+        state_path (Optional[str]): SQLite historical store holding the
+            resolved incidents of every service and urgency, each under its own
+            scope; deducers of one service sharing it should use the same
+            window length.
     """
 
     service_id: str
@@ -29,6 +45,9 @@ class PagerDutyAVGIncidentResolutionTimeParams(BaseModel):
     until: Optional[datetime] = None
 
     format: str = "seconds"
+    max_workers: int = 1
+    incremental: bool = False
+    state_path: Optional[str] = None
 
     @validator("incident_urgency")
     def validate_incident_urgency(cls, v):
@@ -38,6 +57,14 @@ class PagerDutyAVGIncidentResolutionTimeParams(BaseModel):
             )
         return v
 
+    @validator("state_path", always=True)
+    def validate_state_path(cls, v, values):
+        if values.get("incremental") and not v:
+            raise ValueError("state_path is required in incremental mode")
+        if values.get("incremental") and values.get("since") is None:
+            raise ValueError("since is required in incremental mode")
+        return v
+
 
 class PagerDutyAVGIncidentResolutionTimeDeducer(Deducer):
     """
@@ -59,37 +86,54 @@ class PagerDutyAVGIncidentResolutionTimeDeducer(Deducer):
         super().__init__(connector, params)
 
     def retrieve_data(self):
-        endpoint = f"/incidents?service_ids[]={self.params_model.service_id}&urgencies[]={self.params_model.incident_urgency}"
-
-        if self.params_model.since:
-            endpoint += f"&since={self.params_model.since.isoformat()}"
-        if self.params_model.until:
-            endpoint += f"&until={self.params_model.until.isoformat()}"
-
-        response = self.client.make_request(endpoint)
-
-        if response.status_code == 200:
-            return response.json()
-        else:
-            response.raise_for_status()
+        if self.params_model.incremental:
+            return self.incremental_incidents()
+
+        return iter_service_incidents(
+            self.client,
+            self.params_model.service_id,
+            self.params_model.incident_urgency,
+            self.params_model.since,
+            self.params_model.until,
+            max_workers=self.params_model.max_workers,
+        )
+
+    def incremental_incidents(self) -> Iterator[dict]:
+        """
+        Streams the window through the historical store at `state_path`.
+
+        Resolved incidents never change, so only the incidents created from
+        the oldest one still open on the previous run are fetched again. The
+        store keeps every service and urgency under its own scope; incidents
+        that aged out of a rolling `since` are dropped from that scope only.
+        """
+        params = self.params_model
+        if params.state_path is None or params.since is None:
+            raise ValueError("state_path and since are required in incremental mode")
+        store = HistoricalStore(params.state_path)
+        since = as_utc(params.since)
+        store.forget_before(
+            INCIDENT_RECORD_KIND,
+            incident_scope(params.service_id, params.incident_urgency),
+            since,
+        )
+        return iter_service_incidents(
+            self.client,
+            params.service_id,
+            params.incident_urgency,
+            since,
+            params.until,
+            max_workers=params.max_workers,
+            store=store,
+        )
 
     def process_data(self, data):
-        incidents = data.get("incidents", [])
-        total_time_to_resolution = float(0)
-        count = 0
-        for incident in incidents:
-            if incident["status"] == "resolved":
-                created_at = parse(incident["created_at"])
-                resolved_at = parse(incident["last_status_change_at"])
-                time_to_resolution = (resolved_at - created_at).total_seconds()
-                total_time_to_resolution += time_to_resolution
-                count += 1
-
-        if count == 0:
-            return None
-
-        average_time_to_resolution = total_time_to_resolution / count
-        return average_time_to_resolution
+        totals = ResolutionTotals()
+        for incident in incidents_from(data):
+            seconds = resolution_seconds(incident)
+            if seconds is not None:
+                totals.add(seconds)
+        return totals.average
 
     def finalize(self, processed_data):
         if processed_data is not None:
@@ -0,0 +1,192 @@
+from collections import Counter
+from typing import Dict, Iterable, List, Optional, Type
+
+from pydantic import BaseModel, validator
+from metricheq.core.connectors.base import Connector
+from metricheq.core.connectors.pagerduty import PagerDutyConnector
+
+from metricheq.core.deducers.base import BatchDeducer
+from metricheq.core.deducers.utils import convert_seconds
+from .pagerduty_avg_incident_resolution_time import (
+    PagerDutyAVGIncidentResolutionTimeParams,
+)
+from .pagerduty_incident_frequency import (
+    PagerDutyIncidentFrequencyParams,
+    incident_frequency,
+)
+from .utils import (
+    ResolutionTotals,
+    build_incidents_query,
+    closed_window,
+    incidents_from,
+    iter_incidents,
+    resolution_seconds,
+)
+
+
+def window_of(params_model) -> tuple:
+    return (params_model.incident_urgency, params_model.since, params_model.until)
+
+
+def group_incident_params(
+    params_list: Iterable[dict], params_class: Type[BaseModel]
+) -> List[List[dict]]:
+    """
+    Groups single-service params sharing an urgency and a time window.
+
+    Every group can be deduced from a single incident stream, see
+    `PagerDutyBatchIncidentDeducer.for_params`. A service configured twice for
+    one window, e.g. with two formats, lands in two groups.
+    """
+    groups: Dict[tuple, List[dict]] = {}
+    occurrences: Counter = Counter()
+    for params in params_list:
+        window = window_of(params_class(**params))
+        occurrence = occurrences[(window, params["service_id"])]
+        occurrences[(window, params["service_id"])] += 1
+        groups.setdefault((window, occurrence), []).append(params)
+    return list(groups.values())
+
+
+def validate_shared_window(services: list) -> list:
+    if not services:
+        raise ValueError("services must not be empty")
+    if len({window_of(service) for service in services}) > 1:
+        raise ValueError(
+            "Batched services must share incident_urgency, since and until"
+        )
+    counts = Counter(service.service_id for service in services)
+    duplicates = [service_id for service_id, count in counts.items() if count > 1]
+    if duplicates:
+        raise ValueError(f"Services batched more than once: {sorted(duplicates)}")
+    return services
+
+
+class PagerDutyBatchIncidentParams(BaseModel):
+    services: list
+    max_workers: int = 1
+
+
+class PagerDutyBatchIncidentFrequencyParams(PagerDutyBatchIncidentParams):
+    """
+    Attributes:
+        services (List[PagerDutyIncidentFrequencyParams]): Per-service params,
+            sharing `incident_urgency`, `since` and `until`; `count_only` and
+            `max_workers` are ignored.
+        max_workers (int): Number of incident pages fetched concurrently.
+    """
+
+    services: List[PagerDutyIncidentFrequencyParams]
+    max_workers: int = 1
+
+    @validator("services")
+    def validate_services(cls, v):
+        return validate_shared_window(v)
+
+
+class PagerDutyBatchAVGIncidentResolutionTimeParams(PagerDutyBatchIncidentParams):
+    """
+    Attributes:
+        services (List[PagerDutyAVGIncidentResolutionTimeParams]): Per-service
+            params, sharing `incident_urgency`, `since` and `until`; incremental
+            params cannot be batched.
+        max_workers (int): Number of incident pages fetched concurrently.
+    """
+
+    services: List[PagerDutyAVGIncidentResolutionTimeParams]
+    max_workers: int = 1
+
+    @validator("services")
+    def validate_services(cls, v):
+        if any(service.incremental for service in v):
+            raise ValueError("Incremental params cannot be batched")
+        return validate_shared_window(v)
+
+
+class PagerDutyBatchIncidentDeducer(BatchDeducer):
+    """
+    Base of the deducers fanning many services into one incident stream.
+
+    The incidents of every service are requested together through
+    `service_ids[]` and split per service locally, instead of paginating
+    `/incidents` once per service. The deduced value maps every service ID to
+    its metric, see `metrics`.
+
+    A window holding more incidents than PagerDuty pages through is split, an
+    open-ended one ending now; without a `since` the batch fails loudly
+    instead, see `iter_incidents`.
+    """
+
+    params_class: Type[PagerDutyBatchIncidentParams]
+    service_params_class: Type[BaseModel]
+
+    def __init__(self, connector: Connector, params: dict):
+        if not isinstance(connector, PagerDutyConnector):
+            raise TypeError("The provided connector is not a valid PagerDuty connector")
+        self.params_model = self.params_class(**params)
+        super().__init__(connector, params)
+
+    @classmethod
+    def for_params(
+        cls, connector: Connector, params_list: Iterable[dict]
+    ) -> List["PagerDutyBatchIncidentDeducer"]:
+        """Builds one batch deducer per group of compatible single-service params."""
+        return [
+            cls(connector, {"services": group})
+            for group in group_incident_params(params_list, cls.service_params_class)
+        ]
+
+    @property
+    def service_ids(self) -> List[str]:
+        return [service.service_id for service in self.params_model.services]
+
+    def retrieve_data(self):
+        shared = self.params_model.services[0]
+        since, until = shared.since, shared.until
+        if since is not None:
+            since, until = closed_window(since, until)
+        query = build_incidents_query(
+            self.service_ids, shared.incident_urgency, since, until
+        )
+        return iter_incidents(
+            self.client, query, max_workers=self.params_model.max_workers
+        )
+
+
+class PagerDutyBatchIncidentFrequencyDeducer(PagerDutyBatchIncidentDeducer):
+    """Incident frequency of every service from one shared incident stream."""
+
+    params_class = PagerDutyBatchIncidentFrequencyParams
+    service_params_class = PagerDutyIncidentFrequencyParams
+
+    def process_data(self, data) -> Dict[str, float]:
+        counts = Counter(incident["service"]["id"] for incident in incidents_from(data))
+        return {
+            service.service_id: incident_frequency(counts[service.service_id], service)
+            for service in self.params_model.services
+        }
+
+
+class PagerDutyBatchAVGIncidentResolutionTimeDeducer(PagerDutyBatchIncidentDeducer):
+    """Average resolution time of every service from one shared incident stream."""
+
+    params_class = PagerDutyBatchAVGIncidentResolutionTimeParams
+    service_params_class = PagerDutyAVGIncidentResolutionTimeParams
+
+    def process_data(self, data) -> Dict[str, Optional[float]]:
+        totals: Dict[str, ResolutionTotals] = {}
+        for incident in incidents_from(data):
+            seconds = resolution_seconds(incident)
+            if seconds is not None:
+                service_id = incident["service"]["id"]
+                totals.setdefault(service_id, ResolutionTotals()).add(seconds)
+
+        resolution_times = {}
+        for service in self.params_model.services:
+            average = totals.get(service.service_id, ResolutionTotals()).average
+            resolution_times[service.service_id] = (
+                convert_seconds(average, format=service.format)
+                if average is not None
+                else None
+            )
+        return resolution_times
@@ -7,7 +7,13 @@ from metricheq.core.deducers.base import Deducer
 
 from metricheq.core.deducers.utils import calculate_frequency
 
-from .utils import INCIDENT_URGENCY_ALLOWED_VALUES
+from .utils import (
+    INCIDENT_URGENCY_ALLOWED_VALUES,
+    build_incidents_query,
+    count_incidents,
+    incidents_from,
+    iter_service_incidents,
+)
 
 
 class PagerDutyIncidentFrequencyParams(BaseModel):
@@ -17,6 +23,8 @@ class PagerDutyIncidentFrequencyParams(BaseModel):
     until: Optional[datetime] = None
 
     time_unit: str = "daily"
+    max_workers: int = 1
+    count_only: bool = False
 
     @validator("incident_urgency")
     def validate_incident_urgency(cls, v):
@@ -27,6 +35,19 @@ class PagerDutyIncidentFrequencyParams(BaseModel):
         return v
 
 
+def incident_frequency(
+    total_incidents: int, params_model: PagerDutyIncidentFrequencyParams
+) -> float:
+    default_since = datetime.min.replace(tzinfo=timezone.utc)
+    default_until = datetime.now(timezone.utc)
+
+    since = params_model.since or default_since
+    until = params_model.until or default_until
+
+    time_delta = until - since
+    return calculate_frequency(total_incidents, time_delta, params_model.time_unit)
+
+
 class PagerDutyIncidentFrequencyDeducer(Deducer):
     """
     Deducer class for calculating the frequency of incidents reported in PagerDuty.
@@ -40,8 +61,9 @@ class PagerDutyIncidentFrequencyDeducer(Deducer):
         params_model (PagerDutyIncidentFrequencyParams): Parameters for incident frequency extraction.
 
     Methods:
-        retrieve_data: Retrieves incident data from PagerDuty.
-        process_data: Processes the fetched data to count the number of incidents.
+        retrieve_data: Streams incident data from PagerDuty, page by page, or only
+            fetches the server-side total when `count_only` is set.
+        process_data: Counts the streamed incidents.
         finalize: Finalizes the data processing to calculate the incident frequency.
     """
 
@@ -52,37 +74,27 @@ class PagerDutyIncidentFrequencyDeducer(Deducer):
         super().__init__(connector, params)
 
     def retrieve_data(self):
-        endpoint = f"/incidents?service_ids[]={self.params_model.service_id}"
-
-        if self.params_model.incident_urgency:
-            endpoint += f"&urgencies[]={self.params_model.incident_urgency}"
-
-        if self.params_model.since:
-            endpoint += f"&since={self.params_model.since.isoformat()}"
-
-        if self.params_model.until:
-            endpoint += f"&until={self.params_model.until.isoformat()}"
-
-        response = self.client.make_request(endpoint)
-
-        if response.status_code == 200:
-            return response.json()
-        else:
-            response.raise_for_status()
+        if self.params_model.count_only:
+            query = build_incidents_query(
+                [self.params_model.service_id],
+                self.params_model.incident_urgency,
+                self.params_model.since,
+                self.params_model.until,
+            )
+            return count_incidents(self.client, query)
+        return iter_service_incidents(
+            self.client,
+            self.params_model.service_id,
+            self.params_model.incident_urgency,
+            self.params_model.since,
+            self.params_model.until,
+            max_workers=self.params_model.max_workers,
+        )
 
     def process_data(self, data):
-        incidents = data.get("incidents", [])
-        return len(incidents)
+        if isinstance(data, int):
+            return data
+        return sum(1 for _ in incidents_from(data))
 
     def finalize(self, processed_data):
-        total_incidents = processed_data
-        default_since = datetime.min.replace(tzinfo=timezone.utc)
-        default_until = datetime.now(timezone.utc)
-
-        since = self.params_model.since or default_since
-        until = self.params_model.until or default_until
-
-        time_delta = until - since
-        return calculate_frequency(
-            total_incidents, time_delta, self.params_model.time_unit
-        )
+        return incident_frequency(processed_data, self.params_model)
@@ -1 +1,313 @@
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from pydantic import BaseModel
+
+from metricheq.core.connectors.store import HistoricalStore
+from metricheq.core.deducers.utils import parse_timestamp
+from metricheq.exceptions.core.exceptions import PaginationLimitError
+
 INCIDENT_URGENCY_ALLOWED_VALUES = {"high", "low"}
+
+# Kind of the resolved incidents kept in a client's historical store.
+INCIDENT_RECORD_KIND = "pagerduty.incident"
+
+SERVICES_ANALYTICS_ENDPOINT = "/analytics/metrics/incidents/services"
+# Statuses of accounts without access to the Analytics API.
+ANALYTICS_UNAVAILABLE_STATUSES = {402, 403, 404}
+
+INCIDENTS_PAGE_SIZE = 100
+# Classic pagination refuses requests where offset + limit exceeds 10000.
+INCIDENTS_MAX_OFFSET = 10000
+# Shortest window split further when it still holds too many incidents.
+MIN_SPLIT_WINDOW = timedelta(seconds=1)
+
+
+def as_utc(moment: datetime) -> datetime:
+    """Reads naive datetimes as UTC so they compare with PagerDuty timestamps."""
+    if moment.tzinfo is None:
+        return moment.replace(tzinfo=timezone.utc)
+    return moment
+
+
+class ResolutionTotals(BaseModel):
+    """Running aggregates of resolved incidents."""
+
+    count: int = 0
+    total_seconds: float = 0.0
+
+    def add(self, seconds: float):
+        self.count += 1
+        self.total_seconds += seconds
+
+    @property
+    def average(self) -> Optional[float]:
+        if self.count == 0:
+            return None
+        return self.total_seconds / self.count
+
+
+def resolution_seconds(incident: dict) -> Optional[float]:
+    """Seconds from creation to resolution, None while the incident is open."""
+    if incident["status"] != "resolved":
+        return None
+    created_at = parse_timestamp(incident["created_at"])
+    resolved_at = parse_timestamp(incident["last_status_change_at"])
+    return (resolved_at - created_at).total_seconds()
+
+
+def build_incidents_query(
+    service_ids: Iterable[str],
+    incident_urgency: Optional[str] = None,
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+) -> dict:
+    query: dict = {"service_ids[]": list(service_ids)}
+    if incident_urgency:
+        query["urgencies[]"] = [incident_urgency]
+    if since:
+        query["since"] = since.isoformat()
+    if until:
+        query["until"] = until.isoformat()
+    return query
+
+
+def closed_window(
+    since: datetime, until: Optional[datetime] = None
+) -> Tuple[datetime, datetime]:
+    """
+    Reads both bounds as UTC and ends an open-ended window now.
+
+    A closed window can be split when it holds more incidents than PagerDuty
+    pages through, see `iter_incidents`.
+    """
+    return as_utc(since), as_utc(until) if until else datetime.now(timezone.utc)
+
+
+def fetch_incidents_page(
+    client, query: dict, offset: int, limit: int, total: bool = False
+) -> dict:
+    params = {
+        **query,
+        "offset": offset,
+        "limit": limit,
+        "total": "true" if total else "false",
+    }
+    response = client.make_request("/incidents", params=params)
+    if response.status_code == 200:
+        return response.json()
+    response.raise_for_status()
+    return {}
+
+
+def iter_incidents(
+    client,
+    query: dict,
+    page_size: int = INCIDENTS_PAGE_SIZE,
+    max_workers: int = 1,
+) -> Iterator[dict]:
+    """
+    Yields every incident matching `query`, one page at a time.
+
+    Pages are walked with `offset`/`limit` until PagerDuty reports no `more`
+    results. With `max_workers` above one the remaining pages are fetched
+    concurrently while still being yielded in order, at most `max_workers`
+    pages ahead of the consumer.
+
+    PagerDuty serves no more than `INCIDENTS_MAX_OFFSET` incidents per query.
+    When the query has a `since`/`until` window, the first page requests the
+    `total` and a window holding more incidents is split in halves, walked one
+    after the other. Without a window, reaching the limit raises
+    `PaginationLimitError` rather than returning a truncated stream.
+    """
+    windowed = "since" in query and "until" in query
+    concurrent = max_workers > 1
+    page = fetch_incidents_page(
+        client, query, 0, page_size, total=concurrent or windowed
+    )
+    total = page.get("total")
+    if isinstance(total, int) and total > INCIDENTS_MAX_OFFSET:
+        if not windowed:
+            raise _limit_error(query)
+        for half in _split_window(query):
+            yield from iter_incidents(client, half, page_size, max_workers)
+        return
+
+    yield from page.get("incidents", [])
+    if not page.get("more"):
+        return
+
+    if concurrent and isinstance(total, int):
+        offsets = range(page_size, total, page_size)
+        yield from _iter_pages_concurrently(
+            client, query, offsets, page_size, max_workers
+        )
+        return
+
+    offset = page_size
+    while True:
+        if offset >= INCIDENTS_MAX_OFFSET:
+            raise _limit_error(query)
+        page = fetch_incidents_page(client, query, offset, page_size)
+        yield from page.get("incidents", [])
+        if not page.get("more"):
+            return
+        offset += page_size
+
+
+def _limit_error(query: dict) -> PaginationLimitError:
+    return PaginationLimitError(
+        f"More than {INCIDENTS_MAX_OFFSET} incidents match {query}, "
+        "narrow the query with a shorter since/until window"
+    )
+
+
+def _split_window(query: dict) -> List[dict]:
+    since = parse_timestamp(query["since"])
+    until = parse_timestamp(query["until"])
+    if until - since <= MIN_SPLIT_WINDOW:
+        raise _limit_error(query)
+    middle = since + (until - since) / 2
+    return [
+        {**query, "until": middle.isoformat()},
+        {**query, "since": middle.isoformat()},
+    ]
+
+
+def _iter_pages_concurrently(
+    client, query: dict, offsets: range, page_size: int, max_workers: int
+) -> Iterator[dict]:
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        pending = []
+        for offset in offsets:
+            pending.append(
+                executor.submit(fetch_incidents_page, client, query, offset, page_size)
+            )
+            if len(pending) >= max_workers:
+                yield from pending.pop(0).result().get("incidents", [])
+        for future in pending:
+            yield from future.result().get("incidents", [])
+
+
+def incident_scope(service_id: str, incident_urgency: Optional[str] = None) -> str:
+    """Scope of the incidents of one service and urgency in a historical store."""
+    return f"{service_id}:{incident_urgency or ''}"
+
+
+def iter_service_incidents(
+    client,
+    service_id: str,
+    incident_urgency: Optional[str] = None,
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    max_workers: int = 1,
+    store: Optional[HistoricalStore] = None,
+) -> Iterator[dict]:
+    """
+    Yields the incidents of one service, reading settled history locally.
+
+    When the window has a `since` bound and a `store` is given, or the client
+    has a historical store, incidents within the store's coverage are read from
+    disk and only the remaining tail is requested. Once that tail is fully
+    consumed its resolved incidents are stored and the coverage is extended up
+    to the oldest incident still open, as PagerDuty filters `since`/`until` on
+    creation time.
+
+    A window with a `since` bound and no `until` ends now, with or without a
+    store, so it can be split past the offset limit.
+    """
+    if store is None:
+        store = getattr(client, "historical_store", None)
+    if since is None:
+        query = build_incidents_query([service_id], incident_urgency, until=until)
+        yield from iter_incidents(client, query, max_workers=max_workers)
+        return
+
+    since, until = closed_window(since, until)
+    if not isinstance(store, HistoricalStore):
+        query = build_incidents_query([service_id], incident_urgency, since, until)
+        yield from iter_incidents(client, query, max_workers=max_workers)
+        return
+
+    until = min(until, datetime.now(timezone.utc))
+    scope = incident_scope(service_id, incident_urgency)
+
+    fetch_since = since
+    coverage = store.coverage(INCIDENT_RECORD_KIND, scope)
+    if coverage is not None and coverage[0] <= since < coverage[1]:
+        fetch_since = min(coverage[1], until)
+        yield from store.query(INCIDENT_RECORD_KIND, scope, since, fetch_since)
+    if fetch_since >= until:
+        return
+
+    query = build_incidents_query([service_id], incident_urgency, fetch_since, until)
+    resolved = []
+    oldest_open = None
+    for incident in iter_incidents(client, query, max_workers=max_workers):
+        yield incident
+        created_at = parse_timestamp(incident["created_at"])
+        if incident["status"] == "resolved":
+            resolved.append((incident["id"], created_at, incident))
+        elif oldest_open is None or created_at < oldest_open:
+            oldest_open = created_at
+
+    store.put_many(
+        INCIDENT_RECORD_KIND,
+        scope,
+        resolved,
+        coverage=(fetch_since, oldest_open or until),
+    )
+
+
+def count_incidents(client, query: dict) -> int:
+    """
+    Counts incidents server side with `total=true&limit=1`.
+
+    Falls back to streaming every page when the response carries no total.
+    """
+    page = fetch_incidents_page(client, query, 0, 1, total=True)
+    total = page.get("total")
+    if isinstance(total, int):
+        return total
+    return sum(1 for _ in iter_incidents(client, query))
+
+
+def fetch_services_analytics(
+    client,
+    service_ids: List[str],
+    incident_urgency: Optional[str],
+    since: datetime,
+    until: datetime,
+) -> Optional[Dict[str, dict]]:
+    """
+    Fetches aggregated incident metrics of every service in one request.
+
+    Returns the rows keyed by service ID, or None when Analytics is not
+    available to the account so callers can fall back to raw incidents.
+    """
+    filters: dict = {
+        "created_at_start": since.isoformat(),
+        "created_at_end": until.isoformat(),
+        "service_ids": list(service_ids),
+    }
+    if incident_urgency:
+        filters["urgency"] = incident_urgency
+    response = client.make_request(
+        SERVICES_ANALYTICS_ENDPOINT,
+        method="POST",
+        json={"filters": filters, "time_zone": "Etc/UTC"},
+        headers={"X-EARLY-ACCESS": "analytics-v2"},
+    )
+    if response.status_code in ANALYTICS_UNAVAILABLE_STATUSES:
+        return None
+    if response.status_code != 200:
+        response.raise_for_status()
+    return {row["service_id"]: row for row in response.json().get("data", [])}
+
+
+def incidents_from(data) -> Iterable[dict]:
+    """Accepts either a raw `/incidents` payload or an iterable of incidents."""
+    if isinstance(data, dict):
+        return data.get("incidents", [])
+    return data
@@ -1,3 +1,13 @@
+from .prometheus_batch_service_availability import (
+    PrometheusBatchServiceAvailabilityDeducer,
+    PrometheusBatchServiceAvailabilityParams,
+)
+from .prometheus_series_availability import PrometheusSeriesAvailabilityDeducer
 from .prometheus_service_availability import PrometheusServiceAvailabilityDeducer
 
-__all__ = ["PrometheusServiceAvailabilityDeducer"]
+__all__ = [
+    "PrometheusBatchServiceAvailabilityDeducer",
+    "PrometheusBatchServiceAvailabilityParams",
+    "PrometheusSeriesAvailabilityDeducer",
+    "PrometheusServiceAvailabilityDeducer",
+]
@@ -0,0 +1,103 @@
+from array import array
+from operator import itemgetter
+from typing import List, Optional, Tuple
+
+from pydantic import BaseModel
+
+
+class SeriesColumns:
+    """
+    One series of a Prometheus matrix stored as compact columns.
+
+    Sample values arrive as strings. Plain `up` samples are only ever "0" or
+    "1", so they are counted directly on the string column; `array('d')`
+    columns are built, once, only for fractional values and downtime spans.
+    """
+
+    def __init__(self, metric: dict, samples: list) -> None:
+        self.metric = metric
+        self._samples = samples
+        self.raw_values = list(map(itemgetter(1), samples))
+        self._values: Optional[array] = None
+        self._timestamps: Optional[array] = None
+
+    @property
+    def values(self) -> array:
+        if self._values is None:
+            self._values = array("d", map(float, self.raw_values))
+        return self._values
+
+    @property
+    def timestamps(self) -> array:
+        if self._timestamps is None:
+            self._timestamps = array("d", map(float, map(itemgetter(0), self._samples)))
+        return self._timestamps
+
+    def __len__(self):
+        return len(self.raw_values)
+
+    def up_total(self) -> float:
+        ups = self.raw_values.count("1")
+        if ups + self.raw_values.count("0") == len(self.raw_values):
+            return ups
+        return sum(self.values)
+
+    def availability(self) -> float:
+        if len(self) == 0:
+            return 0
+        return self.up_total() / len(self) * 100
+
+    def downtime_spans(self) -> List[Tuple[float, float]]:
+        """
+        Returns `(start, end)` timestamps of every run of samples below 1.
+
+        A span ends at the first sample back up, or at the last sample when the
+        series is still down at the end of the window.
+        """
+        if self.raw_values.count("1") == len(self):
+            return []
+        down = [value < 1 for value in self.values]
+        # Edges between consecutive samples, padded as up on both sides
+        edges = list(zip([False, *down], [*down, False]))
+        starts = [index for index, edge in enumerate(edges) if edge == (False, True)]
+        ends = [index for index, edge in enumerate(edges) if edge == (True, False)]
+        last = len(self) - 1
+        timestamps = self.timestamps
+        return [
+            (timestamps[start], timestamps[min(end, last)])
+            for start, end in zip(starts, ends)
+        ]
+
+
+def to_columns(results: list) -> List[SeriesColumns]:
+    return [
+        SeriesColumns(result.get("metric", {}), result.get("values", []))
+        for result in results
+    ]
+
+
+def matrix_availability(columns: List[SeriesColumns]) -> float:
+    """Share of up samples across every series, in percent."""
+    total = sum(len(series) for series in columns)
+    if total == 0:
+        return 0
+    return sum(series.up_total() for series in columns) / total * 100
+
+
+class SeriesAvailability(BaseModel):
+    """Availability of one series of a matrix, with the spans it was down."""
+
+    labels: dict
+    availability: float
+    downtime_spans: List[Tuple[float, float]]
+
+
+def series_availability(columns: List[SeriesColumns]) -> List[SeriesAvailability]:
+    return [
+        SeriesAvailability(
+            labels=series.metric,
+            availability=series.availability(),
+            downtime_spans=series.downtime_spans(),
+        )
+        for series in columns
+    ]
@@ -0,0 +1,65 @@
+from datetime import datetime
+from typing import Dict
+
+from pydantic import BaseModel
+from metricheq.core.connectors.base import Connector
+from metricheq.core.connectors.prometheus import PrometheusConnector
+
+from metricheq.core.deducers.base import BatchDeducer
+from .utils import (
+    availability_ratio_query,
+    build_label_filters,
+    fetch_instant,
+    vector_ratio_percentage,
+)
+
+
+class PrometheusBatchServiceAvailabilityParams(BaseModel):
+    """
+    Attributes:
+        group_by (str): Label identifying a service, e.g. `job` or `service`.
+        labels (dict[str, str]): Label matchers restricting the `up` series.
+        start_time (datetime): Start of the availability window.
+        end_time (datetime): End of the availability window.
+    """
+
+    group_by: str
+    labels: dict[str, str] = {}
+    start_time: datetime
+    end_time: datetime
+
+
+class PrometheusBatchServiceAvailabilityDeducer(BatchDeducer):
+    """
+    Deducer computing the availability of many services with one PromQL query.
+
+    The ratio of up samples is aggregated `by (group_by)` server side, so the
+    result maps every value of the grouping label to its availability
+    percentage instead of issuing one range query per service.
+    """
+
+    def __init__(self, connector: Connector, params: dict):
+        if not isinstance(connector, PrometheusConnector):
+            raise TypeError(
+                "The provided connector is not a valid prometheus connector"
+            )
+        self.params_model = PrometheusBatchServiceAvailabilityParams(**params)
+        super().__init__(connector, params)
+
+    def retrieve_data(self):
+        label_filters = build_label_filters(self.params_model.labels)
+        window = self.params_model.end_time - self.params_model.start_time
+        query = availability_ratio_query(
+            label_filters,
+            int(window.total_seconds()),
+            group_by=self.params_model.group_by,
+        )
+        return fetch_instant(self.client, query, self.params_model.end_time)
+
+    def process_data(self, data) -> Dict[str, float]:
+        availability = {}
+        for result in data.get("data", {}).get("result", []):
+            service = result.get("metric", {}).get(self.params_model.group_by, "")
+            _, ratio = result["value"]
+            availability[service] = vector_ratio_percentage(ratio)
+        return availability
@@ -0,0 +1,39 @@
+from typing import Dict
+
+from metricheq.core.connectors.base import Connector
+from metricheq.core.deducers.base import BatchDeducer
+from metricheq.evaluation.metric import Metric
+from .matrix import SeriesAvailability, series_availability, to_columns
+from .prometheus_service_availability import PrometheusServiceAvailabilityDeducer
+from .utils import build_label_filters
+
+
+class PrometheusSeriesAvailabilityDeducer(
+    PrometheusServiceAvailabilityDeducer, BatchDeducer
+):
+    """
+    Deducer reporting the availability of every `up` series on its own.
+
+    Takes the params of `PrometheusServiceAvailabilityDeducer` in "range" mode.
+    The deduced value maps the labels of every series, formatted as label
+    matchers, to its availability and the spans it was down; `metrics` map
+    them to the availability percentage.
+    """
+
+    def __init__(self, connector: Connector, params: dict):
+        super().__init__(connector, params)
+        if self.params_model.mode != "range":
+            raise ValueError("Series availability needs the samples of mode 'range'")
+
+    def process_data(self, data) -> Dict[str, SeriesAvailability]:
+        results = data.get("data", {}).get("result", [])
+        return {
+            build_label_filters(dict(sorted(series.labels.items()))): series
+            for series in series_availability(to_columns(results))
+        }
+
+    def to_metrics(self, values: Dict[str, SeriesAvailability]) -> dict:
+        return {
+            labels: Metric(value=series.availability)
+            for labels, series in values.items()
+        }
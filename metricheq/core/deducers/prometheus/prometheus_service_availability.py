@@ -1,19 +1,72 @@
 from datetime import datetime
-from urllib.parse import quote
 
 from typing import Optional
-from pydantic import BaseModel
+from pydantic import BaseModel, validator
 from metricheq.core.connectors.base import Connector
 from metricheq.core.connectors.prometheus import PrometheusConnector
 
 from metricheq.core.deducers.base import Deducer
+from .matrix import matrix_availability, to_columns
+from .utils import (
+    AVAILABILITY_MODES,
+    DEFAULT_POINTS_PER_CHUNK,
+    MAX_POINTS_PER_SERIES,
+    availability_ratio_query,
+    build_label_filters,
+    fetch_instant,
+    fetch_range_chunked,
+    resolve_step,
+    up_range_query,
+    vector_ratio_percentage,
+)
+
+DEFAULT_STEP = 60
 
 
 class PrometheusServiceAvailabilityParams(BaseModel):
+    """
+    Attributes:
+        labels (dict[str, str]): Label matchers selecting the `up` series.
+        start_time (datetime): Start of the availability window.
+        end_time (datetime): End of the availability window.
+        step (Optional[int]): Resolution of the range query, in seconds.
+        mode (str): "range" counts the raw samples of a range query client side,
+            "aggregate" lets Prometheus compute the ratio with an instant query.
+        max_points_per_chunk (int): Longest range query sent at once; longer
+            windows are split into aligned sub-ranges.
+        max_workers (int): Number of sub-ranges fetched concurrently.
+        max_points (Optional[int]): Budget of samples per series; the step is
+            widened to fit it, trading resolution for payload size and latency.
+    """
+
     labels: dict[str, str]
     start_time: datetime
     end_time: datetime
     step: Optional[int] = None
+    mode: str = "range"
+    max_points_per_chunk: int = DEFAULT_POINTS_PER_CHUNK
+    max_workers: int = 4
+    max_points: Optional[int] = None
+
+    @validator("mode")
+    def validate_mode(cls, v):
+        if v not in AVAILABILITY_MODES:
+            raise ValueError(f"Invalid mode: {v}. Must be one of {AVAILABILITY_MODES}")
+        return v
+
+    @validator("max_points")
+    def validate_max_points(cls, v):
+        if v is not None and v < 2:
+            raise ValueError(f"Invalid max_points: {v}. Must be at least 2")
+        return v
+
+    @validator("max_points_per_chunk")
+    def validate_max_points_per_chunk(cls, v):
+        if not 0 < v <= MAX_POINTS_PER_SERIES:
+            raise ValueError(
+                f"Invalid max_points_per_chunk: {v}. Must be between 1 and {MAX_POINTS_PER_SERIES}"
+            )
+        return v
 
 
 class PrometheusServiceAvailabilityDeducer(Deducer):
@@ -26,39 +79,48 @@ class PrometheusServiceAvailabilityDeducer(Deducer):
         super().__init__(connector, params)
 
     def retrieve_data(self):
-        label_filters = ",".join(
-            [f'{key}="{value}"' for key, value in self.params_model.labels.items()]
+        if self.params_model.mode == "aggregate":
+            return self.retrieve_aggregate()
+
+        label_filters = build_label_filters(self.params_model.labels)
+        requested_step = self.params_model.step or DEFAULT_STEP
+        step = resolve_step(
+            self.params_model.start_time,
+            self.params_model.end_time,
+            requested_step,
+            self.params_model.max_points,
         )
-        start_date_rfc3339 = self.params_model.start_time.isoformat() + "Z"
-        end_date_rfc3339 = self.params_model.end_time.isoformat() + "Z"
-        step = self.params.get("step", 60)
+        query = up_range_query(label_filters, step, widened=step > requested_step)
 
-        query = f"up{{{label_filters}}}"
-        encoded_query = quote(query)
-        endpoint = f"query_range?query={encoded_query}&start={start_date_rfc3339}&end={end_date_rfc3339}&step={step}"
+        return fetch_range_chunked(
+            self.client,
+            query,
+            self.params_model.start_time,
+            self.params_model.end_time,
+            step,
+            max_points=self.params_model.max_points_per_chunk,
+            max_workers=self.params_model.max_workers,
+        )
 
-        response = self.client.make_request(endpoint)
-        if response.status_code == 200:
-            return response.json()
-        else:
-            response.raise_for_status()
+    def retrieve_aggregate(self):
+        label_filters = build_label_filters(self.params_model.labels)
+        window = self.params_model.end_time - self.params_model.start_time
+        query = availability_ratio_query(label_filters, int(window.total_seconds()))
+        return fetch_instant(self.client, query, self.params_model.end_time)
 
     def process_data(self, data):
-        results = data.get("data", {}).get("result", [])
+        if data.get("data", {}).get("resultType") == "vector":
+            return self.process_aggregate(data)
 
-        up_times = 0
-        total_times = 0
-
-        for result in results:
-            for _, status in result.get("values", []):
-                total_times += 1
-                if status == "1":  # service was up
-                    up_times += 1
+        results = data.get("data", {}).get("result", [])
+        return matrix_availability(to_columns(results))
 
-        availability_percentage = (
-            (up_times / total_times) * 100 if total_times > 0 else 0
-        )
-        return availability_percentage
+    def process_aggregate(self, data):
+        results = data["data"]["result"]
+        if not results:
+            return 0
+        _, ratio = results[0]["value"]
+        return vector_ratio_percentage(ratio)
 
     def finalize(self, processed_data):
         return processed_data
@@ -0,0 +1,160 @@
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime, timedelta
+import math
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import quote
+
+AVAILABILITY_MODES = {"range", "aggregate"}
+
+# Prometheus rejects range queries returning more than 11000 points per series.
+MAX_POINTS_PER_SERIES = 11000
+DEFAULT_POINTS_PER_CHUNK = 10000
+
+
+def build_label_filters(labels: dict[str, str]) -> str:
+    return ",".join([f'{key}="{value}"' for key, value in labels.items()])
+
+
+def to_rfc3339(moment: datetime) -> str:
+    return moment.isoformat() + "Z"
+
+
+def availability_ratio_query(
+    label_filters: str, window_seconds: int, group_by: Optional[str] = None
+) -> str:
+    """
+    PromQL computing the share of `up` samples equal to 1 over the window.
+
+    Summing `sum_over_time` and `count_over_time` across series weighs every
+    sample equally, like counting the raw samples of a range query does. With
+    `group_by` the ratio is computed once per value of that label.
+    """
+    selector = f"up{{{label_filters}}}[{window_seconds}s]"
+    aggregation = f"sum by ({group_by}) " if group_by else "sum"
+    return (
+        f"{aggregation}(sum_over_time({selector})) "
+        f"/ {aggregation}(count_over_time({selector}))"
+    )
+
+
+def resolve_step(
+    start: datetime, end: datetime, step: int, max_points: Optional[int] = None
+) -> int:
+    """
+    Widens `step` until the window fits in `max_points` samples per series.
+
+    The requested step is kept as the finest resolution allowed.
+    """
+    if max_points is None:
+        return step
+    window_seconds = (end - start).total_seconds()
+    budget_step = math.ceil(window_seconds / max(max_points - 1, 1))
+    return max(step, budget_step)
+
+
+def up_range_query(label_filters: str, step: int, widened: bool) -> str:
+    """
+    PromQL selecting `up` for a range query at `step` resolution.
+
+    A widened step would skip the samples between two points, so each point
+    averages `up` over its own step-long range-vector window instead.
+    """
+    selector = f"up{{{label_filters}}}"
+    if widened:
+        return f"avg_over_time({selector}[{step}s])"
+    return selector
+
+
+def fetch_instant(client, query: str, moment: datetime):
+    endpoint = f"query?query={quote(query)}&time={to_rfc3339(moment)}"
+    response = client.make_request(endpoint)
+    if response.status_code == 200:
+        return response.json()
+    response.raise_for_status()
+
+
+def vector_ratio_percentage(value: str) -> float:
+    ratio = float(value)
+    return 0 if math.isnan(ratio) else ratio * 100
+
+
+def split_range(
+    start: datetime, end: datetime, step: int, max_points: int
+) -> List[Tuple[datetime, datetime]]:
+    """
+    Splits `start`..`end` into sub-ranges of at most `max_points` samples.
+
+    Sub-range boundaries stay on the `start + k * step` grid and never overlap,
+    so concatenating their results yields exactly the samples of one query.
+    """
+    total_seconds = (end - start).total_seconds()
+    total_points = int(total_seconds // step) + 1
+    chunks = []
+    for first_point in range(0, total_points, max_points):
+        last_point = min(first_point + max_points, total_points) - 1
+        chunks.append(
+            (
+                start + timedelta(seconds=first_point * step),
+                start + timedelta(seconds=last_point * step),
+            )
+        )
+    return chunks
+
+
+def fetch_range(client, query: str, start: datetime, end: datetime, step: int):
+    endpoint = (
+        f"query_range?query={quote(query)}"
+        f"&start={to_rfc3339(start)}&end={to_rfc3339(end)}&step={step}"
+    )
+    response = client.make_request(endpoint)
+    if response.status_code == 200:
+        return response.json()
+    response.raise_for_status()
+
+
+def fetch_range_chunked(
+    client,
+    query: str,
+    start: datetime,
+    end: datetime,
+    step: int,
+    max_points: int = DEFAULT_POINTS_PER_CHUNK,
+    max_workers: int = 4,
+):
+    """
+    Runs a range query as concurrent sub-range queries and merges the matrices.
+
+    Chunks are folded into per-series buckets as soon as they complete, then
+    every series is stitched back together in time order.
+    """
+    chunks = split_range(start, end, step, max_points)
+    if len(chunks) == 1:
+        return fetch_range(client, query, start, end, step)
+
+    labels_by_series: Dict[tuple, dict] = {}
+    values_by_series: Dict[tuple, Dict[int, list]] = {}
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = {
+            executor.submit(
+                fetch_range, client, query, chunk_start, chunk_end, step
+            ): index
+            for index, (chunk_start, chunk_end) in enumerate(chunks)
+        }
+        for future in as_completed(futures):
+            index = futures[future]
+            for series in future.result().get("data", {}).get("result", []):
+                metric = series.get("metric", {})
+                key = tuple(sorted(metric.items()))
+                labels_by_series[key] = metric
+                values_by_series.setdefault(key, {})[index] = series.get("values", [])
+
+    result = [
+        {
+            "metric": labels_by_series[key],
+            "values": [
+                value for index in sorted(chunk_values) for value in chunk_values[index]
+            ],
+        }
+        for key, chunk_values in values_by_series.items()
+    ]
+    return {"status": "success", "data": {"resultType": "matrix", "result": result}}
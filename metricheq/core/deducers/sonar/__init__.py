@@ -1,3 +1,15 @@
+from .sonar_bulk_measures import SonarBulkMeasuresDeducer, SonarBulkMeasuresParams
 from .sonar_measure import SonarMeasureDeducer, SonarMeasureParams
+from .sonar_measure_history import (
+    SonarMeasureHistoryDeducer,
+    SonarMeasureHistoryParams,
+)
 
-__all__ = ["SonarMeasureDeducer", "SonarMeasureParams"]
+__all__ = [
+    "SonarBulkMeasuresDeducer",
+    "SonarBulkMeasuresParams",
+    "SonarMeasureDeducer",
+    "SonarMeasureHistoryDeducer",
+    "SonarMeasureHistoryParams",
+    "SonarMeasureParams",
+]
@@ -0,0 +1,89 @@
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional
+
+from pydantic import BaseModel, validator
+
+from metricheq.core.connectors.base import Connector
+from metricheq.core.connectors.sonar import SonarConnector
+from metricheq.core.deducers.base import BatchDeducer
+from metricheq.evaluation.metric import Metric
+from .utils import (
+    PROJECT_KEYS_PER_SEARCH,
+    chunked,
+    fetch_measures_search,
+    iter_project_keys,
+    validate_metric_keys,
+)
+
+
+class SonarBulkMeasuresParams(BaseModel):
+    """
+    Attributes:
+        metric_keys (List[str]): Measures to read for every project.
+        project_keys (Optional[List[str]]): Projects to read; every project
+            visible to the user is discovered through `/api/components/search`
+            when omitted.
+        query (Optional[str]): Filter on project names or keys used during discovery.
+        max_workers (int): Number of `/api/measures/search` chunks fetched concurrently.
+    """
+
+    metric_keys: List[str]
+    project_keys: Optional[List[str]] = None
+    query: Optional[str] = None
+    max_workers: int = 4
+
+    @validator("metric_keys")
+    def validate_metric_keys(cls, v):
+        return validate_metric_keys(v)
+
+
+class SonarBulkMeasuresDeducer(BatchDeducer):
+    """
+    Deducer reading measures of many SonarQube projects at once.
+
+    Projects are queried through `/api/measures/search`, as many per request as
+    the API accepts, with the chunks fetched concurrently. The deduced value is
+    a table mapping every project key to its measures by metric key.
+    """
+
+    def __init__(self, connector: Connector, params: dict):
+        if not isinstance(connector, SonarConnector):
+            raise TypeError("The provided connector is not a valid sonar connector")
+        self.params_model = SonarBulkMeasuresParams(**params)
+        super().__init__(connector, params)
+
+    def retrieve_data(self) -> Dict[str, List[dict]]:
+        project_keys = self.params_model.project_keys
+        if project_keys is None:
+            project_keys = list(iter_project_keys(self.client, self.params_model.query))
+        chunks = chunked(project_keys, PROJECT_KEYS_PER_SEARCH)
+
+        measures: Dict[str, List[dict]] = {key: [] for key in project_keys}
+        with ThreadPoolExecutor(max_workers=self.params_model.max_workers) as executor:
+            for chunk_measures in executor.map(
+                lambda chunk: fetch_measures_search(
+                    self.client, chunk, self.params_model.metric_keys
+                ),
+                chunks,
+            ):
+                for measure in chunk_measures:
+                    measures.setdefault(measure["component"], []).append(measure)
+        return measures
+
+    def process_data(self, data: Dict[str, List[dict]]) -> Dict[str, Dict[str, str]]:
+        return {
+            component: {
+                measure["metric"]: measure["value"]
+                for measure in measures
+                if "value" in measure
+            }
+            for component, measures in data.items()
+        }
+
+    def to_metrics(self, values: Dict[str, Dict[str, str]]) -> dict:
+        return {
+            component: {
+                key: Metric(value=float(value)) for key, value in measures.items()
+            }
+            for component, measures in values.items()
+        }
@@ -3,9 +3,10 @@ from pydantic import BaseModel, validator
 from metricheq.core.connectors.base import Connector
 from metricheq.core.connectors.sonar import SonarConnector
 from metricheq.core.deducers.base import Deducer
+from metricheq.evaluation.metric import Metric
+from .utils import ALLOWED_METRIC_KEYS, measure_batcher_for, validate_metric_key
 
-
-ALLOWED_METRIC_KEYS = {"coverage", "bugs", "vulnerabilities", "code_smells"}
+__all__ = ["ALLOWED_METRIC_KEYS", "SonarMeasureDeducer", "SonarMeasureParams"]
 
 
 class SonarMeasureParams(BaseModel):
@@ -14,27 +15,40 @@ class SonarMeasureParams(BaseModel):
 
     @validator("metric_key")
     def validate_metric_key(cls, v):
-        if v not in ALLOWED_METRIC_KEYS:
-            raise ValueError(
-                f"Invalid metric_key: {v}. Must be one of {ALLOWED_METRIC_KEYS}"
-            )
-        return v
+        return validate_metric_key(v)
 
 
 class SonarMeasureDeducer(Deducer):
+    """
+    Deducer reading one measure of a SonarQube component.
+
+    Deducers sharing a connector and a component are batched: a single
+    `/api/measures/component` request fetches the metric keys of all of them
+    and each deducer picks its own measure from the shared payload, for up to
+    the client's `batch_max_age` seconds. `refresh` and `invalidate` drop the
+    payload waiting for this deducer, so it leads a new request.
+    """
+
     def __init__(self, connector: Connector, params: dict):
         if not isinstance(connector, SonarConnector):
             raise TypeError("The provided connector is not a valid sonar connector")
         self.params_model = SonarMeasureParams(**params)
         super().__init__(connector, params)
+        self.batcher = measure_batcher_for(connector)
+        self.batcher.register(self.params_model.component, self.params_model.metric_key)
+
+    def refresh(self) -> Metric:
+        self.batcher.forget(self.params_model.component, self.params_model.metric_key)
+        return super().refresh()
+
+    def invalidate(self):
+        self.batcher.forget(self.params_model.component, self.params_model.metric_key)
+        super().invalidate()
 
     def retrieve_data(self):
-        endpoint = f"/api/measures/component?component={self.params_model.component}&metricKeys={self.params_model.metric_key}"
-        response = self.client.make_request(endpoint)
-        if response.status_code == 200:
-            return response.json()
-        else:
-            response.raise_for_status()
+        return self.batcher.measures(
+            self.params_model.component, self.params_model.metric_key
+        )
 
     def process_data(self, data):
         measures = data.get("component", {}).get("measures", [])
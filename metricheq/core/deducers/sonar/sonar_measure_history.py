@@ -0,0 +1,80 @@
+from datetime import datetime, timezone
+from typing import Dict, List, Optional
+
+from pydantic import BaseModel, validator
+
+from metricheq.core.connectors.base import Connector
+from metricheq.core.connectors.sonar import SonarConnector
+from metricheq.core.connectors.store import HistoricalStore
+from metricheq.core.deducers.base import BatchDeducer
+from metricheq.core.deducers.utils import parse_timestamp
+from .utils import (
+    iter_measure_history,
+    stored_measure_history,
+    validate_metric_keys,
+)
+
+
+class SonarMeasureHistoryParams(BaseModel):
+    """
+    Attributes:
+        component (str): Key of the project or component.
+        metric_key (str): Measure whose history is read.
+        since (Optional[datetime]): Oldest analysis date to read; naive
+            datetimes are read as UTC.
+        until (Optional[datetime]): Analysis date the history stops before.
+    """
+
+    component: str
+    metric_key: str
+    since: Optional[datetime] = None
+    until: Optional[datetime] = None
+
+    @validator("metric_key")
+    def validate_metric_key(cls, v):
+        return validate_metric_keys([v])[0]
+
+    @validator("since", "until")
+    def validate_timezone(cls, v):
+        if v is not None and v.tzinfo is None:
+            return v.replace(tzinfo=timezone.utc)
+        return v
+
+
+class SonarMeasureHistoryDeducer(BatchDeducer):
+    """
+    Deducer reading the history of one measure of a SonarQube component.
+
+    The history comes from `/api/measures/search_history`. When the client
+    has a historical store it is paged through once and kept locally, and later
+    runs only request the points analysed since the last stored one. The
+    deduced value maps every analysis date to the measure at that time.
+    """
+
+    def __init__(self, connector: Connector, params: dict):
+        if not isinstance(connector, SonarConnector):
+            raise TypeError("The provided connector is not a valid sonar connector")
+        self.params_model = SonarMeasureHistoryParams(**params)
+        super().__init__(connector, params)
+
+    def retrieve_data(self) -> List[dict]:
+        params = self.params_model
+        store = getattr(self.client, "historical_store", None)
+        if not isinstance(store, HistoricalStore):
+            return list(
+                iter_measure_history(
+                    self.client, params.component, params.metric_key, params.since
+                )
+            )
+        return stored_measure_history(
+            self.client, store, params.component, params.metric_key, params.since
+        )
+
+    def process_data(self, data: List[dict]) -> Dict[datetime, float]:
+        until = self.params_model.until
+        history = {}
+        for point in data:
+            date = parse_timestamp(point["date"])
+            if "value" in point and (until is None or date < until):
+                history[date] = float(point["value"])
+        return history
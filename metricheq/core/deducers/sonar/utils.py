@@ -0,0 +1,257 @@
+from concurrent.futures import Future
+from datetime import datetime, timezone
+import threading
+import time
+from typing import Dict, Iterable, Iterator, List, Optional, Set, Tuple
+import weakref
+
+from metricheq.core.connectors.base import DEFAULT_BATCH_MAX_AGE, ClientConfig
+from metricheq.core.connectors.store import HistoricalStore
+from metricheq.core.deducers.utils import parse_timestamp
+
+ALLOWED_METRIC_KEYS = {"coverage", "bugs", "vulnerabilities", "code_smells"}
+
+# Largest `projectKeys` list accepted by `/api/measures/search`.
+PROJECT_KEYS_PER_SEARCH = 100
+# Largest page size of `/api/components/search`.
+COMPONENTS_PAGE_SIZE = 500
+
+# Largest page size of `/api/measures/search_history`.
+HISTORY_PAGE_SIZE = 1000
+# Kind of the measure history points kept in a client's historical store.
+HISTORY_RECORD_KIND = "sonar.measure_history"
+# Start of the coverage of a history fetched without a `from` bound.
+HISTORY_ORIGIN = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+
+def validate_metric_key(metric_key: str) -> str:
+    if metric_key not in ALLOWED_METRIC_KEYS:
+        raise ValueError(
+            f"Invalid metric_key: {metric_key}. Must be one of {ALLOWED_METRIC_KEYS}"
+        )
+    return metric_key
+
+
+def validate_metric_keys(metric_keys: List[str]) -> List[str]:
+    if not metric_keys:
+        raise ValueError("metric_keys must not be empty")
+    invalid = set(metric_keys) - ALLOWED_METRIC_KEYS
+    if invalid:
+        raise ValueError(
+            f"Invalid metric_keys: {sorted(invalid)}. Must be in {ALLOWED_METRIC_KEYS}"
+        )
+    return metric_keys
+
+
+def chunked(items: List[str], size: int) -> List[List[str]]:
+    return [items[start : start + size] for start in range(0, len(items), size)]
+
+
+def iter_project_keys(client, query: Optional[str] = None) -> Iterator[str]:
+    """Yields the key of every project visible to the user, page by page."""
+    page = 1
+    while True:
+        params: dict = {"qualifiers": "TRK", "ps": COMPONENTS_PAGE_SIZE, "p": page}
+        if query:
+            params["q"] = query
+        response = client.make_request("/api/components/search", params=params)
+        if response.status_code != 200:
+            response.raise_for_status()
+        data = response.json()
+        for component in data.get("components", []):
+            yield component["key"]
+        paging = data.get("paging", {})
+        seen = page * paging.get("pageSize", COMPONENTS_PAGE_SIZE)
+        if seen >= paging.get("total", 0):
+            return
+        page += 1
+
+
+def fetch_measures_search(
+    client, project_keys: Iterable[str], metric_keys: Iterable[str]
+) -> List[dict]:
+    params = {
+        "projectKeys": ",".join(project_keys),
+        "metricKeys": ",".join(sorted(metric_keys)),
+    }
+    response = client.make_request("/api/measures/search", params=params)
+    if response.status_code == 200:
+        return response.json().get("measures", [])
+    response.raise_for_status()
+    return []
+
+
+def fetch_component_measures(client, component: str, metric_keys) -> dict:
+    params = {"component": component, "metricKeys": ",".join(sorted(metric_keys))}
+    response = client.make_request("/api/measures/component", params=params)
+    if response.status_code == 200:
+        return response.json()
+    response.raise_for_status()
+    return {}
+
+
+def iter_measure_history(
+    client, component: str, metric_key: str, since: Optional[datetime] = None
+) -> Iterator[dict]:
+    """Yields the `{"date", "value"}` points of one measure, oldest first."""
+    page = 1
+    while True:
+        params: dict = {
+            "component": component,
+            "metrics": metric_key,
+            "ps": HISTORY_PAGE_SIZE,
+            "p": page,
+        }
+        if since is not None:
+            params["from"] = since.strftime("%Y-%m-%dT%H:%M:%S%z")
+        response = client.make_request("/api/measures/search_history", params=params)
+        if response.status_code != 200:
+            response.raise_for_status()
+        data = response.json()
+        for measure in data.get("measures", []):
+            if measure.get("metric") == metric_key:
+                yield from measure.get("history", [])
+        paging = data.get("paging", {})
+        seen = page * paging.get("pageSize", HISTORY_PAGE_SIZE)
+        if seen >= paging.get("total", 0):
+            return
+        page += 1
+
+
+def stored_measure_history(
+    client,
+    store: HistoricalStore,
+    component: str,
+    metric_key: str,
+    since: Optional[datetime] = None,
+) -> List[dict]:
+    """
+    Returns the history of one measure from `since` on, kept up to date locally.
+
+    The history is paged through once from `since`, or from the first
+    analysis. Afterwards only points from the last stored date onwards are
+    requested, that last point included since analyses may share its date.
+    When eviction dropped part of the requested history, the whole of it is
+    requested again and returned as fetched.
+    """
+    if since is not None and since.tzinfo is None:
+        since = since.replace(tzinfo=timezone.utc)
+    scope = f"{component}:{metric_key}"
+    start = since or HISTORY_ORIGIN
+
+    coverage = store.coverage(HISTORY_RECORD_KIND, scope)
+    if coverage is not None and coverage[0] <= start:
+        _store_history(client, store, scope, component, metric_key, coverage[1])
+        coverage = store.coverage(HISTORY_RECORD_KIND, scope)
+        if coverage is not None and coverage[0] <= start:
+            return store.query(HISTORY_RECORD_KIND, scope, since)
+    return _store_history(client, store, scope, component, metric_key, since)
+
+
+def _store_history(
+    client,
+    store: HistoricalStore,
+    scope: str,
+    component: str,
+    metric_key: str,
+    since: Optional[datetime],
+) -> List[dict]:
+    history = list(iter_measure_history(client, component, metric_key, since))
+    points = [
+        (point["date"], parse_timestamp(point["date"]), point) for point in history
+    ]
+    if points:
+        coverage = (since or HISTORY_ORIGIN, max(date for _, date, _ in points))
+        store.put_many(HISTORY_RECORD_KIND, scope, points, coverage=coverage)
+    return history
+
+
+class SonarMeasureBatcher:
+    """
+    Coalesces the measures requested for one component into a single request.
+
+    Deducers register the metric key they need up front. The first of them to
+    retrieve its data requests every key registered for the component, and
+    the others are handed the same payload, as long as it is fresher than
+    `max_age` seconds. Keys are registered again once served, so every later
+    round of evaluations is batched as well.
+    """
+
+    def __init__(self, client, max_age: float = DEFAULT_BATCH_MAX_AGE) -> None:
+        self.client = client
+        self.max_age = max_age
+        self._pending: Dict[str, Set[str]] = {}
+        self._batched: Dict[Tuple[str, str], Tuple[float, Future]] = {}
+        self._lock = threading.Lock()
+
+    def register(self, component: str, metric_key: str):
+        with self._lock:
+            self._pending.setdefault(component, set()).add(metric_key)
+
+    def measures(self, component: str, metric_key: str) -> dict:
+        with self._lock:
+            self._forget_stale()
+            batched = self._batched.pop((component, metric_key), None)
+            if batched is None:
+                metric_keys = self._pending.pop(component, set()) | {metric_key}
+                future: Future = Future()
+                batched_at = time.monotonic()
+                for other_key in metric_keys - {metric_key}:
+                    self._batched[(component, other_key)] = (batched_at, future)
+            self._pending.setdefault(component, set()).add(metric_key)
+        if batched is not None:
+            return batched[1].result()
+
+        try:
+            future.set_result(
+                fetch_component_measures(self.client, component, metric_keys)
+            )
+        except Exception as error:
+            # Keys still waiting for this payload lead their own retry instead
+            with self._lock:
+                for other_key in metric_keys:
+                    entry = self._batched.get((component, other_key))
+                    if entry is not None and entry[1] is future:
+                        del self._batched[(component, other_key)]
+            future.set_exception(error)
+        return future.result()
+
+    def forget(self, component: str, metric_key: str):
+        """Drops the payload waiting for a key, so its next call leads a request."""
+        with self._lock:
+            self._batched.pop((component, metric_key), None)
+
+    def _forget_stale(self):
+        now = time.monotonic()
+        stale = [
+            key
+            for key, (batched_at, _) in self._batched.items()
+            if now - batched_at >= self.max_age
+        ]
+        for key in stale:
+            del self._batched[key]
+
+
+_batchers: "weakref.WeakKeyDictionary" = weakref.WeakKeyDictionary()
+_batchers_lock = threading.Lock()
+
+
+def measure_batcher_for(connector) -> SonarMeasureBatcher:
+    """
+    Returns the batcher shared by every deducer of `connector`.
+
+    Payloads are shared for the client's `batch_max_age` seconds.
+    """
+    with _batchers_lock:
+        batcher = _batchers.get(connector)
+        if batcher is None:
+            config = getattr(connector.client, "client_config", None)
+            max_age = (
+                config.batch_max_age
+                if isinstance(config, ClientConfig)
+                else DEFAULT_BATCH_MAX_AGE
+            )
+            batcher = _batchers[connector] = SonarMeasureBatcher(
+                connector.client, max_age
+            )
+        return batcher
@@ -1,4 +1,11 @@
-from datetime import timedelta
+from datetime import datetime, timedelta
+from functools import lru_cache
+from typing import Iterable, List
+
+from dateutil.parser import parse
+
+# Distinct timestamp strings remembered by `parse_timestamp`.
+TIMESTAMP_MEMO_SIZE = 4096
 
 
 def convert_seconds(duration_in_seconds, format: str):
@@ -39,3 +46,25 @@ def calculate_frequency(total_events: int, time_delta: timedelta, time_unit: str
         return total_events / months
     else:
         raise ValueError("Invalid time unit format")
+
+
+@lru_cache(maxsize=TIMESTAMP_MEMO_SIZE)
+def parse_timestamp(value: str) -> datetime:
+    """
+    Parses an ISO-8601 timestamp as returned by the APIs we query.
+
+    `datetime.fromisoformat` handles them natively once a trailing `Z` is
+    spelled `+00:00`; anything it rejects falls back to dateutil's generic
+    parser. Results are memoized, as incident and run timestamps repeat.
+    """
+    try:
+        if value[-1:] in ("Z", "z"):
+            return datetime.fromisoformat(value[:-1] + "+00:00")
+        return datetime.fromisoformat(value)
+    except ValueError:
+        return parse(value)
+
+
+def parse_timestamps(values: Iterable[str]) -> List[datetime]:
+    """Parses a column of timestamps with `parse_timestamp`."""
+    return list(map(parse_timestamp, values))
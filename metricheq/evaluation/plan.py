@@ -0,0 +1,202 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from queue import Empty, SimpleQueue
+import threading
+from typing import AsyncIterator, Dict, Generator, Iterable, List, Optional, Tuple
+
+from pydantic import BaseModel, ConfigDict
+
+from metricheq.core.connectors.base import Connector
+from metricheq.core.deducers.base import BatchDeducer, Deducer
+from metricheq.evaluation.metric import Metric
+
+DEFAULT_MAX_IN_FLIGHT = 8
+
+
+class MetricOutcome(BaseModel):
+    """
+    Result of one deducer of a plan.
+
+    Attributes:
+        deducer (Deducer): The deducer that ran.
+        metric (Optional[Metric]): The deduced metric.
+        metrics (Optional[dict]): Metrics of batch deducers, by service or
+            by project and metric key.
+        error (Optional[Exception]): The error raised instead of a metric.
+    """
+
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+
+    deducer: Deducer
+    metric: Optional[Metric] = None
+    metrics: Optional[dict] = None
+    error: Optional[Exception] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+def deduce_outcome(deducer: Deducer) -> MetricOutcome:
+    try:
+        if isinstance(deducer, BatchDeducer):
+            return MetricOutcome(deducer=deducer, metrics=deducer.metrics)
+        return MetricOutcome(deducer=deducer, metric=deducer.metric)
+    except Exception as error:
+        return MetricOutcome(deducer=deducer, error=error)
+
+
+class MetricPlan:
+    """
+    Deduces many metrics concurrently, bounded per connector.
+
+    Deducers are grouped by connector and each group is drained by at most
+    `max_in_flight` threads, so a slow or rate limited service never holds more
+    than its share of the pool and the plan takes about as long as its slowest
+    connector. A failing deducer is reported in its outcome without aborting
+    the others.
+
+    Attributes:
+        max_in_flight (int): Default number of concurrent deducers per connector.
+        connector_limits (Dict[Connector, int]): Per-connector overrides.
+    """
+
+    def __init__(
+        self,
+        deducers: Iterable[Deducer] = (),
+        max_in_flight: int = DEFAULT_MAX_IN_FLIGHT,
+        connector_limits: Optional[Dict[Connector, int]] = None,
+    ) -> None:
+        self.max_in_flight = max_in_flight
+        self.connector_limits = dict(connector_limits or {})
+        self.deducers: List[Deducer] = list(deducers)
+
+    def add(self, deducer: Deducer) -> "MetricPlan":
+        self.deducers.append(deducer)
+        return self
+
+    def limit_for(self, connector: Connector) -> int:
+        return max(self.connector_limits.get(connector, self.max_in_flight), 1)
+
+    def run(self) -> List[MetricOutcome]:
+        """Returns one outcome per deducer, in the order they were added."""
+        return list(self.iter_results(ordered=True))
+
+    def iter_results(
+        self, ordered: bool = False, max_pending: Optional[int] = None
+    ) -> Generator[MetricOutcome, None, None]:
+        """
+        Yields every outcome as soon as it is available.
+
+        Outcomes come in completion order, or in the order the deducers were
+        added when `ordered` is set. With `max_pending`, at most that many
+        deducers run or wait to be consumed at any time, so a slow consumer
+        pauses the plan instead of piling up results. Closing the iterator
+        early stops starting new deducers.
+        """
+        if max_pending is not None and max_pending < 1:
+            raise ValueError(f"Invalid max_pending: {max_pending}. Must be at least 1")
+        return self._iter_results(ordered, max_pending)
+
+    def _iter_results(
+        self, ordered: bool, max_pending: Optional[int]
+    ) -> Generator[MetricOutcome, None, None]:
+        lanes: Dict[Connector, "SimpleQueue[Tuple[int, Deducer]]"] = {}
+        for index, deducer in enumerate(self.deducers):
+            lanes.setdefault(deducer.connector, SimpleQueue()).put((index, deducer))
+        workers = [
+            lane
+            for connector, lane in lanes.items()
+            for _ in range(min(self.limit_for(connector), lane.qsize()))
+        ]
+        if not workers:
+            return
+
+        window = _PendingWindow(ordered, max_pending)
+        results: "SimpleQueue[Tuple[int, MetricOutcome]]" = SimpleQueue()
+        executor = ThreadPoolExecutor(max_workers=len(workers))
+        for lane in workers:
+            executor.submit(self._drain, lane, window, results)
+        try:
+            buffered: Dict[int, MetricOutcome] = {}
+            next_index = 0
+            for _ in range(len(self.deducers)):
+                index, outcome = results.get()
+                if not ordered:
+                    yield outcome
+                    window.release()
+                    continue
+                buffered[index] = outcome
+                while next_index in buffered:
+                    yield buffered.pop(next_index)
+                    next_index += 1
+                    window.release()
+        finally:
+            window.cancel()
+            executor.shutdown(wait=True)
+
+    async def aiter_results(
+        self, ordered: bool = False, max_pending: Optional[int] = None
+    ) -> AsyncIterator[MetricOutcome]:
+        """Asynchronous counterpart of `iter_results`, waiting off the event loop."""
+        results = self.iter_results(ordered=ordered, max_pending=max_pending)
+        try:
+            while True:
+                outcome = await asyncio.to_thread(next, results, None)
+                if outcome is None:
+                    return
+                yield outcome
+        finally:
+            await asyncio.to_thread(results.close)
+
+    @staticmethod
+    def _drain(lane: SimpleQueue, window: "_PendingWindow", results: SimpleQueue):
+        while True:
+            try:
+                index, deducer = lane.get_nowait()
+            except Empty:
+                return
+            if not window.acquire(index):
+                return
+            results.put((index, deduce_outcome(deducer)))
+
+
+class _PendingWindow:
+    """
+    Bounds how many outcomes are started but not yet consumed.
+
+    In ordered mode a deducer may only start once it is within `max_pending`
+    positions of the next outcome to yield, so the outcome the consumer waits
+    for can always be started.
+    """
+
+    def __init__(self, ordered: bool, max_pending: Optional[int]) -> None:
+        self.ordered = ordered
+        self.max_pending = max_pending
+        self._started = 0
+        self._released = 0
+        self._cancelled = False
+        self._condition = threading.Condition()
+
+    def _has_room(self, index: int) -> bool:
+        if self.max_pending is None:
+            return True
+        if self.ordered:
+            return index < self._released + self.max_pending
+        return self._started - self._released < self.max_pending
+
+    def acquire(self, index: int) -> bool:
+        with self._condition:
+            self._condition.wait_for(lambda: self._cancelled or self._has_room(index))
+            self._started += 1
+            return not self._cancelled
+
+    def release(self):
+        with self._condition:
+            self._released += 1
+            self._condition.notify_all()
+
+    def cancel(self):
+        with self._condition:
+            self._cancelled = True
+            self._condition.notify_all()
@@ -1,2 +1,17 @@
+from requests import RequestException
+
+
 class UnsupportedConfigurationError(Exception):
     pass
+
+
+class CircuitOpenError(RequestException):
+    pass
+
+
+class StoreSchemaError(Exception):
+    pass
+
+
+class PaginationLimitError(Exception):
+    pass
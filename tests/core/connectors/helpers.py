@@ -0,0 +1,24 @@
+import requests
+
+
+class FakeClock:
+    """Clock moved forward by hand, or by `sleep`, which records every pause."""
+
+    def __init__(self, now=0.0):
+        self.now = now
+        self.sleeps = []
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+def build_response(status_code=200, content=b"{}", headers=None):
+    response = requests.Response()
+    response.status_code = status_code
+    response._content = content
+    response.headers.update(headers or {})
+    return response
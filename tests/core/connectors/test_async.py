@@ -0,0 +1,150 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+import json
+import time
+import unittest
+from unittest.mock import Mock
+
+from metricheq.core.connectors.codecov import CodecovConfig, CodecovConnector
+from metricheq.core.connectors.git_providers.github import (
+    GitHubConfig,
+    GitHubConnector,
+)
+from metricheq.core.connectors.pagerduty import PagerDutyConfig, PagerDutyConnector
+from metricheq.core.connectors.prometheus import PrometheusConfig, PrometheusConnector
+from metricheq.core.connectors.sonar import SonarConnector, SonarTokenConfig
+from metricheq.core.deducers.prometheus import PrometheusServiceAvailabilityDeducer
+from metricheq.core.deducers.sonar import SonarMeasureDeducer
+
+
+class StandInServer:
+    """Minimal asyncio HTTP server answering every request with a JSON body."""
+
+    def __init__(self, payload, delay=0.0):
+        self.payload = payload
+        self.delay = delay
+        self.paths = []
+
+    async def __aenter__(self):
+        self.server = await asyncio.start_server(self.handle, "127.0.0.1", 0)
+        port = self.server.sockets[0].getsockname()[1]
+        self.url = f"http://127.0.0.1:{port}"
+        return self
+
+    async def __aexit__(self, *exc_info):
+        self.server.close()
+        await self.server.wait_closed()
+
+    async def handle(self, reader, writer):
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                while (await reader.readline()) not in (b"\r\n", b""):
+                    pass
+                self.paths.append(request_line.split()[1].decode())
+                await asyncio.sleep(self.delay)
+                body = json.dumps(self.payload).encode()
+                writer.write(
+                    b"HTTP/1.1 200 OK\r\nContent-Type: application/json\r\n"
+                    + f"Content-Length: {len(body)}\r\n\r\n".encode()
+                    + body
+                )
+                await writer.drain()
+        finally:
+            writer.close()
+
+
+class TestAsyncExecution(unittest.IsolatedAsyncioTestCase):
+    async def test_make_request_async_for_every_connector(self):
+        async with StandInServer({"health": "GREEN"}) as server:
+            connectors = [
+                GitHubConnector.from_config(
+                    GitHubConfig(api_key="key", base_url=server.url)
+                ),
+                PagerDutyConnector.from_config(
+                    PagerDutyConfig(api_key="key", base_url=server.url)
+                ),
+                SonarConnector.from_config(
+                    SonarTokenConfig(host_url=server.url, user_token="token")
+                ),
+                PrometheusConnector.from_config(PrometheusConfig(host_url=server.url)),
+                CodecovConnector.from_config(
+                    CodecovConfig(api_token="token", base_url=server.url)
+                ),
+            ]
+            responses = await asyncio.gather(
+                *(c.client.make_request_async("/ping") for c in connectors)
+            )
+            for connector in connectors:
+                await connector.ensure_connectivity_async()
+                connector.close()
+
+        self.assertTrue(all(r.status_code == 200 for r in responses))
+
+    async def test_deducers_run_concurrently(self):
+        payload = {"component": {"measures": [{"metric": "bugs", "value": "3"}]}}
+        async with StandInServer(payload, delay=0.2) as server:
+            config = SonarTokenConfig(
+                host_url=server.url, user_token="token", pool_maxsize=20
+            )
+            with SonarConnector.from_config(config) as connector:
+                connector.ensure_connectivity = lambda: True
+                deducers = [
+                    SonarMeasureDeducer(
+                        connector, {"component": f"project_{i}", "metric_key": "bugs"}
+                    )
+                    for i in range(10)
+                ]
+
+                start = time.perf_counter()
+                metrics = await asyncio.gather(*(d.metric_async() for d in deducers))
+                elapsed = time.perf_counter() - start
+
+        self.assertEqual([m.value for m in metrics], [3] * 10)
+        self.assertLess(elapsed, 10 * 0.2 / 2)
+
+    async def test_deduce_async_prometheus(self):
+        payload = {"data": {"result": [{"values": [[0, "1"], [60, "0"]]}]}}
+        async with StandInServer(payload) as server:
+            with PrometheusConnector.from_config(
+                PrometheusConfig(host_url=server.url)
+            ) as connector:
+                deducer = PrometheusServiceAvailabilityDeducer(
+                    connector,
+                    {
+                        "labels": {"job": "api"},
+                        "start_time": datetime.now() - timedelta(hours=1),
+                        "end_time": datetime.now(),
+                    },
+                )
+                result = await deducer.deduce_async()
+
+        self.assertEqual(result, 50.0)
+        self.assertTrue(server.paths[-1].startswith("/api/v1/query_range"))
+
+    async def test_async_executor_runs_the_blocking_calls(self):
+        payload = {"component": {"measures": [{"metric": "bugs", "value": "3"}]}}
+        with ThreadPoolExecutor(max_workers=40) as executor:
+            submit = Mock(wraps=executor.submit)
+            executor.submit = submit
+            async with StandInServer(payload, delay=0.2) as server:
+                config = SonarTokenConfig(
+                    host_url=server.url,
+                    user_token="token",
+                    pool_maxsize=40,
+                    async_executor=executor,
+                )
+                with SonarConnector.from_config(config) as connector:
+                    connector.ensure_connectivity = lambda: True
+                    responses = await asyncio.gather(
+                        *(connector.client.make_request_async("/") for _ in range(40))
+                    )
+                    await SonarMeasureDeducer(
+                        connector, {"component": "web", "metric_key": "bugs"}
+                    ).deduce_async()
+
+        self.assertTrue(all(r.status_code == 200 for r in responses))
+        self.assertEqual(submit.call_count, 40 + 3)
@@ -0,0 +1,147 @@
+import os
+import tempfile
+import time
+import unittest
+from unittest.mock import patch
+
+import requests
+
+from metricheq.core.connectors.cache import (
+    CachedResponse,
+    DiskResponseCache,
+    InMemoryResponseCache,
+)
+from metricheq.core.connectors.git_providers.github import GitHubClient, GitHubConfig
+
+
+def build_response(status_code, content=b"", headers=None):
+    response = requests.Response()
+    response.status_code = status_code
+    response._content = content
+    response.headers.update(headers or {})
+    response.url = "https://api.github.com/repos/test"
+    return response
+
+
+def build_entry(content=b"{}"):
+    return CachedResponse(
+        url="https://api.github.com/repos/test",
+        status_code=200,
+        headers={"ETag": '"v1"'},
+        content=content,
+        etag='"v1"',
+    )
+
+
+class TestInMemoryResponseCache(unittest.TestCase):
+    def test_evicts_least_recently_used_entry(self):
+        cache = InMemoryResponseCache(max_entries=2)
+        cache.set("a", build_entry())
+        cache.set("b", build_entry())
+        cache.get("a")
+        cache.set("c", build_entry())
+
+        self.assertIsNotNone(cache.get("a"))
+        self.assertIsNone(cache.get("b"))
+        self.assertIsNotNone(cache.get("c"))
+
+    def test_evicts_by_total_size(self):
+        cache = InMemoryResponseCache(max_bytes=10)
+        cache.set("a", build_entry(b"123456"))
+        cache.set("b", build_entry(b"123456"))
+
+        self.assertIsNone(cache.get("a"))
+        self.assertIsNotNone(cache.get("b"))
+
+    def test_skips_entries_larger_than_budget(self):
+        cache = InMemoryResponseCache(max_bytes=4)
+        cache.set("a", build_entry(b"123456"))
+
+        self.assertEqual(len(cache), 0)
+
+
+class TestDiskResponseCache(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+
+    def test_round_trip(self):
+        cache = DiskResponseCache(self.directory.name)
+        cache.set("a", build_entry(b"\x00binary"))
+
+        entry = DiskResponseCache(self.directory.name).get("a")
+
+        self.assertEqual(entry.content, b"\x00binary")
+        self.assertEqual(entry.etag, '"v1"')
+
+    def test_evicts_least_recently_used_entry(self):
+        cache = DiskResponseCache(self.directory.name, max_entries=2)
+        cache.set("a", build_entry())
+        cache.set("b", build_entry())
+        past = time.time() - 60
+        os.utime(os.path.join(self.directory.name, "b.json"), (past, past))
+        cache.set("c", build_entry())
+
+        self.assertIsNotNone(cache.get("a"))
+        self.assertIsNone(cache.get("b"))
+
+    def test_clear(self):
+        cache = DiskResponseCache(self.directory.name)
+        cache.set("a", build_entry())
+        cache.clear()
+
+        self.assertIsNone(cache.get("a"))
+
+
+class TestClientConditionalRequests(unittest.TestCase):
+    def setUp(self):
+        self.cache = InMemoryResponseCache()
+        self.client = GitHubClient(
+            GitHubConfig(api_key="key", response_cache=self.cache)
+        )
+
+    @patch("requests.Session.send")
+    def test_not_modified_serves_cached_body(self, mock_send):
+        mock_send.side_effect = [
+            build_response(200, b'{"sha": "abc"}', {"ETag": '"v1"'}),
+            build_response(304),
+        ]
+
+        self.client.make_request("/repos/test")
+        response = self.client.make_request("/repos/test")
+
+        revalidation = mock_send.call_args_list[1][0][0]
+        self.assertEqual(revalidation.headers["If-None-Match"], '"v1"')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json(), {"sha": "abc"})
+
+    @patch("requests.Session.send")
+    def test_last_modified_validator(self, mock_send):
+        last_modified = "Wed, 21 Oct 2015 07:28:00 GMT"
+        mock_send.side_effect = [
+            build_response(200, b"{}", {"Last-Modified": last_modified}),
+            build_response(200, b"{}"),
+        ]
+
+        self.client.make_request("/repos/test")
+        self.client.make_request("/repos/test")
+
+        revalidation = mock_send.call_args_list[1][0][0]
+        self.assertEqual(revalidation.headers["If-Modified-Since"], last_modified)
+        self.assertNotIn("If-None-Match", revalidation.headers)
+
+    @patch("requests.Session.send")
+    def test_responses_without_validators_are_not_cached(self, mock_send):
+        mock_send.return_value = build_response(200, b"{}")
+
+        self.client.make_request("/repos/test")
+
+        self.assertEqual(len(self.cache), 0)
+
+    @patch("requests.Session.send")
+    def test_non_get_requests_bypass_cache(self, mock_send):
+        mock_send.return_value = build_response(200, b"{}", {"ETag": '"v1"'})
+
+        self.client.make_request("/repos/test", method="POST")
+
+        self.assertEqual(len(self.cache), 0)
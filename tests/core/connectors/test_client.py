@@ -0,0 +1,55 @@
+import unittest
+from unittest.mock import Mock, patch
+
+from metricheq.core.connectors.git_providers.github import GitHubClient, GitHubConfig
+
+
+class TestClientSession(unittest.TestCase):
+    def setUp(self):
+        self.config = GitHubConfig(api_key="test_api_key")
+
+    @patch("requests.Session.send")
+    def test_session_is_reused_across_requests(self, mock_send):
+        mock_send.return_value = Mock(status_code=200)
+        client = GitHubClient(self.config)
+
+        session = client.session
+        client.make_request("/a")
+        client.make_request("/b")
+
+        self.assertIs(client.session, session)
+        self.assertEqual(mock_send.call_count, 2)
+
+    def test_pool_settings_are_applied(self):
+        config = GitHubConfig(api_key="key", pool_connections=3, pool_maxsize=7)
+        client = GitHubClient(config)
+
+        adapter = client.session.get_adapter("https://api.github.com")
+        self.assertEqual(adapter._pool_connections, 3)
+        self.assertEqual(adapter._pool_maxsize, 7)
+
+    @patch("requests.Session.send")
+    def test_keep_alive_disabled(self, mock_send):
+        mock_send.return_value = Mock(status_code=200)
+        config = GitHubConfig(api_key="key", keep_alive=False)
+        client = GitHubClient(config)
+
+        client.make_request("/a")
+
+        prepared_request = mock_send.call_args[0][0]
+        self.assertEqual(prepared_request.headers["Connection"], "close")
+
+    def test_close_releases_session(self):
+        client = GitHubClient(self.config)
+        session = client.session
+
+        client.close()
+
+        self.assertIsNot(client.session, session)
+
+    def test_context_manager_closes_session(self):
+        with GitHubClient(self.config) as client:
+            session = client.session
+
+        self.assertIsNone(client._session)
+        self.assertIsNot(client.session, session)
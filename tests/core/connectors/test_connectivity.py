@@ -0,0 +1,74 @@
+import unittest
+from unittest.mock import Mock, patch
+
+import requests
+
+from metricheq.core.connectors.git_providers.github import (
+    GitHubClient,
+    GitHubConfig,
+    GitHubConnector,
+)
+
+
+class TestConnectivityCache(unittest.TestCase):
+    def setUp(self):
+        self.client = GitHubClient(GitHubConfig(api_key="key", connectivity_ttl=30))
+        self.connector = GitHubConnector(self.client)
+        self.connector.ensure_connectivity = Mock(return_value=True)
+
+    def test_ttl_is_read_from_client_config(self):
+        self.assertEqual(self.connector.connectivity_ttl, 30)
+
+    def test_ttl_can_be_overridden(self):
+        connector = GitHubConnector(self.client, connectivity_ttl=5)
+        self.assertEqual(connector.connectivity_ttl, 5)
+
+    def test_successful_check_is_reused(self):
+        self.connector.check_connectivity()
+        self.connector.check_connectivity()
+
+        self.connector.ensure_connectivity.assert_called_once()
+
+    @patch("metricheq.core.connectors.base.time.monotonic")
+    def test_check_expires_after_ttl(self, mock_monotonic):
+        mock_monotonic.return_value = 100.0
+        self.connector.check_connectivity()
+        mock_monotonic.return_value = 131.0
+        self.connector.check_connectivity()
+
+        self.assertEqual(self.connector.ensure_connectivity.call_count, 2)
+
+    def test_zero_ttl_disables_cache(self):
+        self.connector.connectivity_ttl = 0
+        self.connector.check_connectivity()
+        self.connector.check_connectivity()
+
+        self.assertEqual(self.connector.ensure_connectivity.call_count, 2)
+
+    def test_failed_check_is_not_cached(self):
+        self.connector.ensure_connectivity.side_effect = [ConnectionError, True]
+
+        with self.assertRaises(ConnectionError):
+            self.connector.check_connectivity()
+        self.connector.check_connectivity()
+
+        self.assertEqual(self.connector.ensure_connectivity.call_count, 2)
+
+    @patch("metricheq.core.connectors.base.time.sleep")
+    @patch("requests.Session.send")
+    def test_transport_error_invalidates_check(self, mock_send, mock_sleep):
+        self.connector.check_connectivity()
+        mock_send.side_effect = requests.ConnectionError
+
+        with self.assertRaises(requests.ConnectionError):
+            self.client.make_request("/repos")
+        self.connector.check_connectivity()
+
+        self.assertEqual(self.connector.ensure_connectivity.call_count, 2)
+
+    def test_explicit_invalidation(self):
+        self.connector.check_connectivity()
+        self.connector.invalidate_connectivity()
+        self.connector.check_connectivity()
+
+        self.assertEqual(self.connector.ensure_connectivity.call_count, 2)
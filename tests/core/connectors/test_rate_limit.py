@@ -0,0 +1,130 @@
+import time
+import unittest
+from unittest.mock import patch
+
+from metricheq.core.connectors.git_providers.github import GitHubClient, GitHubConfig
+from metricheq.core.connectors.pagerduty import PagerDutyClient, PagerDutyConfig
+from metricheq.core.connectors.rate_limit import RateLimiter
+from tests.core.connectors.helpers import FakeClock, build_response
+
+
+class TestRateLimiter(unittest.TestCase):
+    def setUp(self):
+        self.clock = FakeClock(1000.0)
+
+    def build_limiter(self, **kwargs):
+        return RateLimiter(clock=self.clock, sleep=self.clock.sleep, **kwargs)
+
+    def test_unlimited_by_default(self):
+        limiter = self.build_limiter()
+        for _ in range(100):
+            limiter.acquire()
+
+        self.assertEqual(self.clock.sleeps, [])
+
+    def test_static_quota_is_spread_evenly(self):
+        limiter = self.build_limiter(rate=60, per=60)
+        for _ in range(4):
+            limiter.acquire()
+
+        self.assertEqual(self.clock.sleeps, [1.0, 1.0, 1.0])
+
+    def test_burst_allows_back_to_back_requests(self):
+        limiter = self.build_limiter(rate=60, per=60, burst=3)
+        for _ in range(3):
+            limiter.acquire()
+
+        self.assertEqual(self.clock.sleeps, [])
+
+    def test_headers_pace_remaining_budget_until_reset(self):
+        limiter = self.build_limiter()
+        reset = time.time() + 100
+        limiter.update(
+            build_response(
+                headers={
+                    "X-RateLimit-Remaining": "50",
+                    "X-RateLimit-Reset": str(reset),
+                }
+            )
+        )
+        limiter.acquire()
+        limiter.acquire()
+
+        self.assertEqual(len(self.clock.sleeps), 1)
+        self.assertAlmostEqual(self.clock.sleeps[0], 2.0, delta=0.1)
+
+    def test_exhausted_budget_blocks_until_reset(self):
+        limiter = self.build_limiter()
+        reset = time.time() + 30
+        limiter.update(
+            build_response(
+                headers={"X-RateLimit-Remaining": "0", "X-RateLimit-Reset": str(reset)}
+            )
+        )
+        limiter.acquire()
+
+        self.assertAlmostEqual(sum(self.clock.sleeps), 30, delta=0.5)
+
+    def test_retry_after_blocks_callers(self):
+        limiter = self.build_limiter()
+        limiter.update(build_response(429, headers={"Retry-After": "5"}))
+        limiter.acquire()
+
+        self.assertEqual(self.clock.sleeps, [5.0])
+
+    def test_is_throttled(self):
+        self.assertTrue(RateLimiter.is_throttled(build_response(429)))
+        self.assertTrue(
+            RateLimiter.is_throttled(
+                build_response(403, headers={"X-RateLimit-Remaining": "0"})
+            )
+        )
+        self.assertFalse(RateLimiter.is_throttled(build_response(403)))
+        self.assertFalse(RateLimiter.is_throttled(build_response(200)))
+
+
+class TestClientRateLimiting(unittest.TestCase):
+    def test_pagerduty_has_static_quota(self):
+        client = PagerDutyClient(PagerDutyConfig(api_key="key"))
+        self.assertEqual(client.rate_limiter.rate, 960)
+
+    def test_github_is_header_driven(self):
+        client = GitHubClient(GitHubConfig(api_key="key"))
+        self.assertIsNone(client.rate_limiter.rate)
+
+    @patch("requests.Session.send")
+    def test_throttled_request_is_queued_and_resent(self, mock_send):
+        mock_send.side_effect = [
+            build_response(429, headers={"Retry-After": "0"}),
+            build_response(200),
+        ]
+        client = GitHubClient(GitHubConfig(api_key="key"))
+
+        response = client.make_request("/repos/test")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(mock_send.call_count, 2)
+
+    @patch("requests.Session.send")
+    def test_throttled_request_without_pause_backs_off(self, mock_send):
+        mock_send.side_effect = [build_response(429)] * 2 + [build_response(200)]
+        client = GitHubClient(GitHubConfig(api_key="key"))
+        clock = FakeClock(1000.0)
+        client.rate_limiter = RateLimiter(clock=clock, sleep=clock.sleep)
+
+        with patch("random.uniform", side_effect=lambda low, high: high):
+            response = client.make_request("/repos/test")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(clock.sleeps, [0.5, 1.0])
+
+    @patch("requests.Session.send")
+    def test_throttled_response_returned_after_max_retries(self, mock_send):
+        mock_send.return_value = build_response(429, headers={"Retry-After": "0"})
+        client = GitHubClient(GitHubConfig(api_key="key"))
+        client.rate_limiter.max_throttle_retries = 2
+
+        response = client.make_request("/repos/test")
+
+        self.assertEqual(response.status_code, 429)
+        self.assertEqual(mock_send.call_count, 3)
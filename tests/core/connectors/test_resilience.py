@@ -0,0 +1,123 @@
+import unittest
+from unittest.mock import patch
+
+import requests
+
+from metricheq.core.connectors.resilience import CircuitBreaker, RetryPolicy
+from metricheq.core.connectors.sonar import SonarClient, SonarTokenConfig
+from metricheq.exceptions.core.exceptions import CircuitOpenError
+from tests.core.connectors.helpers import FakeClock, build_response
+
+
+class TestRetryPolicy(unittest.TestCase):
+    def test_backoff_is_bounded(self):
+        policy = RetryPolicy(backoff_factor=1, max_backoff=5)
+        for attempt in range(10):
+            self.assertLessEqual(policy.backoff(attempt), min(5, 2**attempt))
+
+    def test_only_idempotent_methods_are_retried(self):
+        policy = RetryPolicy(max_retries=1)
+        self.assertTrue(policy.allows_retry("GET", 0))
+        self.assertFalse(policy.allows_retry("GET", 1))
+        self.assertFalse(policy.allows_retry("POST", 0))
+
+
+class TestCircuitBreaker(unittest.TestCase):
+    def setUp(self):
+        self.clock = FakeClock()
+        self.breaker = CircuitBreaker(
+            failure_threshold=2, reset_timeout=10, clock=self.clock
+        )
+
+    def test_opens_after_consecutive_failures(self):
+        self.breaker.record_failure()
+        self.breaker.before_request()
+        self.breaker.record_failure()
+
+        self.assertEqual(self.breaker.state, CircuitBreaker.OPEN)
+        with self.assertRaises(CircuitOpenError):
+            self.breaker.before_request()
+
+    def test_success_resets_failure_count(self):
+        self.breaker.record_failure()
+        self.breaker.record_success()
+        self.breaker.record_failure()
+
+        self.assertEqual(self.breaker.state, CircuitBreaker.CLOSED)
+
+    def test_half_open_lets_a_single_probe_through(self):
+        self.breaker.record_failure()
+        self.breaker.record_failure()
+        self.clock.now = 10
+
+        self.breaker.before_request()
+        with self.assertRaises(CircuitOpenError):
+            self.breaker.before_request()
+
+        self.breaker.record_success()
+        self.assertEqual(self.breaker.state, CircuitBreaker.CLOSED)
+
+    def test_failed_probe_reopens_circuit(self):
+        self.breaker.record_failure()
+        self.breaker.record_failure()
+        self.clock.now = 10
+
+        self.breaker.before_request()
+        self.breaker.record_failure()
+
+        self.assertEqual(self.breaker.state, CircuitBreaker.OPEN)
+
+
+@patch("metricheq.core.connectors.base.time.sleep")
+@patch("requests.Session.send")
+class TestClientResilience(unittest.TestCase):
+    def build_client(self, **kwargs):
+        config = SonarTokenConfig(
+            host_url="http://sonar.local", user_token="token", **kwargs
+        )
+        return SonarClient(config)
+
+    def test_transient_status_is_retried(self, mock_send, mock_sleep):
+        mock_send.side_effect = [build_response(502), build_response(200)]
+
+        response = self.build_client().make_request("/api/measures/component")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(mock_sleep.call_count, 1)
+
+    def test_transport_error_is_retried(self, mock_send, mock_sleep):
+        mock_send.side_effect = [requests.ConnectionError, build_response(200)]
+
+        response = self.build_client().make_request("/api/measures/component")
+
+        self.assertEqual(response.status_code, 200)
+
+    def test_last_response_returned_when_retries_exhausted(self, mock_send, mock_sleep):
+        mock_send.return_value = build_response(503)
+        client = self.build_client(retry_policy=RetryPolicy(max_retries=2))
+
+        response = client.make_request("/api/measures/component")
+
+        self.assertEqual(response.status_code, 503)
+        self.assertEqual(mock_send.call_count, 3)
+
+    def test_post_is_not_retried(self, mock_send, mock_sleep):
+        mock_send.return_value = build_response(502)
+
+        self.build_client().make_request("/api/measures/component", method="POST")
+
+        self.assertEqual(mock_send.call_count, 1)
+
+    def test_open_circuit_fails_fast(self, mock_send, mock_sleep):
+        mock_send.side_effect = requests.ConnectionError
+        client = self.build_client(
+            retry_policy=RetryPolicy(max_retries=0), circuit_failure_threshold=2
+        )
+
+        for _ in range(2):
+            with self.assertRaises(requests.ConnectionError):
+                client.make_request("/api/measures/component")
+        with self.assertRaises(CircuitOpenError):
+            client.make_request("/api/measures/component")
+
+        self.assertEqual(mock_send.call_count, 2)
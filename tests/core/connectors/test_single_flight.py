@@ -0,0 +1,105 @@
+from concurrent.futures import ThreadPoolExecutor
+import threading
+import unittest
+from unittest.mock import patch
+
+import requests
+
+from metricheq.core.connectors.git_providers.github import GitHubClient, GitHubConfig
+from metricheq.core.connectors.single_flight import SingleFlight
+from tests.core.connectors.helpers import FakeClock, build_response
+
+
+class TestSingleFlight(unittest.TestCase):
+    def test_concurrent_callers_share_one_call(self):
+        flight = SingleFlight()
+        started = threading.Event()
+        release = threading.Event()
+        calls = []
+
+        def send():
+            calls.append(1)
+            started.set()
+            release.wait(5)
+            return build_response()
+
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            futures = [executor.submit(flight.call, "k", send) for _ in range(4)]
+            started.wait(5)
+            release.set()
+            responses = [future.result() for future in futures]
+
+        self.assertEqual(len(calls), 1)
+        self.assertTrue(all(response is responses[0] for response in responses))
+
+    def test_errors_reach_every_waiting_caller(self):
+        flight = SingleFlight()
+        started = threading.Event()
+        release = threading.Event()
+
+        def send():
+            started.set()
+            release.wait(5)
+            raise requests.ConnectionError("down")
+
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            leader = executor.submit(flight.call, "k", send)
+            started.wait(5)
+            follower = executor.submit(flight.call, "k", send)
+            release.set()
+            for future in (leader, follower):
+                with self.assertRaises(requests.ConnectionError):
+                    future.result()
+
+    def test_sequential_calls_are_not_shared_without_window(self):
+        flight = SingleFlight()
+
+        first = flight.call("k", build_response)
+        second = flight.call("k", build_response)
+
+        self.assertIsNot(first, second)
+
+    def test_dedup_window_reuses_successful_responses(self):
+        clock = FakeClock()
+        flight = SingleFlight(dedup_window=5, clock=clock)
+
+        first = flight.call("k", build_response)
+        self.assertIs(flight.call("k", build_response), first)
+
+        clock.now = 5
+        self.assertIsNot(flight.call("k", build_response), first)
+
+    def test_failed_responses_are_not_reused(self):
+        flight = SingleFlight(dedup_window=5, clock=FakeClock())
+
+        first = flight.call("k", lambda: build_response(503))
+
+        self.assertIsNot(flight.call("k", lambda: build_response(503)), first)
+
+    def test_payload_is_parsed_once(self):
+        response = SingleFlight().call("k", build_response)
+
+        self.assertIs(response.json(), response.json())
+
+
+class TestClientSingleFlight(unittest.TestCase):
+    @patch("requests.Session.send")
+    def test_normalized_requests_share_the_window(self, mock_send):
+        mock_send.side_effect = lambda *args, **kwargs: build_response()
+        client = GitHubClient(GitHubConfig(api_key="key", dedup_window=60))
+
+        client.make_request("/search", params={"a": 1, "b": 2})
+        client.make_request("/search", params={"b": 2, "a": 1})
+        client.make_request("/search", params={"a": 2, "b": 2})
+
+        self.assertEqual(mock_send.call_count, 2)
+
+    @patch("requests.Session.send")
+    def test_other_methods_are_never_shared(self, mock_send):
+        mock_send.side_effect = lambda *args, **kwargs: build_response()
+        client = GitHubClient(GitHubConfig(api_key="key", dedup_window=60))
+
+        client.make_request("/graphql", method="POST")
+        client.make_request("/graphql", method="POST")
+
+        self.assertEqual(mock_send.call_count, 2)
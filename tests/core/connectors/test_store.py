@@ -0,0 +1,148 @@
+from datetime import datetime, timedelta, timezone
+from multiprocessing import get_context
+import os
+import sqlite3
+import tempfile
+import unittest
+
+from metricheq.core.connectors.store import SCHEMA_VERSION, HistoricalStore
+from metricheq.exceptions.core.exceptions import StoreSchemaError
+
+BASE = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+
+def at(hours):
+    return BASE + timedelta(hours=hours)
+
+
+def write_records(path, worker):
+    store = HistoricalStore(path)
+    store.put_many(
+        "run", "repo", [(f"{worker}-{i}", at(i), {"id": i}) for i in range(50)]
+    )
+
+
+class TestHistoricalStore(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+        self.path = os.path.join(self.directory.name, "history.sqlite")
+        self.store = HistoricalStore(self.path)
+
+    def test_runs_in_wal_mode_at_current_schema(self):
+        connection = sqlite3.connect(self.path)
+        self.addCleanup(connection.close)
+        mode = connection.execute("PRAGMA journal_mode").fetchone()[0]
+
+        self.assertEqual(mode, "wal")
+        self.assertEqual(self.store.schema_version, SCHEMA_VERSION)
+
+    def test_refuses_newer_schema(self):
+        connection = sqlite3.connect(self.path)
+        connection.execute(f"PRAGMA user_version = {SCHEMA_VERSION + 1}")
+        connection.close()
+
+        with self.assertRaises(StoreSchemaError):
+            HistoricalStore(self.path)
+
+    def test_queries_by_time_range(self):
+        self.store.put_many(
+            "incident", "A", [(str(i), at(i), {"id": i}) for i in range(5)]
+        )
+        self.store.put_many("incident", "B", [("9", at(2), {"id": 9})])
+
+        records = self.store.query("incident", "A", since=at(1), until=at(4))
+
+        self.assertEqual(records, [{"id": 1}, {"id": 2}, {"id": 3}])
+
+    def test_replaces_known_keys(self):
+        self.store.put_many("incident", "A", [("1", at(0), {"v": 1})])
+        self.store.put_many("incident", "A", [("1", at(0), {"v": 2})])
+
+        self.assertEqual(self.store.query("incident", "A"), [{"v": 2}])
+
+    def test_merges_adjacent_coverage(self):
+        self.store.extend_coverage("incident", "A", at(0), at(2))
+        self.store.extend_coverage("incident", "A", at(2), at(5))
+
+        self.assertEqual(self.store.coverage("incident", "A"), (at(0), at(5)))
+
+    def test_disjoint_coverage_replaces_the_previous_one(self):
+        self.store.extend_coverage("incident", "A", at(0), at(2))
+        self.store.extend_coverage("incident", "A", at(3), at(5))
+
+        self.assertEqual(self.store.coverage("incident", "A"), (at(3), at(5)))
+
+    def test_forget_before_only_touches_its_scope(self):
+        for scope in ("A", "B"):
+            self.store.put_many(
+                "incident",
+                scope,
+                [(str(i), at(i), {"id": i}) for i in range(4)],
+                coverage=(at(0), at(4)),
+            )
+
+        self.store.forget_before("incident", "A", at(2))
+
+        self.assertEqual(self.store.query("incident", "A"), [{"id": 2}, {"id": 3}])
+        self.assertEqual(self.store.coverage("incident", "A"), (at(2), at(4)))
+        self.assertEqual(len(self.store.query("incident", "B")), 4)
+        self.assertEqual(self.store.coverage("incident", "B"), (at(0), at(4)))
+
+    def test_age_eviction_shrinks_coverage(self):
+        now = datetime.now(timezone.utc)
+        store = HistoricalStore(self.path, max_age=3600)
+        store.extend_coverage("incident", "A", now - timedelta(hours=3), now)
+        store.put_many(
+            "incident",
+            "A",
+            [
+                ("old", now - timedelta(hours=2), {"id": "old"}),
+                ("new", now - timedelta(minutes=10), {"id": "new"}),
+            ],
+        )
+
+        self.assertEqual(store.query("incident", "A"), [{"id": "new"}])
+        start, _ = store.coverage("incident", "A")
+        self.assertGreater(start, now - timedelta(hours=1, minutes=1))
+
+    def test_coverage_recorded_with_records_is_clamped_by_eviction(self):
+        now = datetime.now(timezone.utc)
+        store = HistoricalStore(self.path, max_age=30 * 86400)
+        records = [
+            (str(day), now - timedelta(days=day), {"day": day}) for day in range(90)
+        ]
+        store.put_many(
+            "incident", "A", records, coverage=(now - timedelta(days=90), now)
+        )
+
+        start, _ = store.coverage("incident", "A")
+        self.assertGreater(start, now - timedelta(days=30, minutes=1))
+        self.assertEqual(len(store.query("incident", "A", since=start)), 30)
+
+    def test_size_eviction_drops_oldest_records(self):
+        store = HistoricalStore(self.path, max_bytes=200)
+        store.extend_coverage("incident", "A", at(0), at(20))
+        store.put_many(
+            "incident", "A", [(str(i), at(i), {"pad": "x" * 20}) for i in range(20)]
+        )
+
+        self.assertLessEqual(store.size(), 200)
+        remaining = len(store.query("incident", "A"))
+        self.assertGreater(remaining, 0)
+        start, _ = store.coverage("incident", "A")
+        self.assertEqual(start, at(20 - remaining))
+
+    def test_concurrent_writers(self):
+        context = get_context("spawn")
+        processes = [
+            context.Process(target=write_records, args=(self.path, worker))
+            for worker in range(3)
+        ]
+        for process in processes:
+            process.start()
+        for process in processes:
+            process.join(30)
+            self.assertEqual(process.exitcode, 0)
+
+        self.assertEqual(len(self.store.query("run", "repo")), 150)
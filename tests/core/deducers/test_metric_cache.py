@@ -0,0 +1,117 @@
+import asyncio
+import unittest
+from unittest.mock import Mock
+
+from pydantic import BaseModel
+
+from metricheq.core.connectors.base import Connector
+from metricheq.core.deducers.base import Deducer
+from metricheq.core.deducers.cache import MetricCache
+
+
+class CountingParams(BaseModel):
+    name: str
+    threshold: int = 1
+
+
+class CountingDeducer(Deducer):
+    def __init__(self, connector, params):
+        self.params_model = CountingParams(**params)
+        super().__init__(connector, params)
+        self.calls = 0
+
+    def retrieve_data(self):
+        self.calls += 1
+        return self.calls
+
+    def process_data(self, data):
+        return data
+
+    def finalize(self, processed_data):
+        return processed_data
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestMetricCache(unittest.TestCase):
+    def setUp(self):
+        self.connector = Mock(spec=Connector, client=Mock())
+        self.clock = FakeClock()
+        self.cache = MetricCache(ttl=60, max_entries=2, clock=self.clock)
+
+    def deducer(self, **params):
+        deducer = CountingDeducer(self.connector, {"name": "a", **params})
+        deducer.metric_cache = self.cache
+        return deducer
+
+    def test_without_cache_every_access_deduces(self):
+        deducer = CountingDeducer(self.connector, {"name": "a"})
+
+        self.assertEqual(deducer.metric.value, 1)
+        self.assertEqual(deducer.metric.value, 2)
+
+    def test_repeated_access_is_served_from_cache(self):
+        deducer = self.deducer()
+
+        self.assertEqual(deducer.metric.value, 1)
+        self.assertEqual(deducer.metric.value, 1)
+        self.assertEqual(deducer.calls, 1)
+
+    def test_duplicate_definitions_share_an_entry(self):
+        first = self.deducer()
+        second = self.deducer(threshold="1")
+
+        first.metric
+        self.assertEqual(second.metric.value, 1)
+        self.assertEqual(second.calls, 0)
+
+    def test_other_connector_is_another_entry(self):
+        self.deducer().metric
+        other = CountingDeducer(Mock(spec=Connector, client=Mock()), {"name": "a"})
+        other.metric_cache = self.cache
+
+        other.metric
+        self.assertEqual(other.calls, 1)
+
+    def test_entries_expire(self):
+        deducer = self.deducer()
+        deducer.metric
+        self.clock.now = 60
+
+        self.assertEqual(deducer.metric.value, 2)
+
+    def test_refresh_and_invalidate(self):
+        deducer = self.deducer()
+        deducer.metric
+
+        self.assertEqual(deducer.refresh().value, 2)
+        self.assertEqual(deducer.metric.value, 2)
+        deducer.invalidate()
+        self.assertEqual(deducer.metric.value, 3)
+
+    def test_least_recently_used_entry_is_evicted(self):
+        a, b, c = self.deducer(name="a"), self.deducer(name="b"), self.deducer(name="c")
+        a.metric
+        b.metric
+        a.metric
+        c.metric
+
+        self.assertEqual(len(self.cache), 2)
+        a.metric
+        b.metric
+        self.assertEqual((a.calls, b.calls), (1, 2))
+
+    def test_metric_async_uses_the_cache(self):
+        deducer = self.deducer()
+        deducer.metric
+
+        metric = asyncio.run(deducer.metric_async())
+
+        self.assertEqual(metric.value, 1)
+        self.assertEqual(deducer.calls, 1)
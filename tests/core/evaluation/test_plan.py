@@ -0,0 +1,205 @@
+import asyncio
+import threading
+import time
+from typing import Dict, List
+import unittest
+from unittest.mock import Mock
+
+from metricheq.core.connectors.base import Connector
+from metricheq.core.deducers.base import BatchDeducer, Deducer
+from metricheq.evaluation.plan import MetricPlan
+
+
+class SlowDeducer(Deducer):
+    """Sleeps `delay` seconds per deduction and tracks per-connector concurrency."""
+
+    in_flight: Dict[Connector, int] = {}
+    peaks: Dict[Connector, int] = {}
+    started: List[Deducer] = []
+    lock = threading.Lock()
+
+    def __init__(self, connector, params):
+        super().__init__(connector, params)
+
+    def retrieve_data(self):
+        with self.lock:
+            self.started.append(self)
+            count = self.in_flight.get(self.connector, 0) + 1
+            self.in_flight[self.connector] = count
+            self.peaks[self.connector] = max(self.peaks.get(self.connector, 0), count)
+        try:
+            time.sleep(self.params.get("delay", 0))
+            if self.params.get("fail"):
+                raise ValueError("upstream failed")
+            return self.params["value"]
+        finally:
+            with self.lock:
+                self.in_flight[self.connector] -= 1
+
+    def process_data(self, data):
+        return data
+
+    def finalize(self, processed_data):
+        return processed_data
+
+
+class SlowBatchDeducer(SlowDeducer, BatchDeducer):
+    def process_data(self, data):
+        return {"a": data}
+
+
+def build_connector():
+    return Mock(spec=Connector, client=Mock())
+
+
+class PlanTestCase(unittest.TestCase):
+    def setUp(self):
+        SlowDeducer.in_flight.clear()
+        SlowDeducer.peaks.clear()
+        del SlowDeducer.started[:]
+
+
+class TestMetricPlan(PlanTestCase):
+    def test_outcomes_keep_the_order_deducers_were_added(self):
+        connectors = [build_connector(), build_connector()]
+        plan = MetricPlan()
+        for value in range(10):
+            plan.add(SlowDeducer(connectors[value % 2], {"value": value}))
+
+        outcomes = plan.run()
+
+        self.assertEqual([o.metric.value for o in outcomes], list(range(10)))
+        self.assertTrue(all(outcome.ok for outcome in outcomes))
+
+    def test_failures_do_not_abort_the_plan(self):
+        connector = build_connector()
+        failing = SlowDeducer(connector, {"fail": True})
+        plan = MetricPlan([SlowDeducer(connector, {"value": 1}), failing])
+
+        ok, failed = plan.run()
+
+        self.assertEqual(ok.metric.value, 1)
+        self.assertFalse(failed.ok)
+        self.assertIsInstance(failed.error, ValueError)
+        self.assertIs(failed.deducer, failing)
+
+    def test_limits_in_flight_deducers_per_connector(self):
+        fast, slow = build_connector(), build_connector()
+        plan = MetricPlan(max_in_flight=4, connector_limits={slow: 2})
+        for _ in range(12):
+            plan.add(SlowDeducer(fast, {"value": 1, "delay": 0.01}))
+            plan.add(SlowDeducer(slow, {"value": 1, "delay": 0.01}))
+
+        plan.run()
+
+        self.assertEqual(SlowDeducer.peaks[fast], 4)
+        self.assertEqual(SlowDeducer.peaks[slow], 2)
+
+    def test_runs_in_about_the_slowest_connector_share(self):
+        connectors = [build_connector() for _ in range(5)]
+        plan = MetricPlan(max_in_flight=10)
+        for index in range(200):
+            delay = 0.05 if index % 5 == 0 else 0.01
+            params = {"value": 1, "delay": delay}
+            plan.add(SlowDeducer(connectors[index % 5], params))
+
+        start = time.perf_counter()
+        plan.run()
+        elapsed = time.perf_counter() - start
+
+        # The slowest connector runs 40 deducers of 50 ms, 10 at a time.
+        self.assertLess(elapsed, 0.6)
+
+    def test_batch_deducers_report_metrics(self):
+        (outcome,) = MetricPlan(
+            [SlowBatchDeducer(build_connector(), {"value": 3})]
+        ).run()
+
+        self.assertIsNone(outcome.metric)
+        self.assertEqual(outcome.metrics["a"].value, 3)
+
+    def test_empty_plan(self):
+        self.assertEqual(MetricPlan().run(), [])
+
+
+class TestMetricPlanStreaming(PlanTestCase):
+    def build_plan(self, delays, **kwargs):
+        connectors = [build_connector() for _ in delays]
+        return MetricPlan(
+            [
+                SlowDeducer(connector, {"value": value, "delay": delay})
+                for value, (connector, delay) in enumerate(zip(connectors, delays))
+            ],
+            **kwargs,
+        )
+
+    def test_yields_in_completion_order(self):
+        plan = self.build_plan([0.2, 0.0, 0.1])
+
+        values = [outcome.metric.value for outcome in plan.iter_results()]
+
+        self.assertEqual(values, [1, 2, 0])
+
+    def test_first_result_does_not_wait_for_the_slowest(self):
+        plan = self.build_plan([0.5, 0.0])
+
+        results = plan.iter_results()
+        start = time.perf_counter()
+        first = next(results)
+        elapsed = time.perf_counter() - start
+        results.close()
+
+        self.assertEqual(first.metric.value, 1)
+        self.assertLess(elapsed, 0.4)
+
+    def test_ordered_results(self):
+        plan = self.build_plan([0.1, 0.0, 0.05])
+
+        values = [o.metric.value for o in plan.iter_results(ordered=True)]
+
+        self.assertEqual(values, [0, 1, 2])
+
+    def test_max_pending_applies_backpressure(self):
+        for ordered in (False, True):
+            with self.subTest(ordered=ordered):
+                del SlowDeducer.started[:]
+                connector = build_connector()
+                plan = MetricPlan(
+                    [SlowDeducer(connector, {"value": value}) for value in range(20)],
+                    max_in_flight=4,
+                )
+                results = plan.iter_results(ordered=ordered, max_pending=2)
+
+                next(results)
+                time.sleep(0.05)
+
+                self.assertLessEqual(len(SlowDeducer.started), 3)
+                self.assertEqual(len(list(results)), 19)
+
+    def test_rejects_empty_window(self):
+        plan = self.build_plan([0.0])
+
+        for max_pending in (0, -1):
+            with self.assertRaises(ValueError):
+                plan.iter_results(max_pending=max_pending)
+
+    def test_closing_early_stops_the_plan(self):
+        connector = build_connector()
+        plan = MetricPlan(
+            [SlowDeducer(connector, {"value": value}) for value in range(50)],
+            max_in_flight=4,
+        )
+        results = plan.iter_results(max_pending=2)
+
+        next(results)
+        results.close()
+
+        self.assertLessEqual(len(SlowDeducer.started), 3)
+
+    def test_async_iteration(self):
+        plan = self.build_plan([0.1, 0.0])
+
+        async def collect():
+            return [outcome.metric.value async for outcome in plan.aiter_results()]
+
+        self.assertEqual(asyncio.run(collect()), [1, 0])
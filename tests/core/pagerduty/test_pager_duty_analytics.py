@@ -0,0 +1,205 @@
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import json
+import threading
+import unittest
+from unittest.mock import Mock
+from urllib.parse import parse_qs, urlparse
+
+from metricheq.core.connectors.pagerduty import PagerDutyConfig, PagerDutyConnector
+from metricheq.core.deducers.pagerduty import (
+    PagerDutyAnalyticsIncidentFrequencyDeducer,
+    PagerDutyAnalyticsResolutionTimeDeducer,
+)
+
+INCIDENTS = [
+    {
+        "id": "A1",
+        "status": "resolved",
+        "service": {"id": "PA"},
+        "created_at": "2024-01-02T00:00:00Z",
+        "last_status_change_at": "2024-01-02T01:00:00Z",
+    },
+    {
+        "id": "A2",
+        "status": "resolved",
+        "service": {"id": "PA"},
+        "created_at": "2024-01-03T00:00:00Z",
+        "last_status_change_at": "2024-01-03T03:00:00Z",
+    },
+    {
+        "id": "B1",
+        "status": "triggered",
+        "service": {"id": "PB"},
+        "created_at": "2024-01-04T00:00:00Z",
+        "last_status_change_at": "2024-01-04T00:00:00Z",
+    },
+]
+
+
+class PagerDutyStandIn:
+    """Serves `/analytics` and `/incidents` out of `INCIDENTS` on a local port."""
+
+    def __init__(self, analytics_status=200):
+        self.analytics_status = analytics_status
+        self.analytics_bodies = []
+        self.incident_queries = []
+        stand_in = self
+
+        class RequestHandler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                url = urlparse(self.path)
+                query = parse_qs(url.query)
+                if url.path == "/incidents":
+                    stand_in.incident_queries.append(query)
+                    incidents = [
+                        incident
+                        for incident in INCIDENTS
+                        if incident["service"]["id"] in query["service_ids[]"]
+                    ]
+                    page = {"incidents": incidents, "more": False}
+                    self.reply(200, {**page, "total": len(incidents)})
+                else:
+                    self.reply(200, {"users": []})
+
+            def do_POST(self):
+                length = int(self.headers["Content-Length"])
+                body = json.loads(self.rfile.read(length))
+                stand_in.analytics_bodies.append(body)
+                if stand_in.analytics_status != 200:
+                    self.reply(stand_in.analytics_status, {"error": "Forbidden"})
+                    return
+                rows = [
+                    {
+                        "service_id": "PA",
+                        "mean_seconds_to_resolve": 7200,
+                        "total_incident_count": 2,
+                    },
+                    {
+                        "service_id": "PB",
+                        "mean_seconds_to_resolve": None,
+                        "total_incident_count": 1,
+                    },
+                ]
+                requested = body["filters"]["service_ids"]
+                data = [row for row in rows if row["service_id"] in requested]
+                self.reply(200, {"data": data})
+
+            def reply(self, status, payload):
+                body = json.dumps(payload).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), RequestHandler)
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}"
+
+    def __enter__(self):
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+class TestPagerDutyAnalyticsDeducers(unittest.TestCase):
+    def setUp(self):
+        self.params = {
+            "service_ids": ["PA", "PB", "PC"],
+            "incident_urgency": "high",
+            "since": datetime(2024, 1, 1, tzinfo=timezone.utc),
+            "until": datetime(2024, 1, 11, tzinfo=timezone.utc),
+        }
+
+    def connector(self, stand_in):
+        config = PagerDutyConfig(
+            api_key="key", base_url=stand_in.url, rate_limit_per_minute=None
+        )
+        connector = PagerDutyConnector.from_config(config)
+        self.addCleanup(connector.close)
+        return connector
+
+    def test_init_with_invalid_connector(self):
+        with self.assertRaises(TypeError):
+            PagerDutyAnalyticsResolutionTimeDeducer(Mock(), self.params)
+
+    def test_requires_services(self):
+        connector = Mock(spec=PagerDutyConnector, client=Mock())
+        with self.assertRaises(ValueError):
+            PagerDutyAnalyticsResolutionTimeDeducer(connector, {"service_ids": []})
+
+    def test_default_window_ends_when_deduced(self):
+        params = {"service_ids": ["PA"], "incident_urgency": "high"}
+        with PagerDutyStandIn() as stand_in:
+            deducer = PagerDutyAnalyticsIncidentFrequencyDeducer(
+                self.connector(stand_in), params
+            )
+            deduced_after = datetime.now(timezone.utc)
+            deducer.deduce()
+
+        filters = stand_in.analytics_bodies[0]["filters"]
+        until = datetime.fromisoformat(filters["created_at_end"])
+        since = datetime.fromisoformat(filters["created_at_start"])
+        self.assertGreaterEqual(until, deduced_after)
+        self.assertEqual(until - since, timedelta(days=30))
+
+    def test_resolution_time_from_analytics(self):
+        with PagerDutyStandIn() as stand_in:
+            deducer = PagerDutyAnalyticsResolutionTimeDeducer(
+                self.connector(stand_in), {**self.params, "format": "hours"}
+            )
+            metrics = deducer.metrics
+
+        self.assertEqual(
+            {service: metric.value for service, metric in metrics.items()},
+            {"PA": 2, "PB": None, "PC": None},
+        )
+        self.assertEqual(len(stand_in.analytics_bodies), 1)
+        self.assertEqual(stand_in.incident_queries, [])
+        filters = stand_in.analytics_bodies[0]["filters"]
+        self.assertEqual(filters["service_ids"], ["PA", "PB", "PC"])
+        self.assertEqual(filters["urgency"], "high")
+        self.assertEqual(filters["created_at_start"], "2024-01-01T00:00:00+00:00")
+
+    def test_frequency_from_analytics(self):
+        with PagerDutyStandIn() as stand_in:
+            deducer = PagerDutyAnalyticsIncidentFrequencyDeducer(
+                self.connector(stand_in), self.params
+            )
+            frequencies = deducer.deduce()
+
+        self.assertEqual(frequencies, {"PA": 0.2, "PB": 0.1, "PC": 0})
+
+    def test_resolution_time_falls_back_to_incidents(self):
+        with PagerDutyStandIn(analytics_status=403) as stand_in:
+            deducer = PagerDutyAnalyticsResolutionTimeDeducer(
+                self.connector(stand_in), self.params
+            )
+            resolution_times = deducer.deduce()
+
+        self.assertEqual(resolution_times, {"PA": 7200, "PB": None, "PC": None})
+        self.assertEqual(len(stand_in.incident_queries), 3)
+
+    def test_frequency_falls_back_to_incident_totals(self):
+        with PagerDutyStandIn(analytics_status=404) as stand_in:
+            deducer = PagerDutyAnalyticsIncidentFrequencyDeducer(
+                self.connector(stand_in), self.params
+            )
+            frequencies = deducer.deduce()
+
+        self.assertEqual(frequencies, {"PA": 0.2, "PB": 0.1, "PC": 0})
+        self.assertTrue(
+            all(query["limit"] == ["1"] for query in stand_in.incident_queries)
+        )
+
+    def test_metric_is_not_available(self):
+        connector = Mock(spec=PagerDutyConnector, client=Mock())
+        deducer = PagerDutyAnalyticsIncidentFrequencyDeducer(connector, self.params)
+        with self.assertRaises(TypeError):
+            deducer.metric
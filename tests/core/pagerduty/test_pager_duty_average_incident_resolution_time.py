@@ -1,4 +1,6 @@
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
+import os
+import tempfile
 import unittest
 from unittest.mock import Mock, patch
 from requests import HTTPError
@@ -8,6 +10,8 @@ from metricheq.core.deducers.pagerduty import (
     PagerDutyAVGIncidentResolutionTimeDeducer,
     PagerDutyAVGIncidentResolutionTimeParams,
 )
+from metricheq.core.connectors.store import HistoricalStore
+from metricheq.core.deducers.pagerduty.utils import INCIDENT_RECORD_KIND
 
 
 class TestPagerDutyAVGIncidentResolutionTimeDeducer(unittest.TestCase):
@@ -67,10 +71,9 @@ class TestPagerDutyAVGIncidentResolutionTimeDeducer(unittest.TestCase):
         }
         self.mock_client.make_request.return_value = mock_response
 
-        result = self.deducer.retrieve_data()
-        self.assertIsNotNone(result)
-        if result is not None:
-            self.assertIn("incidents", result)
+        result = list(self.deducer.retrieve_data())
+        self.assertEqual(len(result), 1)
+        self.assertEqual(result[0]["status"], "resolved")
 
     def test_retrieve_data_failure(self):
         mock_response = Mock()
@@ -80,7 +83,7 @@ class TestPagerDutyAVGIncidentResolutionTimeDeducer(unittest.TestCase):
         self.mock_client.make_request.return_value = mock_response
 
         with self.assertRaises(HTTPError):
-            self.deducer.retrieve_data()
+            list(self.deducer.retrieve_data())
 
     def test_finalize(self):
         test_duration_in_seconds = 3600
@@ -104,3 +107,168 @@ class TestPagerDutyAVGIncidentResolutionTimeDeducer(unittest.TestCase):
     def test_finalize_with_none(self):
         result = self.deducer.finalize(None)
         self.assertIsNone(result)
+
+
+class TestIncrementalResolutionTime(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+        self.mock_client = Mock()
+        self.mock_connector = Mock(spec=PagerDutyConnector, client=self.mock_client)
+        self.params = {
+            "service_id": "P8WTODX",
+            "incident_urgency": "high",
+            "since": datetime(2024, 1, 1, tzinfo=timezone.utc),
+            "incremental": True,
+            "state_path": os.path.join(self.directory.name, "state.sqlite"),
+        }
+
+    def serve(self, *incidents):
+        response = Mock(status_code=200)
+        response.json.return_value = {"incidents": list(incidents), "more": False}
+        self.mock_client.make_request.return_value = response
+
+    def deduce(self):
+        deducer = PagerDutyAVGIncidentResolutionTimeDeducer(
+            self.mock_connector, self.params
+        )
+        return deducer.deduce()
+
+    def requested_since(self):
+        return self.mock_client.make_request.call_args.kwargs["params"]["since"]
+
+    @staticmethod
+    def incident(incident_id, status, created_at, changed_at):
+        return {
+            "id": incident_id,
+            "status": status,
+            "created_at": created_at,
+            "last_status_change_at": changed_at,
+        }
+
+    def test_state_path_is_required(self):
+        with self.assertRaises(ValueError):
+            PagerDutyAVGIncidentResolutionTimeParams(
+                service_id="P8WTODX", incident_urgency="high", incremental=True
+            )
+
+    def test_since_is_required(self):
+        with self.assertRaises(ValueError):
+            PagerDutyAVGIncidentResolutionTimeParams(**{**self.params, "since": None})
+
+    def stored_ids(self, scope="P8WTODX:high"):
+        store = HistoricalStore(self.params["state_path"])
+        return [incident["id"] for incident in store.query(INCIDENT_RECORD_KIND, scope)]
+
+    def test_refresh_only_fetches_from_oldest_open_incident(self):
+        self.serve(
+            self.incident(
+                "A", "resolved", "2024-01-02T00:00:00Z", "2024-01-02T01:00:00Z"
+            ),
+            self.incident(
+                "B", "triggered", "2024-01-03T00:00:00Z", "2024-01-03T00:00:00Z"
+            ),
+        )
+        self.assertEqual(self.deduce(), 3600)
+        self.assertEqual(self.requested_since(), "2024-01-01T00:00:00+00:00")
+
+        self.serve(
+            self.incident(
+                "B", "resolved", "2024-01-03T00:00:00Z", "2024-01-03T03:00:00Z"
+            ),
+            self.incident(
+                "C", "resolved", "2024-01-04T00:00:00Z", "2024-01-04T02:00:00Z"
+            ),
+        )
+        self.assertEqual(self.deduce(), (3600 + 3 * 3600 + 2 * 3600) / 3)
+        self.assertEqual(self.requested_since(), "2024-01-03T00:00:00+00:00")
+
+    def test_refetched_resolved_incidents_are_not_counted_twice(self):
+        self.serve(
+            self.incident(
+                "A", "triggered", "2024-01-02T00:00:00Z", "2024-01-02T00:00:00Z"
+            ),
+            self.incident(
+                "B", "resolved", "2024-01-03T00:00:00Z", "2024-01-03T01:00:00Z"
+            ),
+        )
+        self.deduce()
+
+        self.serve(
+            self.incident(
+                "A", "resolved", "2024-01-02T00:00:00Z", "2024-01-02T03:00:00Z"
+            ),
+            self.incident(
+                "B", "resolved", "2024-01-03T00:00:00Z", "2024-01-03T01:00:00Z"
+            ),
+        )
+        self.assertEqual(self.deduce(), (3600 + 3 * 3600) / 2)
+
+    def test_state_is_persisted_per_service_and_urgency(self):
+        self.serve(
+            self.incident(
+                "A", "resolved", "2024-01-02T00:00:00Z", "2024-01-02T01:00:00Z"
+            ),
+        )
+        self.deduce()
+
+        self.assertEqual(self.stored_ids(), ["A"])
+        self.assertEqual(self.stored_ids("P8WTODX:low"), [])
+
+    def test_rolling_window_drops_aged_out_incidents(self):
+        self.serve(
+            self.incident(
+                "A", "resolved", "2024-01-02T00:00:00Z", "2024-01-02T01:00:00Z"
+            ),
+            self.incident(
+                "B", "resolved", "2024-01-05T00:00:00Z", "2024-01-05T03:00:00Z"
+            ),
+        )
+        self.deduce()
+
+        self.params["since"] = datetime(2024, 1, 3, tzinfo=timezone.utc)
+        self.serve()
+        self.assertEqual(self.deduce(), 3 * 3600)
+        self.assertNotEqual(self.requested_since(), "2024-01-03T00:00:00+00:00")
+
+        self.assertEqual(self.stored_ids(), ["B"])
+
+    def test_window_reaching_further_back_is_fetched_again(self):
+        self.serve()
+        self.deduce()
+
+        self.params["since"] = datetime(2023, 12, 1, tzinfo=timezone.utc)
+        self.deduce()
+
+        self.assertEqual(self.requested_since(), "2023-12-01T00:00:00+00:00")
+
+    def test_until_bounds_the_kept_incidents(self):
+        self.serve(
+            self.incident(
+                "A", "resolved", "2024-01-02T00:00:00Z", "2024-01-02T01:00:00Z"
+            ),
+            self.incident(
+                "B", "resolved", "2024-01-05T00:00:00Z", "2024-01-05T03:00:00Z"
+            ),
+        )
+        self.deduce()
+
+        self.params["until"] = datetime(2024, 1, 4, tzinfo=timezone.utc)
+        self.mock_client.make_request.reset_mock()
+        self.assertEqual(self.deduce(), 3600)
+        self.mock_client.make_request.assert_not_called()
+
+    def test_rolling_window_keeps_other_services(self):
+        self.serve(
+            self.incident(
+                "A", "resolved", "2024-01-02T00:00:00Z", "2024-01-02T01:00:00Z"
+            ),
+        )
+        self.deduce()
+
+        self.params["service_id"] = "POTHER"
+        self.params["since"] = datetime(2024, 1, 3, tzinfo=timezone.utc)
+        self.serve()
+        self.deduce()
+
+        self.assertEqual(self.stored_ids(), ["A"])
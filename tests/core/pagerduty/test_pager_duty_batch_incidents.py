@@ -0,0 +1,212 @@
+from datetime import datetime, timedelta, timezone
+import unittest
+from unittest.mock import Mock
+
+from metricheq.core.connectors.pagerduty import PagerDutyConnector
+from metricheq.core.deducers.pagerduty import (
+    PagerDutyAVGIncidentResolutionTimeParams,
+    PagerDutyBatchAVGIncidentResolutionTimeDeducer,
+    PagerDutyBatchIncidentFrequencyDeducer,
+    group_incident_params,
+)
+from metricheq.exceptions.core.exceptions import PaginationLimitError
+
+SINCE = datetime(2024, 1, 1, tzinfo=timezone.utc)
+UNTIL = SINCE + timedelta(days=10)
+
+
+def incident(service_id, status, hours):
+    return {
+        "id": f"{service_id}-{hours}",
+        "status": status,
+        "service": {"id": service_id},
+        "created_at": "2024-01-02T00:00:00Z",
+        "last_status_change_at": f"2024-01-02T{hours:02d}:00:00Z",
+    }
+
+
+class TestPagerDutyBatchIncidentDeducers(unittest.TestCase):
+    def setUp(self):
+        self.mock_client = Mock()
+        self.mock_connector = Mock(spec=PagerDutyConnector, client=self.mock_client)
+        response = Mock(status_code=200)
+        response.json.return_value = {
+            "incidents": [
+                incident("PA", "resolved", 1),
+                incident("PA", "resolved", 3),
+                incident("PB", "triggered", 0),
+            ],
+            "more": False,
+        }
+        self.mock_client.make_request.return_value = response
+        self.window = {"incident_urgency": "high", "since": SINCE, "until": UNTIL}
+
+    def test_init_with_invalid_connector(self):
+        with self.assertRaises(TypeError):
+            PagerDutyBatchIncidentFrequencyDeducer(
+                Mock(), {"services": [{"service_id": "PA"}]}
+            )
+
+    def test_rejects_services_with_different_windows(self):
+        with self.assertRaises(ValueError):
+            PagerDutyBatchIncidentFrequencyDeducer(
+                self.mock_connector,
+                {
+                    "services": [
+                        {"service_id": "PA", **self.window},
+                        {"service_id": "PB", **self.window, "until": SINCE},
+                    ]
+                },
+            )
+
+    def test_rejects_duplicate_services(self):
+        with self.assertRaises(ValueError):
+            PagerDutyBatchIncidentFrequencyDeducer(
+                self.mock_connector,
+                {
+                    "services": [
+                        {"service_id": "PA", **self.window},
+                        {"service_id": "PA", **self.window, "time_unit": "weekly"},
+                    ]
+                },
+            )
+
+    def test_rejects_incremental_services(self):
+        service = {
+            "service_id": "PA",
+            **self.window,
+            "incremental": True,
+            "state_path": "state.json",
+        }
+        with self.assertRaises(ValueError):
+            PagerDutyBatchAVGIncidentResolutionTimeDeducer(
+                self.mock_connector, {"services": [service]}
+            )
+
+    def test_frequency_splits_one_stream_per_service(self):
+        deducer = PagerDutyBatchIncidentFrequencyDeducer(
+            self.mock_connector,
+            {
+                "services": [
+                    {"service_id": "PA", **self.window},
+                    {"service_id": "PB", **self.window, "time_unit": "weekly"},
+                    {"service_id": "PC", **self.window},
+                ]
+            },
+        )
+
+        frequencies = deducer.deduce()
+
+        self.assertEqual(frequencies["PA"], 0.2)
+        self.assertAlmostEqual(frequencies["PB"], 1 / (10 / 7))
+        self.assertEqual(frequencies["PC"], 0)
+        self.mock_client.make_request.assert_called_once()
+        params = self.mock_client.make_request.call_args.kwargs["params"]
+        self.assertEqual(params["service_ids[]"], ["PA", "PB", "PC"])
+        self.assertEqual(params["urgencies[]"], ["high"])
+
+    def test_resolution_time_splits_one_stream_per_service(self):
+        deducer = PagerDutyBatchAVGIncidentResolutionTimeDeducer(
+            self.mock_connector,
+            {
+                "services": [
+                    {"service_id": "PA", **self.window, "format": "hours"},
+                    {"service_id": "PB", **self.window},
+                ]
+            },
+        )
+
+        metrics = deducer.metrics
+
+        self.assertEqual(metrics["PA"].value, 2)
+        self.assertIsNone(metrics["PB"].value)
+        with self.assertRaises(TypeError):
+            deducer.metric
+
+    def test_groups_existing_configs(self):
+        configs = [
+            {"service_id": "PA", **self.window},
+            {"service_id": "PB", "incident_urgency": "low"},
+            {"service_id": "PC", **self.window},
+        ]
+
+        groups = group_incident_params(
+            configs, PagerDutyAVGIncidentResolutionTimeParams
+        )
+        deducers = PagerDutyBatchAVGIncidentResolutionTimeDeducer.for_params(
+            self.mock_connector, configs
+        )
+
+        self.assertEqual(groups, [[configs[0], configs[2]], [configs[1]]])
+        self.assertEqual(
+            [deducer.service_ids for deducer in deducers], [["PA", "PC"], ["PB"]]
+        )
+
+    def test_groups_duplicate_services_apart(self):
+        configs = [
+            {"service_id": "PA", **self.window},
+            {"service_id": "PA", **self.window, "format": "hours"},
+            {"service_id": "PB", **self.window},
+        ]
+
+        groups = group_incident_params(
+            configs, PagerDutyAVGIncidentResolutionTimeParams
+        )
+
+        self.assertEqual(groups, [[configs[0], configs[2]], [configs[1]]])
+
+    def test_open_ended_window_ends_now(self):
+        deducer = PagerDutyBatchIncidentFrequencyDeducer(
+            self.mock_connector,
+            {"services": [{"service_id": "PA", "since": SINCE}]},
+        )
+
+        deducer.deduce()
+
+        params = self.mock_client.make_request.call_args.kwargs["params"]
+        self.assertIn("until", params)
+
+    def test_unbounded_stream_over_the_offset_limit_fails(self):
+        self.mock_client.make_request.return_value.json.return_value = {
+            "incidents": [incident("PA", "resolved", 1)] * 100,
+            "more": True,
+            "total": 20000,
+        }
+        deducer = PagerDutyBatchIncidentFrequencyDeducer(
+            self.mock_connector,
+            {"services": [{"service_id": "PA"}], "max_workers": 4},
+        )
+
+        with self.assertRaises(PaginationLimitError):
+            deducer.deduce()
+
+    def test_naive_open_ended_window_over_the_offset_limit_splits(self):
+        over_limit = Mock(status_code=200)
+        over_limit.json.return_value = {"incidents": [], "more": True, "total": 20000}
+        half = Mock(status_code=200)
+        half.json.return_value = {
+            "incidents": [incident("PA", "resolved", 1)],
+            "more": False,
+            "total": 1,
+        }
+        self.mock_client.make_request.side_effect = [over_limit, half, half]
+        deducer = PagerDutyBatchAVGIncidentResolutionTimeDeducer(
+            self.mock_connector,
+            {
+                "services": [
+                    {
+                        **self.window,
+                        "service_id": "PA",
+                        "since": "2024-01-01T00:00:00",
+                        "until": None,
+                    }
+                ]
+            },
+        )
+
+        self.assertEqual(deducer.metrics["PA"].value, 3600)
+        windows = [
+            call.kwargs["params"]
+            for call in self.mock_client.make_request.call_args_list
+        ]
+        self.assertEqual(windows[1]["until"], windows[2]["since"])
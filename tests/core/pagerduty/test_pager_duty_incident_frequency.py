@@ -38,11 +38,8 @@ class TestPagerDutyIncidentFrequencyDeducer(unittest.TestCase):
         mock_response.json.return_value = {"incidents": [{"id": "1"}, {"id": "2"}]}
         self.mock_client.make_request.return_value = mock_response
 
-        result = self.deducer.retrieve_data()
-        self.assertIsNotNone(result)
-        if result is not None:
-            self.assertIn("incidents", result)
-            self.assertEqual(len(result["incidents"]), 2)
+        result = list(self.deducer.retrieve_data())
+        self.assertEqual(result, [{"id": "1"}, {"id": "2"}])
 
     def test_retrieve_data_failure(self):
         mock_response = Mock()
@@ -51,7 +48,7 @@ class TestPagerDutyIncidentFrequencyDeducer(unittest.TestCase):
         self.mock_client.make_request.return_value = mock_response
 
         with self.assertRaises(HTTPError):
-            self.deducer.retrieve_data()
+            list(self.deducer.retrieve_data())
 
     def test_process_data(self):
         mock_data = {"incidents": [{"id": "1"}, {"id": "2"}]}
@@ -67,3 +64,32 @@ class TestPagerDutyIncidentFrequencyDeducer(unittest.TestCase):
         processed_data = 0
         result = self.deducer.finalize(processed_data)
         self.assertEqual(result, 0)
+
+    def test_count_only_uses_server_side_total(self):
+        deducer = PagerDutyIncidentFrequencyDeducer(
+            self.mock_connector, {**self.params, "count_only": True}
+        )
+        mock_response = Mock(status_code=200)
+        mock_response.json.return_value = {"incidents": [{"id": "1"}], "total": 4321}
+        self.mock_client.make_request.return_value = mock_response
+
+        result = deducer.process_data(deducer.retrieve_data())
+
+        self.assertEqual(result, 4321)
+        params = self.mock_client.make_request.call_args.kwargs["params"]
+        self.assertEqual(params["limit"], 1)
+        self.assertEqual(params["total"], "true")
+
+    def test_count_only_falls_back_to_pagination(self):
+        deducer = PagerDutyIncidentFrequencyDeducer(
+            self.mock_connector, {**self.params, "count_only": True}
+        )
+        without_total = Mock(status_code=200)
+        without_total.json.return_value = {"incidents": [{"id": "1"}], "total": None}
+        page = Mock(status_code=200)
+        page.json.return_value = {"incidents": [{"id": "1"}, {"id": "2"}]}
+        self.mock_client.make_request.side_effect = [without_total, page]
+
+        result = deducer.process_data(deducer.retrieve_data())
+
+        self.assertEqual(result, 2)
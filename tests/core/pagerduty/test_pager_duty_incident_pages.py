@@ -0,0 +1,238 @@
+from datetime import datetime, timedelta, timezone
+import os
+import tempfile
+import threading
+import unittest
+from unittest.mock import Mock
+
+from metricheq.core.connectors.store import HistoricalStore
+from metricheq.core.deducers.pagerduty.utils import (
+    build_incidents_query,
+    iter_incidents,
+    iter_service_incidents,
+    resolution_seconds,
+)
+from metricheq.exceptions.core.exceptions import PaginationLimitError
+
+
+class FakePagerDutyClient:
+    """Serves `/incidents` pages out of an in-memory incident list."""
+
+    EPOCH = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+    def __init__(self, incident_count, report_total=True):
+        # One incident created every minute from EPOCH on
+        self.incidents = [
+            {
+                "id": str(i),
+                "created_at": (self.EPOCH + timedelta(minutes=i)).isoformat(),
+            }
+            for i in range(incident_count)
+        ]
+        self.report_total = report_total
+        self.calls = []
+        self.lock = threading.Lock()
+
+    def make_request(self, endpoint, method="GET", params=None, **kwargs):
+        with self.lock:
+            self.calls.append(params)
+        incidents = self.incidents
+        if "since" in params:
+            incidents = [i for i in incidents if i["created_at"] >= params["since"]]
+        if "until" in params:
+            incidents = [i for i in incidents if i["created_at"] < params["until"]]
+        offset, limit = params["offset"], params["limit"]
+        if offset + limit > 10000:
+            raise AssertionError("PagerDuty rejects offsets past 10000")
+        page = {
+            "incidents": incidents[offset : offset + limit],
+            "more": offset + limit < len(incidents),
+            "offset": offset,
+            "limit": limit,
+            "total": None,
+        }
+        if params["total"] == "true" and self.report_total:
+            page["total"] = len(incidents)
+        response = Mock(status_code=200)
+        response.json.return_value = page
+        return response
+
+
+class TestBuildIncidentsQuery(unittest.TestCase):
+    def test_builds_filters(self):
+        since = datetime(2024, 1, 1)
+        query = build_incidents_query(["A", "B"], "high", since=since)
+
+        self.assertEqual(query["service_ids[]"], ["A", "B"])
+        self.assertEqual(query["urgencies[]"], ["high"])
+        self.assertEqual(query["since"], since.isoformat())
+        self.assertNotIn("until", query)
+
+
+class TestResolutionSeconds(unittest.TestCase):
+    def test_resolved_incident(self):
+        incident = {
+            "status": "resolved",
+            "created_at": "2024-01-02T00:00:00Z",
+            "last_status_change_at": "2024-01-02T01:30:00Z",
+        }
+
+        self.assertEqual(resolution_seconds(incident), 5400)
+
+    def test_open_incident(self):
+        incident = {"status": "acknowledged", "created_at": "2024-01-02T00:00:00Z"}
+
+        self.assertIsNone(resolution_seconds(incident))
+
+
+class TestIterIncidents(unittest.TestCase):
+    def test_walks_every_page(self):
+        client = FakePagerDutyClient(250)
+
+        incidents = list(iter_incidents(client, {}))
+
+        self.assertEqual([i["id"] for i in incidents], [str(i) for i in range(250)])
+        self.assertEqual([c["offset"] for c in client.calls], [0, 100, 200])
+        self.assertTrue(all(c["limit"] == 100 for c in client.calls))
+
+    def test_is_lazy(self):
+        client = FakePagerDutyClient(250)
+
+        stream = iter_incidents(client, {})
+        next(stream)
+
+        self.assertEqual(len(client.calls), 1)
+
+    def test_concurrent_pages_keep_order(self):
+        client = FakePagerDutyClient(1050)
+
+        incidents = list(iter_incidents(client, {}, max_workers=4))
+
+        self.assertEqual([i["id"] for i in incidents], [str(i) for i in range(1050)])
+        self.assertEqual(client.calls[0]["total"], "true")
+        self.assertEqual(len(client.calls), 11)
+
+    def test_concurrent_falls_back_without_total(self):
+        client = FakePagerDutyClient(250, report_total=False)
+
+        incidents = list(iter_incidents(client, {}, max_workers=4))
+
+        self.assertEqual(len(incidents), 250)
+        self.assertEqual([c["offset"] for c in client.calls], [0, 100, 200])
+
+
+class TestIncidentsOffsetLimit(unittest.TestCase):
+    def window(self):
+        until = FakePagerDutyClient.EPOCH + timedelta(days=30)
+        return build_incidents_query(
+            ["P1"], since=FakePagerDutyClient.EPOCH, until=until
+        )
+
+    def assert_every_incident(self, incidents, count):
+        self.assertEqual(sorted(int(i["id"]) for i in incidents), list(range(count)))
+
+    def test_window_over_the_limit_is_split(self):
+        client = FakePagerDutyClient(12000)
+
+        self.assert_every_incident(list(iter_incidents(client, self.window())), 12000)
+
+    def test_concurrent_window_over_the_limit_is_split(self):
+        client = FakePagerDutyClient(12000)
+
+        incidents = list(iter_incidents(client, self.window(), max_workers=4))
+
+        self.assert_every_incident(incidents, 12000)
+
+    def test_unbounded_query_over_the_limit_raises(self):
+        client = FakePagerDutyClient(12000)
+
+        with self.assertRaises(PaginationLimitError):
+            list(iter_incidents(client, {}))
+        with self.assertRaises(PaginationLimitError):
+            list(iter_incidents(client, {}, max_workers=4))
+
+    def test_open_ended_service_window_over_the_limit_is_split(self):
+        client = FakePagerDutyClient(12000)
+
+        incidents = list(
+            iter_service_incidents(client, "P1", since=FakePagerDutyClient.EPOCH)
+        )
+
+        self.assert_every_incident(incidents, 12000)
+        self.assertTrue(all("until" in params for params in client.calls))
+
+
+class TestIterServiceIncidents(unittest.TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.client = Mock()
+        self.client.historical_store = HistoricalStore(
+            os.path.join(directory.name, "history.sqlite")
+        )
+        self.since = datetime(2024, 1, 1, tzinfo=timezone.utc)
+        self.until = datetime(2024, 2, 1, tzinfo=timezone.utc)
+
+    def serve(self, *incidents):
+        response = Mock(status_code=200)
+        response.json.return_value = {"incidents": list(incidents), "more": False}
+        self.client.make_request.return_value = response
+
+    def fetch(self):
+        return list(
+            iter_service_incidents(self.client, "P1", "high", self.since, self.until)
+        )
+
+    @staticmethod
+    def incident(incident_id, status, created_at):
+        return {"id": incident_id, "status": status, "created_at": created_at}
+
+    def test_only_fetches_the_open_tail_again(self):
+        resolved = self.incident("A", "resolved", "2024-01-02T00:00:00Z")
+        self.serve(resolved, self.incident("B", "triggered", "2024-01-10T00:00:00Z"))
+        self.fetch()
+
+        reopened_tail = self.incident("B", "resolved", "2024-01-10T00:00:00Z")
+        self.serve(reopened_tail)
+        incidents = self.fetch()
+
+        self.assertEqual(incidents, [resolved, reopened_tail])
+        params = self.client.make_request.call_args.kwargs["params"]
+        self.assertEqual(params["since"], "2024-01-10T00:00:00+00:00")
+
+    def test_fully_covered_window_makes_no_request(self):
+        self.serve(self.incident("A", "resolved", "2024-01-02T00:00:00Z"))
+        self.fetch()
+        self.client.make_request.reset_mock()
+
+        self.assertEqual(len(self.fetch()), 1)
+        self.client.make_request.assert_not_called()
+
+    def test_evicted_history_is_fetched_again(self):
+        now = datetime.now(timezone.utc)
+        self.client.historical_store.max_age = 30 * 86400
+        self.since, self.until = now - timedelta(days=90), now
+        self.serve(
+            *(
+                self.incident(
+                    str(day), "resolved", (now - timedelta(days=day)).isoformat()
+                )
+                for day in range(1, 90)
+            )
+        )
+        self.assertEqual(len(self.fetch()), 89)
+        self.client.make_request.reset_mock()
+
+        self.assertEqual(len(self.fetch()), 89)
+        self.client.make_request.assert_called_once()
+
+    def test_partially_consumed_stream_stores_nothing(self):
+        self.serve(self.incident("A", "resolved", "2024-01-02T00:00:00Z"))
+        stream = iter_service_incidents(
+            self.client, "P1", "high", self.since, self.until
+        )
+        next(stream)
+        stream.close()
+
+        store = self.client.historical_store
+        self.assertIsNone(store.coverage("pagerduty.incident", "P1:high"))
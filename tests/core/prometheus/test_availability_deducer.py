@@ -1,11 +1,13 @@
 from datetime import datetime, timedelta
 import unittest
 from unittest.mock import Mock, patch
+from urllib.parse import parse_qs, urlparse
 
 from requests import HTTPError
 
 from metricheq.core.connectors.prometheus import PrometheusConnector
 from metricheq.core.deducers.prometheus import PrometheusServiceAvailabilityDeducer
+from metricheq.core.deducers.prometheus.utils import resolve_step
 
 
 class TestPrometheusServiceAvailabilityDeducer(unittest.TestCase):
@@ -73,3 +75,64 @@ class TestPrometheusServiceAvailabilityDeducer(unittest.TestCase):
         ):
             result = self.deducer.deduce()
             self.assertEqual(result, 100.0)
+
+
+class TestPrometheusStepBudget(unittest.TestCase):
+    def setUp(self):
+        self.mock_client = Mock()
+        mock_response = Mock(status_code=200)
+        mock_response.json.return_value = {
+            "data": {
+                "resultType": "matrix",
+                "result": [{"values": [[0, "0.5"], [3600, "1"]]}],
+            }
+        }
+        self.mock_client.make_request.return_value = mock_response
+        self.mock_connector = Mock(spec=PrometheusConnector, client=self.mock_client)
+        self.end_time = datetime(2024, 1, 1)
+
+    def build_deducer(self, **params):
+        return PrometheusServiceAvailabilityDeducer(
+            self.mock_connector,
+            {"labels": {"job": "api"}, "end_time": self.end_time, **params},
+        )
+
+    def query_params(self):
+        endpoint = self.mock_client.make_request.call_args[0][0]
+        return {k: v[0] for k, v in parse_qs(urlparse(endpoint).query).items()}
+
+    def test_resolve_step(self):
+        start = self.end_time - timedelta(days=365)
+        self.assertEqual(resolve_step(start, self.end_time, 60), 60)
+        self.assertEqual(resolve_step(start, self.end_time, 60, 1001), 31536)
+        self.assertEqual(
+            resolve_step(self.end_time - timedelta(hours=1), self.end_time, 60, 1000),
+            60,
+        )
+
+    def test_budget_widens_step_and_window(self):
+        deducer = self.build_deducer(
+            start_time=self.end_time - timedelta(days=365), max_points=1001
+        )
+
+        availability = deducer.deduce()
+
+        params = self.query_params()
+        self.assertEqual(params["step"], "31536")
+        self.assertEqual(params["query"], 'avg_over_time(up{job="api"}[31536s])')
+        self.assertEqual(availability, 75.0)
+
+    def test_budget_keeps_fine_step_when_it_fits(self):
+        deducer = self.build_deducer(
+            start_time=self.end_time - timedelta(hours=1), step=30, max_points=1000
+        )
+
+        deducer.retrieve_data()
+
+        params = self.query_params()
+        self.assertEqual(params["step"], "30")
+        self.assertEqual(params["query"], 'up{job="api"}')
+
+    def test_invalid_budget(self):
+        with self.assertRaises(ValueError):
+            self.build_deducer(start_time=self.end_time, max_points=1)
@@ -0,0 +1,222 @@
+from datetime import datetime, timedelta
+import re
+import unittest
+from unittest.mock import Mock
+from urllib.parse import parse_qs, urlparse
+
+from metricheq.core.connectors.prometheus import PrometheusConnector
+from metricheq.core.deducers.prometheus import (
+    PrometheusSeriesAvailabilityDeducer,
+    PrometheusServiceAvailabilityDeducer,
+)
+from metricheq.core.deducers.prometheus.utils import (
+    fetch_range,
+    fetch_range_chunked,
+    split_range,
+)
+
+
+def parse_time(value):
+    return datetime.fromisoformat(value.rstrip("Z")).timestamp()
+
+
+class FakePrometheusClient:
+    """Answers `query_range` and availability ratio queries from stored samples."""
+
+    def __init__(self, series):
+        self.series = series
+        self.endpoints = []
+
+    def make_request(self, endpoint, method="GET", **kwargs):
+        self.endpoints.append(endpoint)
+        url = urlparse(endpoint)
+        query = {key: values[0] for key, values in parse_qs(url.query).items()}
+        if url.path == "query_range":
+            payload = self.query_range(query)
+        else:
+            payload = self.query(query)
+        response = Mock(status_code=200)
+        response.json.return_value = {"status": "success", "data": payload}
+        return response
+
+    def query_range(self, query):
+        start, end = parse_time(query["start"]), parse_time(query["end"])
+        step = int(query["step"])
+        result = []
+        for index, samples in enumerate(self.series):
+            values = [
+                [ts, value]
+                for ts, value in samples
+                if start <= ts <= end and (ts - start) % step == 0
+            ]
+            result.append({"metric": {"instance": str(index)}, "values": values})
+        return {"resultType": "matrix", "result": result}
+
+    def query(self, query):
+        window = int(re.search(r"\[(\d+)s\]", query["query"]).group(1))
+        end = parse_time(query["time"])
+        ups, total = 0.0, 0
+        for samples in self.series:
+            for ts, value in samples:
+                if end - window < ts <= end:
+                    ups += float(value)
+                    total += 1
+        ratio = str(ups / total) if total else "NaN"
+        return {
+            "resultType": "vector",
+            "result": [{"metric": {}, "value": [end, ratio]}],
+        }
+
+
+class TestAvailabilityModes(unittest.TestCase):
+    def setUp(self):
+        self.end_time = datetime(2024, 3, 1)
+        self.start_time = self.end_time - timedelta(hours=6)
+        start = self.start_time.timestamp()
+        series = [
+            [(start + 60 * i, "0" if i % 7 == 0 else "1") for i in range(1, 361)],
+            [(start + 60 * i, "0" if 100 <= i < 160 else "1") for i in range(1, 361)],
+        ]
+        self.client = FakePrometheusClient(series)
+        self.connector = Mock(spec=PrometheusConnector, client=self.client)
+
+    def params(self, mode):
+        return {
+            "labels": {"job": "api"},
+            "start_time": self.start_time,
+            "end_time": self.end_time,
+            "step": 60,
+            "mode": mode,
+        }
+
+    def deduce(self, mode):
+        deducer = PrometheusServiceAvailabilityDeducer(
+            self.connector, self.params(mode)
+        )
+        return deducer.deduce()
+
+    def test_modes_are_equivalent(self):
+        range_availability = self.deduce("range")
+        aggregate_availability = self.deduce("aggregate")
+
+        self.assertAlmostEqual(range_availability, aggregate_availability)
+        self.assertLess(aggregate_availability, 100)
+
+    def test_aggregate_issues_instant_query(self):
+        self.deduce("aggregate")
+
+        endpoint = self.client.endpoints[-1]
+        self.assertTrue(endpoint.startswith("query?"))
+        query = parse_qs(urlparse(endpoint).query)["query"][0]
+        self.assertEqual(
+            query,
+            'sum(sum_over_time(up{job="api"}[21600s])) '
+            '/ sum(count_over_time(up{job="api"}[21600s]))',
+        )
+
+    def test_aggregate_without_samples(self):
+        self.client.series = []
+        self.assertEqual(self.deduce("aggregate"), 0)
+
+    def test_invalid_mode(self):
+        with self.assertRaises(ValueError):
+            self.deduce("unknown")
+
+    def test_series_availability(self):
+        deducer = PrometheusSeriesAvailabilityDeducer(
+            self.connector, self.params("range")
+        )
+
+        series = deducer.deduce()
+        metrics = deducer.metrics
+
+        start = self.start_time.timestamp()
+        self.assertEqual(
+            series['instance="1"'].downtime_spans, [(start + 6000, start + 9600)]
+        )
+        self.assertAlmostEqual(metrics['instance="1"'].value, 300 / 360 * 100)
+        self.assertAlmostEqual(
+            (metrics['instance="0"'].value + metrics['instance="1"'].value) / 2,
+            self.deduce("range"),
+        )
+
+    def test_series_availability_needs_range_mode(self):
+        with self.assertRaises(ValueError):
+            PrometheusSeriesAvailabilityDeducer(
+                self.connector, self.params("aggregate")
+            )
+
+
+class TestChunkedRangeQueries(unittest.TestCase):
+    def setUp(self):
+        self.start_time = datetime(2024, 1, 1)
+        self.end_time = self.start_time + timedelta(days=10)
+        start = self.start_time.timestamp()
+        series = [
+            [(start + 60 * i, "0" if i % 13 == 0 else "1") for i in range(14401)],
+            [(start + 60 * i, "0" if i % 5 == 0 else "1") for i in range(14401)],
+        ]
+        self.client = FakePrometheusClient(series)
+
+    def test_split_range_respects_point_budget(self):
+        chunks = split_range(self.start_time, self.end_time, 60, 1000)
+
+        self.assertEqual(len(chunks), 15)
+        self.assertEqual(chunks[0][0], self.start_time)
+        self.assertEqual(chunks[-1][1], self.end_time)
+        for (_, previous_end), (next_start, _) in zip(chunks, chunks[1:]):
+            self.assertEqual(next_start - previous_end, timedelta(seconds=60))
+        for chunk_start, chunk_end in chunks:
+            self.assertLessEqual(
+                (chunk_end - chunk_start).total_seconds() / 60 + 1, 1000
+            )
+
+    def test_short_range_is_a_single_query(self):
+        end_time = self.start_time + timedelta(hours=1)
+        fetch_range_chunked(self.client, "up", self.start_time, end_time, 60)
+
+        self.assertEqual(len(self.client.endpoints), 1)
+
+    def test_chunked_result_matches_single_query(self):
+        single = fetch_range(self.client, "up", self.start_time, self.end_time, 60)
+        chunked = fetch_range_chunked(
+            self.client, "up", self.start_time, self.end_time, 60, max_points=1000
+        )
+
+        self.assertEqual(len(self.client.endpoints), 1 + 15)
+        self.assertEqual(
+            sorted(chunked["data"]["result"], key=lambda r: r["metric"]["instance"]),
+            single["data"]["result"],
+        )
+
+    def test_deducer_splits_long_windows(self):
+        connector = Mock(spec=PrometheusConnector, client=self.client)
+        deducer = PrometheusServiceAvailabilityDeducer(
+            connector,
+            {
+                "labels": {"job": "api"},
+                "start_time": self.start_time,
+                "end_time": self.end_time,
+                "step": 60,
+            },
+        )
+
+        availability = deducer.deduce()
+
+        self.assertEqual(len(self.client.endpoints), 2)
+        ups = sum(1 for i in range(14401) if i % 13) + sum(
+            1 for i in range(14401) if i % 5
+        )
+        self.assertAlmostEqual(availability, ups / (2 * 14401) * 100)
+
+    def test_invalid_chunk_size(self):
+        with self.assertRaises(ValueError):
+            PrometheusServiceAvailabilityDeducer(
+                Mock(spec=PrometheusConnector, client=self.client),
+                {
+                    "labels": {},
+                    "start_time": self.start_time,
+                    "end_time": self.end_time,
+                    "max_points_per_chunk": 20000,
+                },
+            )
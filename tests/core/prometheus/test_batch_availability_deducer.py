@@ -0,0 +1,63 @@
+from datetime import datetime, timedelta
+import unittest
+from unittest.mock import Mock
+from urllib.parse import parse_qs, urlparse
+
+from metricheq.core.connectors.prometheus import PrometheusConnector
+from metricheq.core.deducers.prometheus import PrometheusBatchServiceAvailabilityDeducer
+
+
+class TestPrometheusBatchServiceAvailabilityDeducer(unittest.TestCase):
+    def setUp(self):
+        self.mock_client = Mock()
+        self.mock_connector = Mock(spec=PrometheusConnector, client=self.mock_client)
+        self.end_time = datetime(2024, 3, 1)
+        self.params = {
+            "group_by": "job",
+            "labels": {"env": "prod"},
+            "start_time": self.end_time - timedelta(days=1),
+            "end_time": self.end_time,
+        }
+        self.deducer = PrometheusBatchServiceAvailabilityDeducer(
+            self.mock_connector, self.params
+        )
+        mock_response = Mock(status_code=200)
+        mock_response.json.return_value = {
+            "data": {
+                "resultType": "vector",
+                "result": [
+                    {"metric": {"job": "api"}, "value": [0, "0.995"]},
+                    {"metric": {"job": "worker"}, "value": [0, "1"]},
+                ],
+            }
+        }
+        self.mock_client.make_request.return_value = mock_response
+
+    def test_init_with_invalid_connector(self):
+        with self.assertRaises(TypeError):
+            PrometheusBatchServiceAvailabilityDeducer(Mock(), self.params)
+
+    def test_single_grouped_query(self):
+        self.deducer.retrieve_data()
+
+        self.mock_client.make_request.assert_called_once()
+        endpoint = self.mock_client.make_request.call_args[0][0]
+        query = parse_qs(urlparse(endpoint).query)["query"][0]
+        self.assertEqual(
+            query,
+            'sum by (job) (sum_over_time(up{env="prod"}[86400s])) '
+            '/ sum by (job) (count_over_time(up{env="prod"}[86400s]))',
+        )
+
+    def test_deduce_maps_services_to_availability(self):
+        result = self.deducer.deduce()
+
+        self.assertAlmostEqual(result["api"], 99.5)
+        self.assertEqual(result["worker"], 100)
+
+    def test_metrics(self):
+        metrics = self.deducer.metrics
+
+        self.assertEqual(metrics["worker"].value, 100)
+        with self.assertRaises(TypeError):
+            self.deducer.metric
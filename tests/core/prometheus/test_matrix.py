@@ -0,0 +1,58 @@
+import unittest
+
+from metricheq.core.deducers.prometheus.matrix import (
+    matrix_availability,
+    series_availability,
+    to_columns,
+)
+
+RESULTS = [
+    {
+        "metric": {"instance": "a"},
+        "values": [[0, "1"], [60, "0"], [120, "0"], [180, "1"], [240, "0"]],
+    },
+    {"metric": {"instance": "b"}, "values": [[0, "1"], [60, "1"], [120, "1"]]},
+    {"metric": {"instance": "c"}, "values": []},
+]
+
+
+class TestMatrix(unittest.TestCase):
+    def test_matrix_availability(self):
+        self.assertAlmostEqual(matrix_availability(to_columns(RESULTS)), 5 / 8 * 100)
+
+    def test_empty_matrix(self):
+        self.assertEqual(matrix_availability(to_columns([])), 0)
+
+    def test_series_availability(self):
+        availability = series_availability(to_columns(RESULTS))
+
+        self.assertEqual(
+            [(series.labels, series.availability) for series in availability],
+            [
+                ({"instance": "a"}, 40.0),
+                ({"instance": "b"}, 100.0),
+                ({"instance": "c"}, 0),
+            ],
+        )
+
+    def test_downtime_spans(self):
+        columns = to_columns(RESULTS)
+
+        self.assertEqual(columns[0].downtime_spans(), [(60, 180), (240, 240)])
+        self.assertEqual(columns[1].downtime_spans(), [])
+        self.assertEqual(columns[2].downtime_spans(), [])
+
+    def test_fractional_downtime_spans(self):
+        columns = to_columns([{"values": [[0, "1"], [60, "0.5"], [120, "1"]]}])
+
+        self.assertEqual(columns[0].downtime_spans(), [(60, 120)])
+
+    def test_fractional_values(self):
+        columns = to_columns([{"values": [[0, "0.5"], [60, "1"]]}])
+
+        self.assertEqual(matrix_availability(columns), 75)
+
+    def test_timestamps_are_not_converted(self):
+        columns = to_columns([{"values": [["timestamp", "1"]]}])
+
+        self.assertEqual(matrix_availability(columns), 100)
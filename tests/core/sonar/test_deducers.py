@@ -1,11 +1,22 @@
+import asyncio
+import threading
 import unittest
 from unittest.mock import Mock
 
-from metricheq.core.connectors.sonar import SonarClient, SonarConnector
+from requests import HTTPError
+
+from metricheq.core.connectors.sonar import (
+    SonarClient,
+    SonarConnector,
+    SonarTokenConfig,
+)
 from metricheq.core.deducers.sonar import (
+    SonarBulkMeasuresDeducer,
     SonarMeasureDeducer,
     SonarMeasureParams,
 )
+from metricheq.core.deducers.sonar.sonar_measure import ALLOWED_METRIC_KEYS
+from metricheq.core.deducers.sonar.utils import measure_batcher_for
 
 
 class TestSonarMeasureDeducer(unittest.TestCase):
@@ -58,3 +69,196 @@ class TestSonarMeasureDeducer(unittest.TestCase):
         processed_data = "85.2"
         result = self.deducer.finalize(processed_data)
         self.assertEqual(result, "85.2")
+
+    def test_rejects_unknown_metric_key(self):
+        with self.assertRaisesRegex(ValueError, "Invalid metric_key: lines"):
+            SonarMeasureParams(component="example_component", metric_key="lines")
+
+    def test_allowed_metric_keys_importable(self):
+        self.assertIn("coverage", ALLOWED_METRIC_KEYS)
+
+
+class TestSonarMeasureBatching(unittest.TestCase):
+    def setUp(self):
+        self.mock_client = Mock(spec=SonarClient)
+        self.mock_connector = Mock(spec=SonarConnector, client=self.mock_client)
+        self.mock_client.make_request.side_effect = self.serve_measures
+
+    @staticmethod
+    def serve_measures(endpoint, params):
+        values = {"coverage": "85.2", "bugs": "3", "vulnerabilities": "0"}
+        measures = [
+            {"metric": key, "value": values.get(key, "1")}
+            for key in params["metricKeys"].split(",")
+        ]
+        response = Mock(status_code=200)
+        response.json.return_value = {
+            "component": {"key": params["component"], "measures": measures}
+        }
+        return response
+
+    def build(self, component, *metric_keys):
+        return [
+            SonarMeasureDeducer(
+                self.mock_connector, {"component": component, "metric_key": key}
+            )
+            for key in metric_keys
+        ]
+
+    def requested(self):
+        return [
+            (call.kwargs["params"]["component"], call.kwargs["params"]["metricKeys"])
+            for call in self.mock_client.make_request.call_args_list
+        ]
+
+    def test_one_request_per_component(self):
+        deducers = self.build("web", "coverage", "bugs", "vulnerabilities")
+        deducers += self.build("api", "coverage")
+
+        values = [deducer.deduce() for deducer in deducers]
+
+        self.assertEqual(values, ["85.2", "3", "0", "85.2"])
+        self.assertEqual(
+            self.requested(),
+            [("web", "bugs,coverage,vulnerabilities"), ("api", "coverage")],
+        )
+
+    def test_every_round_is_batched(self):
+        deducers = self.build("web", "coverage", "bugs")
+
+        for _ in range(3):
+            for deducer in deducers:
+                deducer.deduce()
+
+        self.assertEqual(self.requested(), [("web", "bugs,coverage")] * 3)
+
+    def test_stale_payload_is_fetched_again(self):
+        coverage, bugs = self.build("web", "coverage", "bugs")
+        coverage.batcher.max_age = 0
+
+        coverage.deduce()
+        bugs.deduce()
+
+        self.assertEqual(self.requested(), [("web", "bugs,coverage")] * 2)
+
+    def test_failed_fetch_is_not_replayed(self):
+        coverage, bugs = self.build("web", "coverage", "bugs")
+        failure = Mock(status_code=502)
+        failure.raise_for_status.side_effect = HTTPError("502 Bad Gateway")
+        self.mock_client.make_request.side_effect = [failure]
+
+        with self.assertRaises(HTTPError):
+            coverage.deduce()
+        self.mock_client.make_request.side_effect = self.serve_measures
+
+        self.assertEqual(bugs.deduce(), "3")
+        self.assertEqual(len(self.requested()), 2)
+
+    def test_unclaimed_payloads_expire(self):
+        coverage, _ = self.build("web", "coverage", "bugs")
+        coverage.batcher.max_age = 0
+
+        coverage.deduce()
+        self.build("api", "bugs")[0].deduce()
+
+        self.assertNotIn(("web", "bugs"), coverage.batcher._batched)
+
+    def test_refresh_leads_a_new_request(self):
+        coverage, bugs = self.build("web", "coverage", "bugs")
+        coverage.deduce()
+
+        self.assertEqual(bugs.refresh().value, 3)
+        self.assertEqual(len(self.requested()), 2)
+
+    def test_invalidate_drops_the_waiting_payload(self):
+        coverage, bugs = self.build("web", "coverage", "bugs")
+        coverage.deduce()
+
+        bugs.invalidate()
+        bugs.deduce()
+
+        self.assertEqual(len(self.requested()), 2)
+
+    def test_max_age_follows_the_client_config(self):
+        client = SonarClient(
+            SonarTokenConfig(host_url="http://sonar", user_token="t", batch_max_age=5)
+        )
+
+        self.assertEqual(measure_batcher_for(SonarConnector(client)).max_age, 5)
+
+
+class FakeSonarClient:
+    """Serves component and measure searches for `project_count` projects."""
+
+    def __init__(self, project_count):
+        self.project_keys = [f"project-{i:04d}" for i in range(project_count)]
+        self.calls = []
+        self.lock = threading.Lock()
+
+    def make_request(self, endpoint, method="GET", params=None, **kwargs):
+        with self.lock:
+            self.calls.append((endpoint, params))
+        response = Mock(status_code=200)
+        if endpoint == "/api/components/search":
+            page, size = params["p"], params["ps"]
+            keys = self.project_keys[(page - 1) * size : page * size]
+            response.json.return_value = {
+                "paging": {
+                    "pageIndex": page,
+                    "pageSize": size,
+                    "total": len(self.project_keys),
+                },
+                "components": [{"key": key} for key in keys],
+            }
+        else:
+            response.json.return_value = {
+                "measures": [
+                    {"metric": metric, "value": str(index), "component": key}
+                    for index, key in enumerate(params["projectKeys"].split(","))
+                    for metric in params["metricKeys"].split(",")
+                ]
+            }
+        return response
+
+
+class TestSonarBulkMeasuresDeducer(unittest.TestCase):
+    def build(self, client, **params):
+        connector = Mock(spec=SonarConnector, client=client)
+        return SonarBulkMeasuresDeducer(
+            connector, {"metric_keys": ["coverage", "bugs"], **params}
+        )
+
+    def test_rejects_unknown_metric_keys(self):
+        with self.assertRaises(ValueError):
+            self.build(FakeSonarClient(1), metric_keys=["coverage", "lines"])
+
+    def test_discovers_projects_and_chunks_searches(self):
+        client = FakeSonarClient(1201)
+
+        table = self.build(client, max_workers=4).deduce()
+
+        endpoints = [endpoint for endpoint, _ in client.calls]
+        self.assertEqual(endpoints.count("/api/components/search"), 3)
+        searches = [p for e, p in client.calls if e == "/api/measures/search"]
+        self.assertEqual(len(searches), 13)
+        self.assertTrue(all(len(p["projectKeys"].split(",")) <= 100 for p in searches))
+        self.assertEqual(len(table), 1201)
+        self.assertEqual(table["project-0105"], {"bugs": "5", "coverage": "5"})
+
+    def test_explicit_projects_skip_discovery(self):
+        client = FakeSonarClient(0)
+
+        table = self.build(client, project_keys=["a", "b"]).deduce()
+
+        endpoints = [endpoint for endpoint, _ in client.calls]
+        self.assertEqual(endpoints, ["/api/measures/search"])
+        self.assertEqual(table["b"], {"bugs": "1", "coverage": "1"})
+
+    def test_metrics_table(self):
+        deducer = self.build(FakeSonarClient(0), project_keys=["a"])
+
+        self.assertEqual(deducer.metrics["a"]["coverage"].value, 0)
+        with self.assertRaises(TypeError):
+            deducer.metric
+        with self.assertRaises(TypeError):
+            asyncio.run(deducer.metric_async())
@@ -0,0 +1,144 @@
+from datetime import datetime, timedelta, timezone
+import os
+import tempfile
+import unittest
+from unittest.mock import Mock
+
+from metricheq.core.connectors.sonar import SonarConnector
+from metricheq.core.connectors.store import HistoricalStore
+from metricheq.core.deducers.sonar import SonarMeasureHistoryDeducer
+
+DATE_FORMAT = "%Y-%m-%dT%H:%M:%S%z"
+
+
+class FakeSonarHistoryClient:
+    """Serves `/api/measures/search_history` from a list of analyses."""
+
+    def __init__(self, page_size=2):
+        self.page_size = page_size
+        self.history = []
+        self.calls = []
+        self.historical_store = None
+
+    def analyse(self, date, value):
+        self.history.append({"date": date, "value": value})
+
+    def make_request(self, endpoint, method="GET", params=None, **kwargs):
+        self.calls.append(dict(params))
+        points = self.history
+        if "from" in params:
+            since = datetime.strptime(params["from"], DATE_FORMAT)
+            points = [
+                point
+                for point in points
+                if datetime.strptime(point["date"], DATE_FORMAT) >= since
+            ]
+        page, size = params["p"], self.page_size
+        response = Mock(status_code=200)
+        response.json.return_value = {
+            "paging": {"pageIndex": page, "pageSize": size, "total": len(points)},
+            "measures": [
+                {
+                    "metric": params["metrics"],
+                    "history": points[(page - 1) * size : page * size],
+                }
+            ],
+        }
+        return response
+
+
+class TestSonarMeasureHistoryDeducer(unittest.TestCase):
+    def setUp(self):
+        self.client = FakeSonarHistoryClient()
+        for day, value in [(1, "80.0"), (2, "81.5"), (3, "82.0")]:
+            self.client.analyse(f"2024-01-0{day}T10:00:00+0000", value)
+
+    def use_store(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.client.historical_store = HistoricalStore(
+            os.path.join(directory.name, "history.sqlite")
+        )
+
+    def build(self, **params):
+        connector = Mock(spec=SonarConnector, client=self.client)
+        return SonarMeasureHistoryDeducer(
+            connector, {"component": "web", "metric_key": "coverage", **params}
+        )
+
+    @staticmethod
+    def day(day):
+        return datetime(2024, 1, day, 10, tzinfo=timezone.utc)
+
+    def test_pages_through_history(self):
+        history = self.build().deduce()
+
+        self.assertEqual(
+            history, {self.day(1): 80.0, self.day(2): 81.5, self.day(3): 82.0}
+        )
+        self.assertEqual([call["p"] for call in self.client.calls], [1, 2])
+
+    def test_window_bounds(self):
+        history = self.build(since=self.day(2), until=self.day(3)).deduce()
+
+        self.assertEqual(history, {self.day(2): 81.5})
+        self.assertEqual(self.client.calls[0]["from"], "2024-01-02T10:00:00+0000")
+
+    def test_stored_history_only_fetches_newer_points(self):
+        self.use_store()
+        self.build().deduce()
+        self.client.analyse("2024-01-04T10:00:00+0000", "83.0")
+        self.client.calls.clear()
+
+        history = self.build().deduce()
+
+        self.assertEqual(len(history), 4)
+        self.assertEqual(history[self.day(4)], 83.0)
+        self.assertEqual(
+            self.client.calls,
+            [
+                {
+                    "component": "web",
+                    "metrics": "coverage",
+                    "ps": 1000,
+                    "p": 1,
+                    "from": "2024-01-03T10:00:00+0000",
+                }
+            ],
+        )
+
+    def test_earlier_window_than_stored_is_fetched_again(self):
+        self.use_store()
+        self.build(since=self.day(3)).deduce()
+        self.client.calls.clear()
+
+        history = self.build(since=self.day(1)).deduce()
+
+        self.assertEqual(len(history), 3)
+        self.assertEqual(self.client.calls[0]["from"], "2024-01-01T10:00:00+0000")
+
+    def test_evicted_history_is_fetched_again(self):
+        self.use_store()
+        self.client.historical_store.max_age = 30 * 86400
+        self.client.history = []
+        now = datetime.now(timezone.utc).replace(microsecond=0)
+        for day in range(89, -1, -1):
+            self.client.analyse(
+                (now - timedelta(days=day)).strftime(DATE_FORMAT), str(day)
+            )
+        self.assertEqual(len(self.build().deduce()), 90)
+        self.client.calls.clear()
+
+        self.assertEqual(len(self.build().deduce()), 90)
+        self.assertNotIn("from", self.client.calls[0])
+
+    def test_metrics_by_analysis_date(self):
+        deducer = self.build()
+
+        self.assertEqual(deducer.metrics[self.day(3)].value, 82.0)
+        with self.assertRaises(TypeError):
+            deducer.metric
+
+    def test_rejects_unknown_metric_key(self):
+        with self.assertRaises(ValueError):
+            self.build(metric_key="lines")
@@ -1,9 +1,13 @@
-from datetime import timedelta
+from datetime import datetime, timedelta, timezone
 import unittest
 
+from dateutil.parser import parse
+
 from metricheq.core.deducers.utils import (
     calculate_frequency,
     convert_seconds,
+    parse_timestamp,
+    parse_timestamps,
 )
 
 
@@ -54,3 +58,34 @@ class TestCalculateFrequency(unittest.TestCase):
         time_delta = timedelta(days=30)
         frequency = calculate_frequency(total_events, time_delta, "daily")
         self.assertEqual(frequency, 0)
+
+
+class TestParseTimestamp(unittest.TestCase):
+    def test_matches_dateutil_on_api_formats(self):
+        for value in [
+            "2024-01-01T10:20:30Z",
+            "2024-01-01T10:20:30+02:00",
+            "2024-01-01T10:20:30.123456Z",
+            "2024-01-01T10:20:30",
+        ]:
+            with self.subTest(value=value):
+                self.assertEqual(parse_timestamp(value), parse(value))
+
+    def test_parses_utc_designator(self):
+        self.assertEqual(
+            parse_timestamp("2024-01-01T00:00:00Z"),
+            datetime(2024, 1, 1, tzinfo=timezone.utc),
+        )
+
+    def test_falls_back_to_dateutil(self):
+        self.assertEqual(
+            parse_timestamp("Jan 2 2024 10:00 UTC"),
+            datetime(2024, 1, 2, 10, tzinfo=timezone.utc),
+        )
+
+    def test_parses_columns(self):
+        values = ["2024-01-01T00:00:00Z", "2024-01-02T00:00:00Z"] * 2
+
+        parsed = parse_timestamps(values)
+
+        self.assertEqual(parsed, [parse(value) for value in values])